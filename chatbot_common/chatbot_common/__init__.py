@@ -0,0 +1,16 @@
+"""
+Code shared by the two chatbot starters (chatbot_starter/ and
+pythonnew/chatbot_starter/): LangChain and Pinecone clients, parallel PDF
+loading, the embedding cache and concurrent vector upserts.
+
+clients reads the Django settings of the project that imports it; the other
+modules are free of Django imports so manual_ingestion.py can use them too.
+"""
+__all__ = [
+    "clients",
+    "embedding_cache",
+    "pdf_loader",
+    "prompts",
+    "vector_writer",
+]
+__version__ = "0.1.0"
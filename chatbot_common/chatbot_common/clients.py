@@ -0,0 +1,149 @@
+import threading
+
+from django.conf import settings
+from langchain.chains import ConversationalRetrievalChain
+from langchain.chains import LLMChain
+from langchain.chains.question_answering import load_qa_chain
+from langchain.chat_models import ChatOpenAI
+from langchain.embeddings.openai import OpenAIEmbeddings
+from langchain.memory import ConversationBufferWindowMemory
+from langchain.vectorstores import Pinecone
+import pinecone
+
+from .embedding_cache import CachedEmbeddings, EmbeddingStore
+from .prompts import CONDENSE_QUESTION_PROMPT, QA_PROMPT
+
+# Process-wide clients, built on first use and shared by every request.
+# RLock because the getters call each other while holding it.
+_lock = threading.RLock()
+_pinecone_ready = False
+_embeddings = None
+_llm = None
+_vectorstore = None
+_index = None
+_chain_parts = None
+
+
+def init_pinecone():
+    """Initializes the Pinecone client once per process."""
+    global _pinecone_ready
+    if not _pinecone_ready:
+        with _lock:
+            if not _pinecone_ready:
+                pinecone.init(
+                    api_key=settings.PINECONE_API_KEY, environment=settings.PINECONE_ENVIRONMENT
+                )
+                _pinecone_ready = True
+
+
+def get_embeddings():
+    """
+    Creates or returns the shared OpenAIEmbeddings client, behind the local
+    embedding cache unless EMBEDDING_CACHE_DIR is empty.
+    """
+    global _embeddings
+    if _embeddings is None:
+        with _lock:
+            if _embeddings is None:
+                embeddings = OpenAIEmbeddings(
+                    model='text-embedding-ada-002', openai_api_key=settings.OPENAI_API_KEY
+                )
+                if settings.EMBEDDING_CACHE_DIR:
+                    embeddings = CachedEmbeddings(
+                        embeddings, EmbeddingStore(settings.EMBEDDING_CACHE_DIR), embeddings.model
+                    )
+                _embeddings = embeddings
+    return _embeddings
+
+
+def get_index():
+    """Creates or returns the shared Pinecone index client used for upserts."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                init_pinecone()
+                _index = pinecone.Index(
+                    settings.PINECONE_INDEX, pool_threads=settings.INGEST_UPSERT_CONCURRENCY
+                )
+    return _index
+
+
+def get_llm():
+    """Creates or returns the shared chat model."""
+    global _llm
+    if _llm is None:
+        with _lock:
+            if _llm is None:
+                # change model to gpt-4 if you have access to the API
+                _llm = ChatOpenAI(
+                    model_name="gpt-3.5-turbo",
+                    temperature=0,
+                    openai_api_key=settings.OPENAI_API_KEY,
+                    verbose=True,
+                )
+    return _llm
+
+
+def get_vectorstore():
+    """Creates or returns the shared Pinecone vectorstore over the existing index."""
+    global _vectorstore
+    if _vectorstore is None:
+        with _lock:
+            if _vectorstore is None:
+                init_pinecone()
+                _vectorstore = Pinecone.from_existing_index(
+                    index_name=settings.PINECONE_INDEX,
+                    embedding=get_embeddings(),
+                    text_key="text",
+                    namespace=settings.PINECONE_NAMESPACE,
+                )
+    return _vectorstore
+
+
+def get_chain_parts():
+    """
+    Creates or returns the shared (retriever, question_generator, doc_chain)
+    that every conversation's ConversationalRetrievalChain is built from.
+    """
+    global _chain_parts
+    if _chain_parts is None:
+        with _lock:
+            if _chain_parts is None:
+                llm = get_llm()
+                retriever = get_vectorstore().as_retriever(search_kwargs={"k": 4})
+                question_generator = LLMChain(
+                    llm=llm, prompt=CONDENSE_QUESTION_PROMPT, verbose=True
+                )
+                doc_chain = load_qa_chain(
+                    llm, chain_type="stuff", prompt=QA_PROMPT, verbose=True
+                )
+                _chain_parts = (retriever, question_generator, doc_chain)
+    return _chain_parts
+
+
+def get_chain(chat_history=None):
+    """
+    Returns a ConversationalRetrievalChain over the shared clients and
+    sub-chains, with a memory holding the last CHAT_HISTORY_TURNS turns of
+    this conversation's history: a list of {"question", "answer"} dicts as
+    kept in the session. Only the memory and the thin outer chain are new
+    per call.
+    """
+    retriever, question_generator, doc_chain = get_chain_parts()
+    turns = settings.CHAT_HISTORY_TURNS
+    memory = ConversationBufferWindowMemory(
+        memory_key="chat_history", return_messages=True, k=turns
+    )
+    # The window only limits what is read back; seed just those turns too
+    recent = chat_history[-turns:] if chat_history and turns > 0 else []
+    for turn in recent:
+        memory.chat_memory.add_user_message(turn["question"])
+        memory.chat_memory.add_ai_message(turn["answer"])
+    return ConversationalRetrievalChain(
+        retriever=retriever,
+        question_generator=question_generator,
+        combine_docs_chain=doc_chain,
+        verbose=True,
+        memory=memory,
+    )
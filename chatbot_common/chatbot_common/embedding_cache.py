@@ -0,0 +1,164 @@
+"""
+Local cache of chunk embeddings, so re-ingesting a PDF (or a large part of
+one) doesn't pay to embed the same text again.
+
+Vectors are keyed by the SHA-256 of the chunk text and the embedding model.
+Each model's vectors live in one flat float32 file (<dir>/<model>.f32) that
+is read through a NumPy memmap; a SQLite table maps (model, hash) to the
+row. New rows are appended while holding the SQLite write lock, so several
+processes can share one cache directory.
+
+Kept free of Django imports so manual_ingestion.py can use it as well.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# Hashes looked up per SQLite query (stays under SQLITE_MAX_VARIABLE_NUMBER)
+LOOKUP_BATCH = 500
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "index.sqlite3"), timeout=30, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, hash TEXT NOT NULL, row INTEGER NOT NULL,"
+            " PRIMARY KEY (model, hash))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS models (model TEXT PRIMARY KEY, dim INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+        # model -> read-only memmap of its vectors file
+        self._maps: Dict[str, np.memmap] = {}
+
+    def _path(self, model: str) -> str:
+        return os.path.join(self.directory, model.replace("/", "_") + ".f32")
+
+    def _dim(self, model: str) -> Optional[int]:
+        row = self._conn.execute("SELECT dim FROM models WHERE model = ?", (model,)).fetchone()
+        return row[0] if row else None
+
+    def _vectors(self, model: str, dim: int, needed_row: int) -> np.memmap:
+        """Memmap of the model's file, remapped when it has grown past needed_row."""
+        vectors = self._maps.get(model)
+        if vectors is None or vectors.shape[0] <= needed_row:
+            rows = os.path.getsize(self._path(model)) // (dim * 4)
+            vectors = np.memmap(self._path(model), dtype=np.float32, mode="r", shape=(rows, dim))
+            self._maps[model] = vectors
+        return vectors
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        """Cached vectors for whichever of hashes are present."""
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            dim = self._dim(model)
+            if dim is None:
+                return found
+            rows = {}
+            unique = list(dict.fromkeys(hashes))
+            for i in range(0, len(unique), LOOKUP_BATCH):
+                batch = unique[i:i + LOOKUP_BATCH]
+                rows.update(self._conn.execute(
+                    f"SELECT hash, row FROM embeddings WHERE model = ? AND hash IN ({','.join('?' * len(batch))})",
+                    [model, *batch],
+                ).fetchall())
+            if not rows:
+                return found
+            vectors = self._vectors(model, dim, max(rows.values()))
+            for key, row in rows.items():
+                found[key] = vectors[row].tolist()
+        return found
+
+    def put_many(self, model: str, items: Dict[str, List[float]]) -> None:
+        if not items:
+            return
+        array = np.asarray(list(items.values()), dtype=np.float32)
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock, serializing appends across processes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                dim = self._dim(model)
+                if dim is None:
+                    dim = array.shape[1]
+                    self._conn.execute("INSERT INTO models (model, dim) VALUES (?, ?)", (model, dim))
+                elif dim != array.shape[1]:
+                    raise ValueError(f"{model} vectors have {dim} dimensions, got {array.shape[1]}")
+                with open(self._path(model), "ab") as f:
+                    # Rows are counted from the file, skipping any torn tail a crash left
+                    first = f.tell() // (dim * 4)
+                    f.seek(first * dim * 4)
+                    f.truncate()
+                    f.write(array.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO embeddings (model, hash, row) VALUES (?, ?, ?)",
+                    [(model, key, first + i) for i, key in enumerate(items)],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that only sends cache misses to the wrapped model.
+    Queries are passed straight through: they rarely repeat and aren't stored.
+    """
+
+    def __init__(self, embeddings: Embeddings, store: EmbeddingStore, model: str):
+        self.embeddings = embeddings
+        self.store = store
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [content_hash(text) for text in texts]
+        try:
+            cached = self.store.get_many(self.model, hashes)
+        except Exception as e:
+            logger.warning("Embedding cache read failed, embedding everything: %s", e)
+            cached = {}
+
+        missing = {}
+        for key, text in zip(hashes, texts):
+            if key not in cached:
+                missing.setdefault(key, text)
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            fresh = dict(zip(missing, vectors))
+            try:
+                self.store.put_many(self.model, fresh)
+            except Exception as e:
+                logger.warning("Embedding cache write failed: %s", e)
+            cached.update(fresh)
+
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        logger.info("Embedded %d chunks, %d from cache", len(texts), len(texts) - len(missing))
+        return [cached[key] for key in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
@@ -0,0 +1,157 @@
+"""
+Parallel PDF loading for ingestion.
+
+Replaces DirectoryLoader(..., loader_cls=PyPDFLoader), which parses every
+page of every PDF in turn on one core. Each PDF is cut into page ranges and
+the ranges are parsed across a process pool; pages are yielded as ranges
+finish, so the splitter can start before the last file is read. Documents
+carry the same metadata PyPDFLoader gives them ({"source", "page"}).
+
+Kept free of Django imports so manual_ingestion.py can use it as well.
+"""
+import glob
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from langchain.docstore.document import Document
+
+logger = logging.getLogger(__name__)
+
+# Pages parsed per pool task: large enough to amortize the worker reopening
+# the file, small enough that one long filing spreads over every core
+PAGES_PER_TASK = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Worker-side cache of open readers, so consecutive ranges of the same file
+# don't re-parse its cross-reference table. Keyed by path, mtime and size, so
+# a file replaced at the same path is read afresh.
+_readers = {}
+
+
+def _get_executor():
+    """Creates or returns the process pool shared by every ingestion."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn rather than fork: the web server process has threads running
+            _executor = ProcessPoolExecutor(
+                max_workers=int(os.getenv("INGEST_WORKERS", 0)) or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+    return _executor
+
+
+def _reader(path):
+    from pypdf import PdfReader
+
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    reader = _readers.get(key)
+    if reader is None:
+        if len(_readers) >= 4:
+            _readers.clear()
+        reader = _readers[key] = PdfReader(path)
+    return reader
+
+
+def _page_count(path):
+    from pypdf import PdfReader
+
+    return len(PdfReader(path).pages)
+
+
+def _extract_pages(path, start, stop):
+    """Runs in a worker: returns [(page number, text)] for pages start..stop-1."""
+    reader = _reader(path)
+    return [(i, reader.pages[i].extract_text()) for i in range(start, stop)]
+
+
+class PDFLoadStats:
+    def __init__(self):
+        self.files = 0
+        self.pages = 0
+        # Known once every file's page count has been read
+        self.pages_total = 0
+        self.started = time.monotonic()
+        self.seconds = 0.0
+
+    @property
+    def pages_per_sec(self):
+        return self.pages / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.pages} pages from {self.files} PDFs in {self.seconds:.1f}s "
+            f"({self.pages_per_sec:.1f} pages/sec)"
+        )
+
+
+def find_pdfs(folder):
+    """Every PDF under folder, whatever the case of its extension (.pdf, .PDF)."""
+    return sorted(
+        path for path in glob.glob(os.path.join(folder, "**", "*"), recursive=True)
+        if path.lower().endswith(".pdf") and os.path.isfile(path)
+    )
+
+
+def iter_pdf_pages(folder, stats=None, pages_per_task=PAGES_PER_TASK):
+    """
+    Yields one Document per PDF page under folder, in completion order.
+    A parse error in any file is raised to the caller, as PyPDFLoader would.
+    """
+    stats = stats if stats is not None else PDFLoadStats()
+    paths = find_pdfs(folder)
+    stats.files = len(paths)
+    if not paths:
+        return
+
+    executor = _get_executor()
+    counts = dict(zip(paths, executor.map(_page_count, paths)))
+    stats.pages_total = sum(counts.values())
+    futures = {}
+    for path in paths:
+        for start in range(0, counts[path], pages_per_task):
+            stop = min(start + pages_per_task, counts[path])
+            futures[executor.submit(_extract_pages, path, start, stop)] = path
+
+    try:
+        for future in as_completed(futures):
+            path = futures[future]
+            for page, text in future.result():
+                stats.pages += 1
+                yield Document(page_content=text, metadata={"source": path, "page": page})
+    finally:
+        for future in futures:
+            future.cancel()
+        stats.seconds = time.monotonic() - stats.started
+        logger.info("Loaded %s", stats)
+
+
+def load_and_split(folder, text_splitter, stats=None, progress=None):
+    """
+    Loads every PDF under folder in parallel and splits the pages as they
+    arrive. Returns the chunks, in no particular file order.
+
+    progress, if given, is called as progress(pages_done, pages_total) after
+    each batch of pages is split.
+    """
+    stats = stats if stats is not None else PDFLoadStats()
+    documents = []
+    batch = []
+    for page in iter_pdf_pages(folder, stats):
+        batch.append(page)
+        if len(batch) >= PAGES_PER_TASK:
+            documents.extend(text_splitter.split_documents(batch))
+            batch = []
+            if progress:
+                progress(stats.pages, stats.pages_total)
+    documents.extend(text_splitter.split_documents(batch))
+    if progress:
+        progress(stats.pages, stats.pages_total)
+    return documents
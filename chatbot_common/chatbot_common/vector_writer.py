@@ -0,0 +1,178 @@
+"""
+Concurrent embed-and-upsert for ingestion.
+
+Replaces Pinecone.from_documents, which embeds 32 chunks, upserts them, and
+only then starts on the next 32. Here chunks are embedded in larger batches
+on a small thread pool, and each batch's vectors are upserted on a second
+pool as soon as they arrive, so upserts overlap the embedding calls still in
+flight. Upserts that fail with a rate limit, timeout or 5xx are retried with
+exponential backoff (honouring Retry-After when the API sends one); embedding
+calls are left to the OpenAI client's own retries (its max_retries) rather
+than being retried a second time here.
+
+Vector ids are derived from each chunk's source, page and text, so ingesting
+the same documents again (a requeued job, a re-run of manual_ingestion.py)
+overwrites their vectors instead of adding duplicates.
+
+Kept free of Django imports so manual_ingestion.py can use it as well.
+"""
+import hashlib
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying, matched by name so neither client library is imported here
+RETRYABLE_ERRORS = {
+    "RateLimitError", "ServiceUnavailableError", "APIConnectionError", "Timeout", "TryAgain",
+    "APIError", "ConnectionError", "TimeoutError", "ReadTimeoutError", "ProtocolError",
+}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Longest single backoff, in seconds
+MAX_BACKOFF = 60.0
+
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before retrying after error, or None if it isn't retryable."""
+    status = getattr(error, "http_status", None) or getattr(error, "status", None)
+    if type(error).__name__ not in RETRYABLE_ERRORS and status not in RETRYABLE_STATUS:
+        return None
+    headers = getattr(error, "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError, AttributeError):
+        retry_after = None
+    if retry_after is not None:
+        return min(retry_after, MAX_BACKOFF)
+    return min(2 ** attempt, MAX_BACKOFF) * random.uniform(0.5, 1.0)
+
+
+def vector_id(metadata, text):
+    """Stable id for a chunk: the same chunk of the same page always maps to the same vector."""
+    key = f"{metadata.get('source', '')}\0{metadata.get('page', '')}\0{text}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class WriteStats:
+    def __init__(self):
+        self.chunks = 0
+        self.embed_calls = 0
+        self.upsert_calls = 0
+        self.retries = 0
+        self.started = time.monotonic()
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def chunks_per_sec(self):
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+    def count(self, field, n=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    def __str__(self):
+        return (
+            f"{self.chunks} chunks in {self.seconds:.1f}s ({self.chunks_per_sec:.1f} chunks/sec; "
+            f"{self.embed_calls} embedding calls, {self.upsert_calls} upserts, {self.retries} retries)"
+        )
+
+
+class VectorWriter:
+    def __init__(
+        self,
+        embeddings,
+        index,
+        namespace=None,
+        text_key="text",
+        embed_batch_size=256,
+        embed_concurrency=4,
+        upsert_batch_size=100,
+        upsert_concurrency=4,
+        max_retries=6,
+    ):
+        self.embeddings = embeddings
+        self.index = index
+        self.namespace = namespace
+        self.text_key = text_key
+        self.embed_batch_size = embed_batch_size
+        self.embed_concurrency = embed_concurrency
+        self.upsert_batch_size = upsert_batch_size
+        self.upsert_concurrency = upsert_concurrency
+        self.max_retries = max_retries
+
+    def _with_retries(self, stats, what, fn, *args):
+        attempt = 0
+        while True:
+            try:
+                return fn(*args)
+            except Exception as e:
+                delay = _retry_delay(e, attempt)
+                if delay is None or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                stats.count("retries")
+                logger.warning("%s failed (%s); retry %d in %.1fs", what, e, attempt, delay)
+                time.sleep(delay)
+
+    def _embed(self, documents, stats):
+        texts = [doc.page_content for doc in documents]
+        vectors = self.embeddings.embed_documents(texts)
+        stats.count("embed_calls")
+        records = []
+        for doc, text, vector in zip(documents, texts, vectors):
+            metadata = dict(doc.metadata)
+            metadata[self.text_key] = text
+            records.append((vector_id(doc.metadata, text), vector, metadata))
+        return records
+
+    def _upsert(self, records, stats):
+        self._with_retries(
+            stats, "Upsert", lambda: self.index.upsert(vectors=records, namespace=self.namespace)
+        )
+        stats.count("upsert_calls")
+        return len(records)
+
+    def write(self, documents, progress=None, stats=None):
+        """
+        Embeds and upserts documents, raising the first error once retries
+        are exhausted. progress, if given, is called as progress(done, total)
+        from the calling thread each time an upsert completes.
+        """
+        stats = stats if stats is not None else WriteStats()
+        total = len(documents)
+        embedder = ThreadPoolExecutor(self.embed_concurrency, thread_name_prefix="embed")
+        upserter = ThreadPoolExecutor(self.upsert_concurrency, thread_name_prefix="upsert")
+        embedding = {
+            embedder.submit(self._embed, documents[i:i + self.embed_batch_size], stats)
+            for i in range(0, total, self.embed_batch_size)
+        }
+        upserting = set()
+        failed = True
+        try:
+            while embedding or upserting:
+                done, _ = wait(embedding | upserting, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in embedding:
+                        embedding.discard(future)
+                        records = future.result()
+                        for i in range(0, len(records), self.upsert_batch_size):
+                            upserting.add(upserter.submit(
+                                self._upsert, records[i:i + self.upsert_batch_size], stats))
+                    else:
+                        upserting.discard(future)
+                        stats.chunks += future.result()
+                        if progress:
+                            progress(stats.chunks, total)
+            failed = False
+        finally:
+            # On error, drop queued batches and return without waiting for the
+            # calls already in flight
+            embedder.shutdown(wait=not failed, cancel_futures=True)
+            upserter.shutdown(wait=not failed, cancel_futures=True)
+            stats.seconds = time.monotonic() - stats.started
+            logger.info("Wrote %s", stats)
+        return stats
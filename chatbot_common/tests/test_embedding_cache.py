@@ -0,0 +1,51 @@
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from chatbot_common.embedding_cache import CachedEmbeddings, EmbeddingStore
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5, -1.0] for text in texts]
+
+
+class EmbeddingStoreTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_round_trip_survives_reopening(self):
+        EmbeddingStore(self.directory.name).put_many("model", {"a": [1.0, 2.0], "b": [3.0, 4.5]})
+        EmbeddingStore(self.directory.name).put_many("model", {"c": [5.0, 6.0]})
+
+        found = EmbeddingStore(self.directory.name).get_many("model", ["a", "c", "missing"])
+
+        self.assertEqual(found, {"a": [1.0, 2.0], "c": [5.0, 6.0]})
+
+    def test_vectors_are_kept_per_model(self):
+        store = EmbeddingStore(self.directory.name)
+        store.put_many("small", {"a": [1.0, 2.0]})
+        store.put_many("large", {"a": [1.0, 2.0, 3.0]})
+
+        self.assertEqual(store.get_many("small", ["a"]), {"a": [1.0, 2.0]})
+        self.assertEqual(store.get_many("large", ["a"]), {"a": [1.0, 2.0, 3.0]})
+        with self.assertRaises(ValueError):
+            store.put_many("small", {"b": [1.0, 2.0, 3.0]})
+
+    def test_cached_embeddings_only_embed_misses(self):
+        fake = FakeEmbeddings()
+        embeddings = CachedEmbeddings(fake, EmbeddingStore(self.directory.name), "model")
+
+        first = embeddings.embed_documents(["one", "two", "one"])
+        second = embeddings.embed_documents(["two", "three"])
+
+        self.assertEqual(fake.calls, [["one", "two"], ["three"]])
+        self.assertEqual(first[0], first[2])
+        np.testing.assert_array_equal(second[0], first[1])
+        self.assertEqual((embeddings.hits, embeddings.misses), (2, 3))
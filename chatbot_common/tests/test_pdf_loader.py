@@ -0,0 +1,57 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from chatbot_common.pdf_loader import PDFLoadStats, find_pdfs, iter_pdf_pages
+
+
+def write_pdf(path, texts):
+    """Writes a minimal PDF with one line of Helvetica text per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in texts:
+        stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode() + b") Tj ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+class IterPdfPagesTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.first = os.path.join(self.directory.name, "first.pdf")
+        os.makedirs(os.path.join(self.directory.name, "nested"))
+        self.second = os.path.join(self.directory.name, "nested", "SECOND.PDF")
+        write_pdf(self.first, ["first page %d" % i for i in range(3)])
+        write_pdf(self.second, ["second page %d" % i for i in range(10)])
+        open(os.path.join(self.directory.name, "notes.txt"), "w").close()
+
+    def test_find_pdfs_matches_any_extension_case(self):
+        self.assertEqual(find_pdfs(self.directory.name), [self.first, self.second])
+
+    def test_every_page_is_yielded_once_across_page_ranges(self):
+        stats = PDFLoadStats()
+        pages = list(iter_pdf_pages(self.directory.name, stats, pages_per_task=4))
+
+        found = sorted((doc.metadata["source"], doc.metadata["page"], doc.page_content.strip())
+                       for doc in pages)
+        expected = sorted([(self.first, i, "first page %d" % i) for i in range(3)]
+                          + [(self.second, i, "second page %d" % i) for i in range(10)])
+        self.assertEqual(found, expected)
+        self.assertEqual((stats.files, stats.pages, stats.pages_total), (2, 13, 13))
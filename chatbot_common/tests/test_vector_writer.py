@@ -0,0 +1,96 @@
+import threading
+import time
+from unittest import TestCase
+
+from langchain.docstore.document import Document
+
+from chatbot_common import vector_writer
+from chatbot_common.vector_writer import VectorWriter, WriteStats, _retry_delay, vector_id
+
+
+class RateLimitError(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("rate limited")
+        self.headers = {"Retry-After": retry_after} if retry_after is not None else {}
+
+
+class FakeEmbeddings:
+    def embed_documents(self, texts):
+        return [[float(len(text))] for text in texts]
+
+
+class FakeIndex:
+    def __init__(self, errors=(), delay=0.0):
+        self.errors = list(errors)
+        self.delay = delay
+        self.upserts = []
+        self._lock = threading.Lock()
+
+    def upsert(self, vectors, namespace=None):
+        with self._lock:
+            self.upserts.append(vectors)
+            if self.errors:
+                raise self.errors.pop(0)
+        time.sleep(self.delay)
+
+
+def _documents(n):
+    return [Document(page_content=f"chunk {i}", metadata={"source": "a.pdf", "page": i})
+            for i in range(n)]
+
+
+class RetryDelayTests(TestCase):
+    def test_retry_after_is_honoured_up_to_the_cap(self):
+        self.assertEqual(_retry_delay(RateLimitError("7"), 0), 7.0)
+        self.assertEqual(_retry_delay(RateLimitError("600"), 0), vector_writer.MAX_BACKOFF)
+
+    def test_backoff_grows_without_retry_after(self):
+        self.assertLessEqual(_retry_delay(RateLimitError(), 0), 1.0)
+        self.assertGreaterEqual(_retry_delay(RateLimitError(), 3), 4.0)
+
+    def test_other_errors_are_not_retried(self):
+        self.assertIsNone(_retry_delay(ValueError("bad vector"), 0))
+
+
+class VectorWriterTests(TestCase):
+    def _writer(self, index, **kwargs):
+        return VectorWriter(FakeEmbeddings(), index, namespace="n", **kwargs)
+
+    def test_retryable_upsert_error_is_retried_then_succeeds(self):
+        index = FakeIndex([RateLimitError("0")])
+        progress = []
+
+        stats = self._writer(index, upsert_batch_size=2).write(
+            _documents(4), progress=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(stats.retries, 1)
+        self.assertEqual(stats.chunks, 4)
+        self.assertEqual(progress[-1], (4, 4))
+        written = {record[0] for batch in index.upserts for record in batch}
+        self.assertEqual(len(written), 4)
+
+    def test_non_retryable_error_cancels_queued_batches(self):
+        index = FakeIndex([ValueError("bad vector")], delay=0.05)
+
+        with self.assertRaises(ValueError):
+            self._writer(index, upsert_batch_size=1, upsert_concurrency=1).write(_documents(20))
+
+        # Batches still queued behind the failed one never reach the index
+        self.assertLess(len(index.upserts), 20)
+
+    def test_retries_stop_after_max_retries(self):
+        index = FakeIndex([RateLimitError("0")] * 3)
+
+        with self.assertRaises(RateLimitError):
+            self._writer(index, max_retries=2).write(_documents(1), stats=WriteStats())
+        self.assertEqual(len(index.upserts), 3)
+
+    def test_ids_are_stable_across_writes(self):
+        first, second = FakeIndex(), FakeIndex()
+        self._writer(first).write(_documents(3))
+        self._writer(second).write(_documents(3))
+
+        ids = [record[0] for record in first.upserts[0]]
+        self.assertEqual(ids, [record[0] for record in second.upserts[0]])
+        self.assertEqual(len(set(ids)), 3)
+        self.assertEqual(ids[0], vector_id({"source": "a.pdf", "page": 0}, "chunk 0"))
@@ -0,0 +1,84 @@
+import logging
+import os
+import shutil
+import socket
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from chatbot.models import IngestionJob
+from chatbot.utils.docs import ingest_folder
+
+logger = logging.getLogger(__name__)
+
+
+class JobLost(Exception):
+    """The job was requeued or failed by another worker while this one ran it."""
+
+
+class Command(BaseCommand):
+    help = "Processes queued PDF ingestion jobs. Run one or more alongside the web server."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help="exit when the queue is empty instead of polling")
+        parser.add_argument('--poll-interval', type=float, default=settings.INGEST_POLL_SECONDS,
+                            help="seconds to wait between polls of an empty queue")
+
+    def handle(self, *args, **options):
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Ingestion worker {worker} started")
+        while True:
+            stale_seconds = settings.INGEST_JOB_STALE_SECONDS
+            max_attempts = settings.INGEST_JOB_MAX_ATTEMPTS
+            for job in IngestionJob.objects.fail_stale(stale_seconds, max_attempts):
+                logger.error("Ingestion job %s stalled %d times; marked failed", job.pk, job.attempts)
+                shutil.rmtree(job.upload_dir, ignore_errors=True)
+            requeued = IngestionJob.objects.requeue_stale(stale_seconds, max_attempts)
+            if requeued:
+                logger.warning("Requeued %d stalled ingestion job(s)", requeued)
+
+            job = IngestionJob.objects.claim_next(worker)
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+            self.run_job(job, worker)
+
+    def run_job(self, job, worker):
+        self.stdout.write(f"Ingesting job {job.pk}: {', '.join(f.name for f in job.files.all())}")
+        # Every write is conditional on this worker still owning the job: if it
+        # stalled and was requeued, the job and its files now belong to
+        # whichever worker claimed it next
+        jobs = IngestionJob.objects.filter(pk=job.pk, worker=worker, status=IngestionJob.RUNNING)
+        last_update = 0.0
+
+        def progress(stage, done, total):
+            # Also the heartbeat; at most one write a second keeps the DB quiet
+            nonlocal last_update
+            now = time.monotonic()
+            if now - last_update >= 1.0 or done == total:
+                last_update = now
+                if not jobs.update(stage=stage, done=done, total=total, heartbeat_at=timezone.now()):
+                    raise JobLost()
+
+        try:
+            ingest_folder(job.upload_dir, progress)
+        except JobLost:
+            owned = False
+        except Exception as e:
+            logger.exception("Ingestion job %s failed", job.pk)
+            owned = jobs.update(status=IngestionJob.FAILED, error=str(e), finished_at=timezone.now())
+            if owned:
+                self.stdout.write(f"Job {job.pk} failed: {e}")
+        else:
+            owned = jobs.update(status=IngestionJob.DONE, finished_at=timezone.now())
+            if owned:
+                self.stdout.write(f"Job {job.pk} done")
+        if owned:
+            shutil.rmtree(job.upload_dir, ignore_errors=True)
+        else:
+            logger.warning("Ingestion job %s was taken over by another worker; leaving it", job.pk)
@@ -1,4 +1,7 @@
+from datetime import timedelta
+
 from django.db import models
+from django.utils import timezone
 
 
 class Message(models.Model):
@@ -7,3 +10,123 @@ class Message(models.Model):
 
     def __str__(self):
         return self.question
+
+
+class IngestionJobQuerySet(models.QuerySet):
+    def claim_next(self, worker):
+        """
+        Marks the oldest queued job as running for this worker and returns it,
+        or None when the queue is empty. The conditional update makes the
+        claim safe with several workers on any database backend.
+        """
+        while True:
+            job = self.filter(status=IngestionJob.QUEUED).order_by('created_at').first()
+            if job is None:
+                return None
+            now = timezone.now()
+            claimed = self.filter(pk=job.pk, status=IngestionJob.QUEUED).update(
+                status=IngestionJob.RUNNING, worker=worker, attempts=models.F('attempts') + 1,
+                started_at=now, heartbeat_at=now,
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+
+    def stale(self, seconds):
+        """Running jobs whose worker has not reported progress for seconds."""
+        cutoff = timezone.now() - timedelta(seconds=seconds)
+        return self.filter(status=IngestionJob.RUNNING, heartbeat_at__lt=cutoff)
+
+    def requeue_stale(self, seconds, max_attempts):
+        """
+        Puts back stale jobs that have been tried fewer than max_attempts
+        times. Returns how many were requeued.
+        """
+        return self.stale(seconds).filter(attempts__lt=max_attempts).update(
+            status=IngestionJob.QUEUED, worker='',
+        )
+
+    def fail_stale(self, seconds, max_attempts):
+        """
+        Fails stale jobs that have already been tried max_attempts times, so a
+        job that keeps killing its worker stops being retried. Returns the jobs
+        failed.
+        """
+        failed = []
+        for job in self.stale(seconds).filter(attempts__gte=max_attempts):
+            # Conditional, like claim_next: the worker may have reported in since
+            error = f"Gave up after {job.attempts} attempts: the worker stopped reporting progress"
+            if self.stale(seconds).filter(pk=job.pk).update(
+                status=IngestionJob.FAILED, error=error, finished_at=timezone.now(),
+            ):
+                failed.append(job)
+        return failed
+
+
+class IngestionJob(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    # Directory holding the uploaded PDFs until the job finishes
+    upload_dir = models.CharField(max_length=500)
+    # Current step ('parsing' or 'embedding') and how far along it is
+    stage = models.CharField(max_length=16, blank=True)
+    done = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    objects = IngestionJobQuerySet.as_manager()
+
+    def __str__(self):
+        return f"Ingestion job {self.pk} ({self.status})"
+
+    def as_dict(self):
+        return {
+            'id': self.pk,
+            'status': self.status,
+            'files': [f.name for f in self.files.all()],
+            'stage': self.stage,
+            'done': self.done,
+            'total': self.total,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class UploadedFileQuerySet(models.QuerySet):
+    def ingested_hashes(self, hashes):
+        """The hashes among hashes that belong to a queued, running or finished job."""
+        return set(
+            self.filter(sha256__in=hashes)
+            .exclude(job__status=IngestionJob.FAILED)
+            .values_list('sha256', flat=True)
+        )
+
+
+class UploadedFile(models.Model):
+    job = models.ForeignKey(IngestionJob, related_name='files', on_delete=models.CASCADE)
+    name = models.CharField(max_length=255)
+    # SHA-256 of the content, computed while the upload streamed in (see uploads.py)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+
+    objects = UploadedFileQuerySet.as_manager()
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from chatbot.models import IngestionJob
+
+
+class IngestionJobQueueTests(TestCase):
+    def _stall(self, job, attempts):
+        IngestionJob.objects.filter(pk=job.pk).update(
+            attempts=attempts, heartbeat_at=timezone.now() - timedelta(hours=1))
+
+    def test_claim_next_takes_the_oldest_queued_job(self):
+        first = IngestionJob.objects.create(upload_dir="/tmp/a")
+        second = IngestionJob.objects.create(upload_dir="/tmp/b")
+
+        claimed = IngestionJob.objects.claim_next("worker-1")
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual((claimed.status, claimed.worker, claimed.attempts),
+                         (IngestionJob.RUNNING, "worker-1", 1))
+        self.assertEqual(IngestionJob.objects.claim_next("worker-2").pk, second.pk)
+        self.assertIsNone(IngestionJob.objects.claim_next("worker-3"))
+
+    def test_stale_jobs_are_requeued_until_attempts_run_out(self):
+        retry = IngestionJob.objects.create(upload_dir="/tmp/a")
+        exhausted = IngestionJob.objects.create(upload_dir="/tmp/b")
+        healthy = IngestionJob.objects.create(upload_dir="/tmp/c")
+        for job in (retry, exhausted, healthy):
+            IngestionJob.objects.claim_next("worker-1")
+        self._stall(retry, 1)
+        self._stall(exhausted, 3)
+
+        failed = IngestionJob.objects.fail_stale(600, 3)
+        self.assertEqual([job.pk for job in failed], [exhausted.pk])
+        self.assertEqual(IngestionJob.objects.requeue_stale(600, 3), 1)
+
+        statuses = dict(IngestionJob.objects.values_list("pk", "status"))
+        self.assertEqual(statuses, {
+            retry.pk: IngestionJob.QUEUED,
+            exhausted.pk: IngestionJob.FAILED,
+            healthy.pk: IngestionJob.RUNNING,
+        })
+        self.assertEqual(IngestionJob.objects.get(pk=retry.pk).worker, "")
+
+    def test_status_is_only_shown_to_the_session_that_queued_the_job(self):
+        job = IngestionJob.objects.create(upload_dir="/tmp/a")
+        url = reverse("ingestion_status", args=[job.pk])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        session = self.client.session
+        session["ingestion_jobs"] = [job.pk]
+        session.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], IngestionJob.QUEUED)
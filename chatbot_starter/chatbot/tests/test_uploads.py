@@ -0,0 +1,73 @@
+import hashlib
+import os
+import tempfile
+
+from django.core.files.uploadedfile import (
+    InMemoryUploadedFile, SimpleUploadedFile, TemporaryUploadedFile)
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from chatbot.models import IngestionJob, UploadedFile
+from chatbot.uploads import save_upload
+
+# Several upload chunks (64 KiB each), so hashing has to follow every one
+CONTENT = os.urandom(200 * 1024)
+
+
+class HashingUploadHandlerTests(TestCase):
+    def _upload(self, content):
+        request = RequestFactory().post(
+            "/", {"pdf_files": SimpleUploadedFile("report.pdf", content)})
+        return request.FILES["pdf_files"]
+
+    def _check(self, uploaded_file):
+        self.assertEqual(uploaded_file.sha256, hashlib.sha256(CONTENT).hexdigest())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.pdf")
+            save_upload(uploaded_file, path)
+            # As Django does at the end of a request; the spilled file has been moved
+            uploaded_file.close()
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), CONTENT)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=len(CONTENT) * 2)
+    def test_small_upload_is_hashed_in_memory(self):
+        uploaded_file = self._upload(CONTENT)
+        self.assertIsInstance(uploaded_file, InMemoryUploadedFile)
+        self._check(uploaded_file)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=len(CONTENT) // 2)
+    def test_large_upload_is_hashed_while_spilling_to_disk(self):
+        uploaded_file = self._upload(CONTENT)
+        self.assertIsInstance(uploaded_file, TemporaryUploadedFile)
+        self._check(uploaded_file)
+
+
+class DuplicateUploadTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(INGEST_UPLOAD_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def _post(self, *contents):
+        files = [SimpleUploadedFile(f"file{i}.pdf", content) for i, content in enumerate(contents)]
+        return self.client.post(reverse("home"), {"pdf_files": files})
+
+    def test_repeated_content_is_only_queued_once(self):
+        response = self._post(b"first", b"first", b"second")
+        self.assertContains(response, "skipped, already ingested: file1.pdf")
+        self.assertEqual(sorted(UploadedFile.objects.values_list("name", flat=True)),
+                         ["file0.pdf", "file2.pdf"])
+
+        response = self._post(b"second")
+        self.assertContains(response, "Your file(s) have already been ingested")
+        self.assertEqual(IngestionJob.objects.count(), 1)
+
+    def test_content_of_a_failed_job_can_be_uploaded_again(self):
+        self._post(b"first")
+        IngestionJob.objects.update(status=IngestionJob.FAILED)
+
+        self._post(b"first")
+        self.assertEqual(IngestionJob.objects.count(), 2)
@@ -0,0 +1,20 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+
+class ChatHistoryTests(TestCase):
+    def test_every_turn_is_saved_to_the_session(self):
+        histories = []
+
+        def process_docs(chat_history):
+            histories.append(list(chat_history))
+            return lambda inputs: {"answer": "answer to " + inputs["question"]}
+
+        with mock.patch("chatbot.views.process_docs", process_docs):
+            for question in ("first", "second", "third"):
+                self.client.post(reverse("home"), {"question": question})
+
+        self.assertEqual([len(history) for history in histories], [0, 1, 2])
+        self.assertEqual(self.client.session["past"], ["Hey!", "first", "second", "third"])
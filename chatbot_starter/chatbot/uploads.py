@@ -0,0 +1,55 @@
+"""
+Upload handlers that hash file content while Django streams it in.
+
+Each uploaded file comes out with a .sha256 attribute, computed chunk by
+chunk as it is received, so duplicates can be spotted without reading the
+file again. Small files stay in memory; anything over
+FILE_UPLOAD_MAX_MEMORY_SIZE spills to a temporary file, so memory per upload
+is bounded by the chunk size whatever the file size.
+"""
+import hashlib
+
+from django.core.files.move import file_move_safe
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+
+class HashingMixin:
+    def new_file(self, *args, **kwargs):
+        # Before super(): the memory handler raises StopFutureHandlers from it
+        self.hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        remaining = super().receive_data_chunk(raw_data, start)
+        # None means this handler kept the chunk; otherwise it is passed on
+        # to the next handler, which hashes it instead
+        if remaining is None:
+            self.hasher.update(raw_data)
+        return remaining
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.hasher.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(HashingMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingMixin, TemporaryFileUploadHandler):
+    pass
+
+
+def save_upload(uploaded_file, path):
+    """
+    Writes an uploaded file to path without reading it into memory: spilled
+    files are moved into place, in-memory ones written chunk by chunk.
+    """
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        file_move_safe(uploaded_file.temporary_file_path(), path)
+    else:
+        with open(path, "wb") as f:
+            for chunk in uploaded_file.chunks():
+                f.write(chunk)
@@ -1,96 +1,56 @@
 from django.conf import settings
 from django.http import HttpResponseServerError
-from langchain.chat_models import ChatOpenAI
-from langchain.document_loaders import DirectoryLoader, PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.embeddings.openai import OpenAIEmbeddings
-from langchain.chains import ConversationalRetrievalChain
-from langchain.vectorstores import Pinecone
-from langchain.memory import ConversationBufferMemory
-from langchain.chains.question_answering import load_qa_chain
-from langchain.chains import LLMChain
-import pinecone
 import tempfile
-from .prompts import CONDENSE_QUESTION_PROMPT, QA_PROMPT
-
-# Initialize Pinecone with credentials
-pinecone.init(
-    api_key=settings.PINECONE_API_KEY, environment=settings.PINECONE_ENVIRONMENT
-)
-
-# Initialize OpenAIEmbeddings with credentials
-embeddings = OpenAIEmbeddings(
-    model='text-embedding-ada-002', openai_api_key=settings.OPENAI_API_KEY
-)
+from chatbot_common.clients import get_chain, get_embeddings, get_index
+from chatbot_common.pdf_loader import load_and_split
+from chatbot_common.vector_writer import VectorWriter
+
+
+def ingest_folder(folder: str, progress=None):
+    """
+    Parses, splits, embeds and upserts every PDF under folder. Errors are
+    raised. progress, if given, is called as progress(stage, done, total)
+    with stage 'parsing' (pages) then 'embedding' (chunks).
+    """
+    # Load PDF files across worker processes, splitting pages into
+    # chunks as they are parsed
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000, chunk_overlap=100)
+    documents = load_and_split(
+        folder, text_splitter,
+        progress=(lambda done, total: progress('parsing', done, total)) if progress else None)
+
+    # Embed and upsert into Pinecone, overlapping the two
+    writer = VectorWriter(
+        get_embeddings(),
+        get_index(),
+        namespace=settings.PINECONE_NAMESPACE,
+        embed_batch_size=settings.INGEST_EMBED_BATCH_SIZE,
+        embed_concurrency=settings.INGEST_EMBED_CONCURRENCY,
+        upsert_batch_size=settings.INGEST_UPSERT_BATCH_SIZE,
+        upsert_concurrency=settings.INGEST_UPSERT_CONCURRENCY,
+    )
+    if progress:
+        progress('embedding', 0, len(documents))
+    writer.write(
+        documents,
+        progress=(lambda done, total: progress('embedding', done, total)) if progress else None)
 
 
 def ingest_docs(temp_dir: str = tempfile.gettempdir()):
     try:
-        # Load PDF files from the temporary directory
-        loader = DirectoryLoader(
-            temp_dir, glob="**/*.pdf", loader_cls=PyPDFLoader, recursive=True
-        )
-        temp_documents = loader.load()
-
-        # Split documents into chunks
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000, chunk_overlap=100)
-        documents = text_splitter.split_documents(temp_documents)
-
-        # Ingest documents into Pinecone vectorstore
-        Pinecone.from_documents(
-            documents,
-            embeddings,
-            index_name=settings.PINECONE_INDEX,
-            namespace=settings.PINECONE_NAMESPACE
-        )
+        ingest_folder(temp_dir)
     except Exception as e:
         return HttpResponseServerError(
             f"An error occurred whilst ingesting your files: {str(e)}")
 
 
-def process_docs():
+def process_docs(chat_history=None):
     try:
-        # initializes OpenAI's text embedding model and a chat model (GPT-3) with API credentials.
-        # change model to gpt-4 if you have access to the API
-        llm = ChatOpenAI(
-            model_name="gpt-3.5-turbo",
-            temperature=0,
-            openai_api_key=settings.OPENAI_API_KEY,
-            verbose=True,
-        )
-        # initializes a memory component to store conversation history.
-        memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
-        )
-        # initializes a retrieval chain to retrieve relevant documents from the
-        # vector database.
-        vectorstore = Pinecone.from_existing_index(
-            index_name=settings.PINECONE_INDEX,
-            embedding=embeddings,
-            text_key="text",
-            namespace=settings.PINECONE_NAMESPACE,
-        )
-        retriever = vectorstore.as_retriever(search_kwargs={"k": 4})
-        # initializes a question generator using the GPT-3 model.
-        question_generator = LLMChain(
-            llm=llm, prompt=CONDENSE_QUESTION_PROMPT, verbose=True
-        )
-        # initializes a chain to generate answers from documents.
-        doc_chain = load_qa_chain(
-            llm, chain_type="stuff", prompt=QA_PROMPT, verbose=True
-        )
-        # initializes the full conversational retrieval chain using the
-        # components above.
-        qa = ConversationalRetrievalChain(
-            retriever=retriever,
-            question_generator=question_generator,
-            combine_docs_chain=doc_chain,
-            verbose=True,
-            memory=memory,
-        )
-        return qa
+        # The clients, vectorstore and chain are built once per process (see
+        # clients.py); only the conversation's memory is created per call.
+        return get_chain(chat_history)
     except Exception as e:
         return HttpResponseServerError(
             f"An error occurred whilst processing your files: {str(e)}")
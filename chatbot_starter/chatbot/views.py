@@ -1,10 +1,16 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from django.http import Http404, JsonResponse
 from django.conf import settings
-import tempfile
+from django.db import transaction
 import os
+import shutil
+import uuid
 from .forms import PDFUploadForm, ChatForm
-from .utils.docs import ingest_docs, process_docs
+from .models import IngestionJob, UploadedFile
+from .uploads import save_upload
+from .utils.docs import process_docs
 
 
 @csrf_exempt
@@ -25,36 +31,59 @@ def main_view(request):
     # Handle file uploads
     if request.method == 'POST' and request.FILES:
         uploaded_files = request.FILES.getlist('pdf_files')
-        print("-", request.FILES)
-        print("--", uploaded_files)
-        # Create a temporary directory to store the uploaded files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            try:
-                print("here")
-                for uploaded_file in uploaded_files:
-                    file_name = uploaded_file.name
-                    print("==>", file_name)
-                    # Save the file to the temporary directory
-                    with open(os.path.join(temp_dir, file_name), "wb") as f:
-                        f.write(uploaded_file.read())
+        # Save the files for an ingestion worker (manage.py ingest_worker)
+        # and return straight away; the page polls the job's status
+        upload_dir = os.path.join(settings.INGEST_UPLOAD_DIR, uuid.uuid4().hex)
+        try:
+            # The upload handlers hashed each file as it streamed in; skip
+            # files that are already queued or ingested, or repeated here
+            ingested = UploadedFile.objects.ingested_hashes(
+                [f.sha256 for f in uploaded_files])
+            new_files = {}
+            skipped = []
+            for uploaded_file in uploaded_files:
+                if uploaded_file.sha256 in ingested or uploaded_file.sha256 in new_files:
+                    skipped.append(uploaded_file.name)
+                else:
+                    new_files[uploaded_file.sha256] = uploaded_file
 
-                # Ingest the uploaded documents into Pinecone vectorstore
-                ingest_docs(temp_dir)
+            job = None
+            if new_files:
+                os.makedirs(upload_dir)
+                with transaction.atomic():
+                    job = IngestionJob.objects.create(upload_dir=upload_dir)
+                    for sha256, uploaded_file in new_files.items():
+                        file_name = os.path.basename(uploaded_file.name)
+                        if os.path.exists(os.path.join(upload_dir, file_name)):
+                            # Same name, different content
+                            file_name = f"{sha256[:8]}-{file_name}"
+                        save_upload(uploaded_file, os.path.join(upload_dir, file_name))
+                        UploadedFile.objects.create(
+                            job=job, name=file_name, sha256=sha256, size=uploaded_file.size)
+                # Only this session may poll the job (see ingestion_status)
+                request.session['ingestion_jobs'] = (
+                    request.session.get('ingestion_jobs', []) + [job.pk])
 
-                # Return a success response
-                success_message = "Your file(s) have been successfully ingested"
-                return render(request, 'main.html', {
-                              'success_message': success_message,
-                              'upload_form': upload_form,
-                              'message_form': message_form
-                              })
-            except Exception as e:
-                error_message = f"An error occurred whilst uploading your files: {str(e)}"
-                return render(request, 'main.html', {
-                              'error_message': error_message,
-                              'upload_form': upload_form,
-                              'message_form': message_form
-                              })
+            if job:
+                success_message = "Your file(s) have been uploaded and queued for ingestion"
+            else:
+                success_message = "Your file(s) have already been ingested"
+            if job and skipped:
+                success_message += f" (skipped, already ingested: {', '.join(skipped)})"
+            return render(request, 'main.html', {
+                          'success_message': success_message,
+                          'job': job,
+                          'upload_form': upload_form,
+                          'message_form': message_form
+                          })
+        except Exception as e:
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            error_message = f"An error occurred whilst uploading your files: {str(e)}"
+            return render(request, 'main.html', {
+                          'error_message': error_message,
+                          'upload_form': upload_form,
+                          'message_form': message_form
+                          })
     # Render the chat
     elif request.method == "POST" and 'question' in request.POST:
         user_input = request.POST.get("question")
@@ -65,7 +94,7 @@ def main_view(request):
         # Initialize ready state if it doesn't exist
         ready = request.session.get('ready', True)
         if ready:
-            qa = process_docs()
+            qa = process_docs(request.session['chat_history'])
             if 'generated' not in request.session:
                 request.session['generated'] = [
                     "What would you like to learn about the document?"]
@@ -78,6 +107,8 @@ def main_view(request):
                 request.session['generated'].append(output['answer'])
                 request.session['chat_history'].append(
                     {"question": user_input, "answer": output['answer']})
+                # In-place appends don't mark the session as changed
+                request.session.modified = True
 
         return render(request, 'main.html',
                       {
@@ -93,3 +124,12 @@ def main_view(request):
                       'upload_form': upload_form,
                       'message_form': message_form
                   })
+
+
+@require_GET
+def ingestion_status(request, job_id):
+    # Job ids are sequential; don't show one session's file names to another
+    if job_id not in request.session.get('ingestion_jobs', []):
+        raise Http404
+    job = get_object_or_404(IngestionJob, pk=job_id)
+    return JsonResponse(job.as_dict())
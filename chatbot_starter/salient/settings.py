@@ -130,6 +130,22 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Uploads are hashed as they stream in; files over the memory limit spill to a temporary file
+FILE_UPLOAD_HANDLERS = [
+    'chatbot.uploads.HashingMemoryFileUploadHandler',
+    'chatbot.uploads.HashingTemporaryFileUploadHandler',
+]
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE', 2621440))
+
+# Uploaded PDFs wait here until an ingestion worker (manage.py ingest_worker) has processed them
+INGEST_UPLOAD_DIR = os.getenv('INGEST_UPLOAD_DIR', os.path.join(MEDIA_ROOT, 'ingest'))
+# Seconds an idle worker waits before checking the queue again
+INGEST_POLL_SECONDS = float(os.getenv('INGEST_POLL_SECONDS', 2))
+# Running jobs with no progress for this long are handed to another worker
+INGEST_JOB_STALE_SECONDS = int(os.getenv('INGEST_JOB_STALE_SECONDS', 600))
+# Stalled jobs are failed rather than requeued once they have been tried this many times
+INGEST_JOB_MAX_ATTEMPTS = int(os.getenv('INGEST_JOB_MAX_ATTEMPTS', 3))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -146,6 +162,20 @@ PINECONE_ENVIRONMENT = os.getenv('PINECONE_ENVIRONMENT')
 PINECONE_INDEX = os.getenv('PINECONE_INDEX')
 PINECONE_NAMESPACE = os.getenv('PINECONE_NAMESPACE')
 
+# Question/answer turns of the conversation sent back to the model with each question
+CHAT_HISTORY_TURNS = int(os.getenv('CHAT_HISTORY_TURNS', 5))
+
+# Local cache of chunk embeddings, reused when the same text is ingested again.
+# Set to an empty string to always call the embeddings API.
+EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR', os.path.join(BASE_DIR, 'embedding_cache'))
+
+# Ingestion: chunks per embeddings request and concurrent requests, then
+# vectors per Pinecone upsert and concurrent upserts
+INGEST_EMBED_BATCH_SIZE = int(os.getenv('INGEST_EMBED_BATCH_SIZE', 256))
+INGEST_EMBED_CONCURRENCY = int(os.getenv('INGEST_EMBED_CONCURRENCY', 4))
+INGEST_UPSERT_BATCH_SIZE = int(os.getenv('INGEST_UPSERT_BATCH_SIZE', 100))
+INGEST_UPSERT_CONCURRENCY = int(os.getenv('INGEST_UPSERT_CONCURRENCY', 4))
+
 # Tailwind setup
 TAILWIND_APP_NAME = 'chatbot'
 INTERNAL_IPS = [
@@ -21,5 +21,6 @@ from chatbot import views
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', views.main_view, name='home'),
+    path('ingest/<int:job_id>/', views.ingestion_status, name='ingestion_status'),
     path("__reload__/", include("django_browser_reload.urls")),
 ]
@@ -2,18 +2,11 @@ import os
 import tempfile
 from django.shortcuts import render, redirect
 from .forms import PDFUploadForm, ChatForm
-from langchain.chat_models import ChatOpenAI
-from langchain.document_loaders import DirectoryLoader, PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.embeddings.openai import OpenAIEmbeddings
-from langchain.chains import ConversationalRetrievalChain
-from langchain.vectorstores import Pinecone
-from langchain.memory import ConversationBufferMemory
-from langchain.chains.question_answering import load_qa_chain
-from langchain.chains import LLMChain
-import pinecone
 from chatbot.forms import PDFUploadForm
-from chatbot.utils.prompts import CONDENSE_QUESTION_PROMPT, QA_PROMPT
+from chatbot_common.clients import get_chain, get_embeddings, get_index
+from chatbot_common.pdf_loader import load_and_split
+from chatbot_common.vector_writer import VectorWriter
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from django.http import HttpResponseServerError
@@ -21,31 +14,22 @@ from django.http import HttpResponseServerError
 
 def ingest_docs(temp_dir: str = tempfile.gettempdir()):
     try:
-        # Load PDF files from the temporary directory
-        loader = DirectoryLoader(
-            temp_dir, glob="**/*.pdf", loader_cls=PyPDFLoader, recursive=True
-        )
-        temp_documents = loader.load()
-
-        # Split documents into chunks
+        # Load PDF files from the temporary directory across worker
+        # processes, splitting pages into chunks as they are parsed
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000, chunk_overlap=100)
-        documents = text_splitter.split_documents(temp_documents)
-
-        # Initialize Pinecone with credentials
-        pinecone.init(
-            api_key=settings.PINECONE_API_KEY, environment=settings.PINECONE_ENVIRONMENT
-        )
-
-        # Initialize OpenAIEmbeddings with credentials
-        embeddings = OpenAIEmbeddings(
-            model='text-embedding-ada-002', openai_api_key=settings.OPENAI_API_KEY
-        )
-
-        # Ingest documents into Pinecone vectorstore
-        Pinecone.from_documents(
-            documents, embeddings, index_name=settings.PINECONE_INDEX, namespace=settings.PINECONE_NAMESPACE
-        )
+        documents = load_and_split(temp_dir, text_splitter)
+
+        # Embed and upsert into Pinecone, overlapping the two
+        VectorWriter(
+            get_embeddings(),
+            get_index(),
+            namespace=settings.PINECONE_NAMESPACE,
+            embed_batch_size=settings.INGEST_EMBED_BATCH_SIZE,
+            embed_concurrency=settings.INGEST_EMBED_CONCURRENCY,
+            upsert_batch_size=settings.INGEST_UPSERT_BATCH_SIZE,
+            upsert_concurrency=settings.INGEST_UPSERT_CONCURRENCY,
+        ).write(documents)
     except Exception as e:
         return HttpResponseServerError(
             f"An error occurred whilst ingesting your files: {str(e)}")
@@ -101,46 +85,9 @@ def chat_view(request):
         # Initialize ready state if it doesn't exist
         ready = request.session.get('ready', True)
         if ready:
-            # initialize Pinecone with credentials
-            pinecone.init(
-                api_key=settings.PINECONE_API_KEY, environment=settings.PINECONE_ENVIRONMENT
-            )
-            # initialize OpenAIEmbeddings and chat models with credentials
-            embeddings = OpenAIEmbeddings(
-                model="text-embedding-ada-002", openai_api_key=settings.OPENAI_API_KEY
-            )
-            # change model to gpt-4 if you have access to the API
-            llm = ChatOpenAI(
-                model_name="gpt-3.5-turbo",
-                temperature=0,
-                openai_api_key=settings.OPENAI_API_KEY,
-                verbose=True,
-            )
-            # initialize memory
-            memory = ConversationBufferMemory(
-                memory_key="chat_history", return_messages=True
-            )
-            # initialize retrieval chain
-            vectorstore = Pinecone.from_existing_index(
-                index_name=settings.PINECONE_INDEX,
-                embedding=embeddings,
-                text_key="text",
-                namespace=settings.PINECONE_NAMESPACE,
-            )
-            retriever = vectorstore.as_retriever(search_kwargs={"k": 4})
-            question_generator = LLMChain(
-                llm=llm, prompt=CONDENSE_QUESTION_PROMPT, verbose=True
-            )
-            doc_chain = load_qa_chain(
-                llm, chain_type="stuff", prompt=QA_PROMPT, verbose=True
-            )
-            qa = ConversationalRetrievalChain(
-                retriever=retriever,
-                question_generator=question_generator,
-                combine_docs_chain=doc_chain,
-                verbose=True,
-                memory=memory,
-            )
+            # The clients and chain are shared across requests; only the
+            # memory is per conversation, seeded from the session history
+            qa = get_chain(request.session['chat_history'])
             if 'generated' not in request.session:
                 request.session['generated'] = [
                     "What would you like to learn about the document?"]
@@ -154,6 +101,8 @@ def chat_view(request):
                 request.session['generated'].append(output['answer'])
                 request.session['chat_history'].append(
                     {"question": user_input, "answer": output['answer']})
+                # In-place appends don't mark the session as changed
+                request.session.modified = True
         return render(request, 'chat.html',
                       {
                           'messages': zip(
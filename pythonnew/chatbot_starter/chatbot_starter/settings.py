@@ -146,6 +146,20 @@ PINECONE_ENVIRONMENT = os.getenv('PINECONE_ENVIRONMENT')
 PINECONE_INDEX = os.getenv('PINECONE_INDEX')
 PINECONE_NAMESPACE = os.getenv('PINECONE_NAMESPACE')
 
+# Question/answer turns of the conversation sent back to the model with each question
+CHAT_HISTORY_TURNS = int(os.getenv('CHAT_HISTORY_TURNS', 5))
+
+# Local cache of chunk embeddings, reused when the same text is ingested again.
+# Set to an empty string to always call the embeddings API.
+EMBEDDING_CACHE_DIR = os.getenv('EMBEDDING_CACHE_DIR', os.path.join(BASE_DIR, 'embedding_cache'))
+
+# Ingestion: chunks per embeddings request and concurrent requests, then
+# vectors per Pinecone upsert and concurrent upserts
+INGEST_EMBED_BATCH_SIZE = int(os.getenv('INGEST_EMBED_BATCH_SIZE', 256))
+INGEST_EMBED_CONCURRENCY = int(os.getenv('INGEST_EMBED_CONCURRENCY', 4))
+INGEST_UPSERT_BATCH_SIZE = int(os.getenv('INGEST_UPSERT_BATCH_SIZE', 100))
+INGEST_UPSERT_CONCURRENCY = int(os.getenv('INGEST_UPSERT_CONCURRENCY', 4))
+
 # Tailwind setup
 TAILWIND_APP_NAME = 'chatbot'
 INTERNAL_IPS = [
@@ -1,9 +1,10 @@
-from langchain.document_loaders import DirectoryLoader, PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.embeddings import OpenAIEmbeddings
-from langchain.vectorstores import Pinecone
 import pinecone
 from dotenv import load_dotenv
+from chatbot_common.embedding_cache import CachedEmbeddings, EmbeddingStore
+from chatbot_common.pdf_loader import PDFLoadStats, load_and_split
+from chatbot_common.vector_writer import VectorWriter
 import os
 
 # load your credentials from .env file
@@ -14,6 +15,7 @@ pinecone_api_key = os.getenv("PINECONE_API_KEY")
 pinecone_environment = os.getenv("PINECONE_ENVIRONMENT")
 pinecone_index = os.getenv("PINECONE_INDEX_NAME")
 pinecone_namespace = os.getenv("PINECONE_NAMESPACE")
+embedding_cache_dir = os.getenv("EMBEDDING_CACHE_DIR", "embedding_cache")
 
 """
 Ingest your documents into Pinecone vectorstore
@@ -28,25 +30,27 @@ def ingest_docs():
         raise ValueError("Please set OPENAI_API_KEY in .env file.")
 
     try:
-        # load documents from folder
-        loader = DirectoryLoader(
-            folder_path, glob="**/*.pdf", loader_cls=PyPDFLoader, recursive=True
-        )
-        docs = loader.load()
-
-        # split documents into chunks
+        # load and split documents from folder, parsing PDFs in parallel
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000, chunk_overlap=100)
-
-        split_docs = text_splitter.split_documents(docs)
+        stats = PDFLoadStats()
+        split_docs = load_and_split(folder_path, text_splitter, stats)
+        print(f"Loaded {stats}")
 
         embeddings = OpenAIEmbeddings(
             model='text-embedding-ada-002', openai_api_key=openai_api_key)
+        # only embed chunks that aren't in the local cache yet
+        if embedding_cache_dir:
+            embeddings = CachedEmbeddings(
+                embeddings, EmbeddingStore(embedding_cache_dir), embeddings.model)
 
         pinecone.init(
             api_key=pinecone_api_key, environment=pinecone_environment)
-        Pinecone.from_documents(
-            split_docs, embeddings, index_name=pinecone_index, namespace=pinecone_namespace)
+        # embed and upsert concurrently, overlapping the two
+        stats = VectorWriter(
+            embeddings, pinecone.Index(pinecone_index), namespace=pinecone_namespace
+        ).write(split_docs)
+        print(f"Wrote {stats}")
         return "Documents ingested into Pinecone vectorstore."
     except Exception as e:
         print(f"An error occurred whilst ingesting your files: {str(e)}")
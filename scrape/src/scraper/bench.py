@@ -0,0 +1,187 @@
+"""
+Golden-page checks and micro-benchmarks for the parsing hot paths.
+
+Usage:
+    python -m src.scraper.bench                     # compare with bench/baseline.json
+    python -m src.scraper.bench --update-baseline   # record timings on this machine
+    python -m src.scraper.bench --no-timing         # results only, as in CI
+
+Every extractor runs on the anonymized pages in bench/corpus with each
+BeautifulSoup backend, and the text helpers run on the inputs listed in
+bench/corpus/expected.json. For each case the median time per call and the
+peak allocation (tracemalloc) are reported.
+
+Exits 1 when a result differs from expected.json, or when a case is slower
+or allocates more than its baseline times --tolerance. Baselines depend on
+the machine; refresh them with --update-baseline after intended changes, and
+pass --no-timing where they don't apply (shared CI runners).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from .parsing import (
+    TS_REGEX,
+    find_brave_result,
+    find_ddg_result,
+    find_gnw_search_result,
+    find_release_timestamp,
+    timestamp_to_iso,
+)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CORPUS_DIR = os.path.join(PROJECT_DIR, "bench", "corpus")
+BASELINE_PATH = os.path.join(PROJECT_DIR, "bench", "baseline.json")
+
+BACKENDS = ("lxml", "html.parser")
+
+# Differences below these are noise, whatever the ratio
+MIN_SLOWDOWN_US = 50.0
+MIN_GROWTH_KIB = 64.0
+
+PAGE_EXTRACTORS: Dict[str, Callable[..., Any]] = {
+    "find_brave_result": find_brave_result,
+    "find_ddg_result": find_ddg_result,
+    "find_gnw_search_result": find_gnw_search_result,
+    "find_release_timestamp": find_release_timestamp,
+}
+
+
+def _ts_regex(text: str) -> Optional[str]:
+    m = TS_REGEX.search(text)
+    return m.group(1).strip() if m else None
+
+
+TEXT_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "timestamp_to_iso": timestamp_to_iso,
+    "TS_REGEX": _ts_regex,
+}
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[..., Any]
+    args: Tuple
+    expected: Any
+
+
+def load_cases(corpus_dir: str) -> List[Case]:
+    with open(os.path.join(corpus_dir, "expected.json"), "r", encoding="utf-8") as f:
+        expected = json.load(f)
+
+    pages: Dict[str, bytes] = {}
+
+    def page(name: str) -> bytes:
+        if name not in pages:
+            with open(os.path.join(corpus_dir, name), "rb") as f:
+                pages[name] = f.read()
+        return pages[name]
+
+    cases = []
+    for extractor, by_page in expected.get("pages", {}).items():
+        fn = PAGE_EXTRACTORS[extractor]
+        for name, want in by_page.items():
+            for backend in BACKENDS:
+                cases.append(Case(f"{extractor}[{backend}] {name}", fn, (page(name), backend), want))
+
+    for func, items in expected.get("texts", {}).items():
+        fn = TEXT_FUNCTIONS[func]
+        for i, item in enumerate(items):
+            cases.append(Case(f"{func} #{i}", fn, tuple(item["args"]), item["expected"]))
+
+    # The dateline regex on full page text, the way find_release_timestamp runs it
+    for name, want in expected.get("pages", {}).get("find_release_timestamp", {}).items():
+        text = BeautifulSoup(page(name), "lxml").get_text(separator="\n")
+        cases.append(Case(f"TS_REGEX {name}", _ts_regex, (text,), want))
+    return cases
+
+
+def measure(case: Case, repeat: int) -> Dict[str, Any]:
+    result = case.fn(*case.args)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.fn(*case.args)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    case.fn(*case.args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ok": result == case.expected,
+        "result": result,
+        "median_us": statistics.median(timings) * 1e6,
+        "peak_kib": peak / 1024.0,
+    }
+
+
+def _regressions(m: Dict[str, Any], base: Optional[Dict[str, float]], tolerance: float) -> List[str]:
+    if not base:
+        return []
+    problems = []
+    if m["median_us"] > base["median_us"] * tolerance and m["median_us"] - base["median_us"] > MIN_SLOWDOWN_US:
+        problems.append(f"time {m['median_us']:.0f}us vs baseline {base['median_us']:.0f}us")
+    if m["peak_kib"] > base["peak_kib"] * tolerance and m["peak_kib"] - base["peak_kib"] > MIN_GROWTH_KIB:
+        problems.append(f"peak {m['peak_kib']:.0f}KiB vs baseline {base['peak_kib']:.0f}KiB")
+    return problems
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.scraper.bench")
+    parser.add_argument("--corpus", default=CORPUS_DIR)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--repeat", type=int, default=30, help="timed calls per case")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="allowed ratio over baseline")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--no-timing", action="store_true", help="check results only, not timings against the baseline"
+    )
+    args = parser.parse_args(argv)
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    failures = 0
+    measured: Dict[str, Dict[str, float]] = {}
+    print(f"{'case':<60} {'median us':>10} {'peak KiB':>9}  status")
+    for case in load_cases(args.corpus):
+        if args.filter not in case.name:
+            continue
+        m = measure(case, args.repeat)
+        measured[case.name] = {"median_us": round(m["median_us"], 1), "peak_kib": round(m["peak_kib"], 1)}
+
+        problems = [] if m["ok"] else [f"expected {case.expected!r}, got {m['result']!r}"]
+        if not args.no_timing:
+            problems += _regressions(m, baseline.get(case.name), args.tolerance)
+        failures += bool(problems)
+        status = "; ".join(problems) if problems else "ok"
+        print(f"{case.name:<60} {m['median_us']:>10.1f} {m['peak_kib']:>9.1f}  {status}")
+
+    if args.update_baseline and not failures:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(measured, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if failures:
+        print(f"{failures} case(s) failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
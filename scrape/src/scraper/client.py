@@ -1,22 +1,44 @@
-from typing import Optional, Dict
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, Dict
+from urllib.parse import urlparse
+
+from scraper_common import stats, throttle
 
 from . import config
 
+if TYPE_CHECKING:
+    import requests
+    from urllib3.util.retry import Retry
+
+# One session per thread: sessions keep connections alive but aren't thread-safe
+_local = threading.local()
+
+
+def _build_retry() -> "Retry":
+    from urllib3.util.retry import Retry
 
-def _build_retry() -> Retry:
+    # Throttling responses (429/503) are not retried here: a retry would happen
+    # inside the limiter slot, hiding them from the host's AIMD controller
     return Retry(
         total=3,
         backoff_factor=0.5,
-        status_forcelist=(429, 500, 502, 503, 504),
+        status_forcelist=tuple(
+            s for s in (429, 500, 502, 503, 504) if s not in throttle.THROTTLE_STATUSES
+        ),
         allowed_methods=("HEAD", "GET", "OPTIONS"),
         raise_on_status=False,
     )
 
 
-def get_session() -> requests.Session:
+def get_session() -> "requests.Session":
+    s = getattr(_local, "session", None)
+    if s is not None:
+        return s
+    # Imported on first use rather than at module level to keep CLI startup fast
+    import requests
+    from requests.adapters import HTTPAdapter
+
     s = requests.Session()
     retry = _build_retry()
     adapter = HTTPAdapter(max_retries=retry)
@@ -32,10 +54,28 @@ def get_session() -> requests.Session:
     s.headers.update(headers)
     if config.PROXY:
         s.proxies.update({"http": config.PROXY, "https": config.PROXY})
+    _local.session = s
     return s
 
-def get(url: str, params: Optional[Dict] = None) -> requests.Response:
+
+def get(url: str, params: Optional[Dict] = None) -> "requests.Response":
+    """GET through the host's adaptive concurrency limiter."""
     s = get_session()
-    resp = s.get(url, params=params, timeout=config.REQUEST_TIMEOUT)
+    limiter = throttle.get_limiter(
+        urlparse(url).netloc,
+        initial=config.HOST_CONCURRENCY_INITIAL,
+        minimum=config.HOST_CONCURRENCY_MIN,
+        maximum=config.HOST_CONCURRENCY_MAX,
+        spike_factor=config.LATENCY_SPIKE_FACTOR,
+    )
+    with stats.stage("throttle"):
+        limiter.acquire()
+    start = time.monotonic()
+    status = None
+    try:
+        resp = s.get(url, params=params, timeout=config.REQUEST_TIMEOUT)
+        status = resp.status_code
+    finally:
+        limiter.release(time.monotonic() - start, status)
     resp.raise_for_status()
     return resp
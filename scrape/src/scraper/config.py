@@ -1,7 +1,26 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def _load_dotenv() -> None:
+    """
+    Load the nearest .env above this package, as load_dotenv() would. Importing
+    python-dotenv takes ~12 ms, so it only happens when there is a file to read.
+    """
+    path = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(path, ".env")
+        if os.path.isfile(candidate):
+            from dotenv import load_dotenv
+
+            load_dotenv(candidate)
+            return
+        parent = os.path.dirname(path)
+        if parent == path:
+            return
+        path = parent
+
+
+_load_dotenv()
 
 USER_AGENT = os.getenv(
     "USER_AGENT",
@@ -9,3 +28,31 @@ USER_AGENT = os.getenv(
 )
 PROXY = os.getenv("PROXY", "")
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "15"))
+
+# Adaptive per-host concurrency (AIMD): start, floor and ceiling of in-flight requests
+HOST_CONCURRENCY_INITIAL = int(os.getenv("HOST_CONCURRENCY_INITIAL", "2"))
+HOST_CONCURRENCY_MIN = int(os.getenv("HOST_CONCURRENCY_MIN", "1"))
+HOST_CONCURRENCY_MAX = int(os.getenv("HOST_CONCURRENCY_MAX", "16"))
+# A response slower than this multiple of the host's average latency counts as congestion
+LATENCY_SPIKE_FACTOR = float(os.getenv("LATENCY_SPIKE_FACTOR", "3.0"))
+
+# Worker processes for HTML parsing (0 parses inline). PARSE_QUEUE_SIZE bounds pending parse jobs.
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))
+PARSE_QUEUE_SIZE = int(os.getenv("PARSE_QUEUE_SIZE", "32"))
+
+# Sampling interval of the --profile option in milliseconds
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+
+# Logging (see scraper_common.logs): level, "json" or "text" lines on stderr, and sampling of
+# sub-WARNING records per stage, e.g. "search=0.1,fetch=0.25" ("*" matches any stage)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+
+# Resolver cascade (see resolvers.py): resolvers running at once for a row, counting
+# hedges started when a resolver runs past its p90 latency
+RESOLVER_MAX_PARALLEL = int(os.getenv("RESOLVER_MAX_PARALLEL", "2"))
+# Google CSE credentials; with both set, and gnw_google (../scraping/gnw_scraper_project)
+# installed from requirements.txt, its search_release_urls runs as the google-cse resolver
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
+GOOGLE_SEARCH_CX = os.getenv("GOOGLE_SEARCH_CX", "")
@@ -1,7 +1,10 @@
 import csv
-import sys
+import logging
+import queue
 import re
+import threading
 import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
@@ -9,6 +12,8 @@ from urllib.parse import quote_plus
 
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 
+logger = logging.getLogger(__name__)
+
 # Your input format is:
 #   Ticker,Date,Headline
 # with NO header row.
@@ -73,12 +78,12 @@ def _find_gnw_url_for_headline(page, headline: str) -> Optional[str]:
 
     search_q = quote_plus(headline)
     search_url = f"https://www.globenewswire.com/en/search?query={search_q}"
-    print(f"[DEBUG] GNW Search URL: {search_url}", file=sys.stderr)
+    logger.debug("GNW Search URL: %s", search_url, extra={"stage": "search"})
 
     try:
         page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
     except PlaywrightTimeoutError:
-        print("[WARN] GNW search timeout", file=sys.stderr)
+        logger.warning("GNW search timeout")
         return None
 
     # Give extra time for any client-side rendering and to allow visual inspection
@@ -103,6 +108,61 @@ def _find_gnw_url_for_headline(page, headline: str) -> Optional[str]:
     return None
 
 
+class PlaywrightSearch:
+    """
+    Headless GNW site search for the resolver cascade (see resolvers.py).
+
+    Playwright's sync API is bound to the thread that started it, so one
+    background thread owns the browser and serves searches from a queue.
+    """
+
+    def __init__(self, timeout: float = 60.0):
+        self.timeout = timeout
+        self.failed = False
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _serve(self) -> None:
+        try:
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=True)
+                page = browser.new_context().new_page()
+                while True:
+                    headline, future = self._jobs.get()
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        future.set_result(_find_gnw_url_for_headline(page, headline))
+                    except Exception as e:
+                        future.set_exception(e)
+        except Exception as e:
+            logger.error("Playwright search disabled: %s", e)
+            self.failed = True
+
+    def search(self, headline: str, cancel: threading.Event) -> Optional[str]:
+        if self.failed or cancel.is_set():
+            return None
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._serve, name="playwright", daemon=True)
+                self._thread.start()
+
+        future: Future = Future()
+        self._jobs.put((headline, future))
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline and not self.failed:
+            if cancel.is_set():
+                future.cancel()
+                return None
+            try:
+                return future.result(timeout=0.5)
+            except FutureTimeoutError:
+                continue
+        future.cancel()
+        return None
+
+
 def _scrape_row(page, ticker: str, date_str: str, headline: str) -> PRInfo:
     """
     For a single row (ticker, date, headline):
@@ -112,15 +172,15 @@ def _scrape_row(page, ticker: str, date_str: str, headline: str) -> PRInfo:
     """
     gnw_url = _find_gnw_url_for_headline(page, headline)
     if not gnw_url:
-        print(f"[WARN] No GNW URL found for headline={headline!r}", file=sys.stderr)
+        logger.warning("No GNW URL found for headline=%r", headline)
         return PRInfo(url="", ts_raw="", ts_iso="")
 
-    print(f"[INFO] GNW URL -> {gnw_url}", file=sys.stderr)
+    logger.info("GNW URL -> %s", gnw_url)
 
     try:
         page.goto(gnw_url, wait_until="domcontentloaded", timeout=20000)
     except PlaywrightTimeoutError:
-        print(f"[WARN] Timeout loading GNW URL: {gnw_url}", file=sys.stderr)
+        logger.warning("Timeout loading GNW URL: %s", gnw_url)
         return PRInfo(url=gnw_url, ts_raw="", ts_iso="")
 
     page.wait_for_timeout(1000)
@@ -150,7 +210,7 @@ def run_scraper(input_csv: str, output_csv: str) -> None:
             if not row or all(not str(x).strip() for x in row):
                 continue
             if len(row) < 3:
-                print(f"[WARN] Row {i}: not enough columns -> {row!r}", file=sys.stderr)
+                logger.warning("Row %d: not enough columns -> %r", i, row)
                 continue
 
             ticker = str(row[0]).strip()
@@ -178,10 +238,7 @@ def run_scraper(input_csv: str, output_csv: str) -> None:
             writer.writeheader()
 
             for i, (ticker, date_str, headline) in enumerate(rows, start=1):
-                print(
-                    f"[INFO] Row {i}: searching GNW for headline={headline!r}",
-                    file=sys.stderr,
-                )
+                logger.info("Row %d: searching GNW for headline=%r", i, headline)
                 pr = _scrape_row(page, ticker, date_str, headline)
 
                 writer.writerow(
@@ -197,10 +254,10 @@ def run_scraper(input_csv: str, output_csv: str) -> None:
 
                 # In debug mode, stop after a few rows so you can inspect Bing behavior
                 if i >= MAX_ROWS_DEBUG:
-                    print("[INFO] Reached debug row limit, stopping early.", file=sys.stderr)
+                    logger.info("Reached debug row limit, stopping early.")
                     break
 
         context.close()
         browser.close()
 
-    print(f"[DONE] Wrote {output_csv}", file=sys.stderr)
\ No newline at end of file
+    logger.info("Wrote %s", output_csv)
\ No newline at end of file
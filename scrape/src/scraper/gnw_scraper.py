@@ -1,18 +1,28 @@
 import csv
-import sys
-import time
-import re
+import importlib.util
+import logging
 import os
+import threading
+import time
 from dataclasses import dataclass
 from typing import Optional
-from datetime import datetime
-from urllib.parse import quote_plus, urlparse, parse_qs, unquote
+from urllib.parse import quote_plus
 
-import requests
-from bs4 import BeautifulSoup
+from scraper_common import stats, throttle
 
+from . import config
 from .client import get
+from .parsing import (
+    find_brave_result,
+    find_ddg_result,
+    find_gnw_search_result,
+    find_release_timestamp,
+    get_parse_stage,
+    timestamp_to_iso,
+)
+from .resolvers import Query, get_engine, is_release_url
 
+logger = logging.getLogger(__name__)
 
 # Be polite to search engines + GNW
 SEARCH_SLEEP = 2.0   # seconds between search calls
@@ -26,15 +36,6 @@ class PRInfo:
     ts_iso: str
 
 
-# Matches things like:
-#  "November 14, 2025 09:15 ET"
-#  "November 14, 2025 9:15 AM ET"
-#  "November 14, 2025 09:15:30 ET"
-TS_REGEX = re.compile(
-    r"([A-Za-z]+ \d{1,2}, \d{4} \d{1,2}:\d{2}(?::\d{2})? ?(?:AM|PM)? ?ET)"
-)
-
-
 def _search_gnw_url_via_bing_api(headline: str) -> Optional[str]:
     api_key = os.getenv("BING_SEARCH_API_KEY", "").strip()
     if not api_key:
@@ -49,141 +50,207 @@ def _search_gnw_url_via_bing_api(headline: str) -> Optional[str]:
     headers = {"Ocp-Apim-Subscription-Key": api_key}
     params = {"q": query, "responseFilter": "Webpages", "count": 5}
 
+    import requests
+
+    stats.count("queries")
     try:
-        resp = requests.get(endpoint, headers=headers, params=params, timeout=10)
+        with stats.stage("search"):
+            resp = requests.get(endpoint, headers=headers, params=params, timeout=10)
     except Exception as e:
-        print(f"[ERROR] Bing API request failed: {e}", file=sys.stderr)
+        logger.error("Bing API request failed: %s", e)
         return None
 
     if resp.status_code != 200:
-        print(f"[ERROR] Bing API HTTP {resp.status_code}: {resp.text[:200]}", file=sys.stderr)
+        logger.error("Bing API HTTP %s: %s", resp.status_code, resp.text[:200])
         return None
 
     try:
         data = resp.json()
     except ValueError as e:
-        print(f"[ERROR] Bing API JSON decode failed: {e}", file=sys.stderr)
+        logger.error("Bing API JSON decode failed: %s", e)
         return None
 
     web_pages = data.get("webPages", {}).get("value", [])
     for item in web_pages:
         url = item.get("url", "")
         if "globenewswire.com" in url and "news-release" in url:
-            print(f"[INFO] Bing API GNW URL -> {url}", file=sys.stderr)
+            logger.info("Bing API GNW URL -> %s", url)
             return url
 
     return None
 
 
-def search_gnw_url_for_headline(headline: str) -> Optional[str]:
-    """Use Brave Search HTML to find the GlobeNewswire URL for a given headline.
-
-    We query Brave with:
-        site:globenewswire.com/news-release "headline"
-
-    and return the first matching GNW news-release URL, or None.
-    """
-    headline = headline.strip()
-    # Normalize curly quotes to straight quotes for better search matching
-    headline = (
-        headline.replace("\u201C", '"')
-                .replace("\u201D", '"')
-                .replace("\u2018", "'")
-                .replace("\u2019", "'")
+def _normalize_headline(headline: str) -> str:
+    """Strip and normalize curly quotes to straight quotes for better search matching."""
+    return (
+        headline.strip()
+                .replace("“", '"')
+                .replace("”", '"')
+                .replace("‘", "'")
+                .replace("’", "'")
     )
-    if not headline:
-        return None
 
-    api_url = _search_gnw_url_via_bing_api(headline)
-    if api_url:
-        return api_url
 
+def _search_brave(query: Query, cancel: threading.Event) -> Optional[str]:
+    """Brave Search HTML, with a narrow then a broader site: query."""
     # Start with a small set of targeted queries to reduce the chance of
     # hitting Brave rate limits (429). We can expand later if needed.
     queries = [
-        f'site:globenewswire.com/news-release "{headline}"',
-        f'site:globenewswire.com "{headline}"',
+        f'site:globenewswire.com/news-release "{query.headline}"',
+        f'site:globenewswire.com "{query.headline}"',
     ]
 
-    for query in queries:
-        url = "https://search.brave.com/search?q=" + quote_plus(query)
-        print(f"[DEBUG] Brave URL: {url}", file=sys.stderr)
+    for q in queries:
+        if cancel.is_set():
+            return None
+        url = "https://search.brave.com/search?q=" + quote_plus(q)
+        logger.debug("Brave URL: %s", url, extra={"stage": "search"})
 
+        stats.count("queries")
         try:
-            resp = get(url)
+            with stats.stage("search"):
+                resp = get(url)
         except Exception as e:
-            print(f"[ERROR] Brave request failed: {e}", file=sys.stderr)
-            resp = None
-
-        soup = BeautifulSoup(resp.text, "lxml") if resp is not None else None
-        if soup is None:
+            logger.error("Brave request failed: %s", e)
             continue
 
-        found = None
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if not href:
-                continue
-
-            # Skip Brave internal links like "/ask" or navigation anchors.
-            if href.startswith("/"):
-                continue
-
-            # Only accept absolute GNW news-release URLs.
-            if href.startswith("http") and "globenewswire.com" in href and "news-release" in href:
-                found = href
-                break
-
+        # Result pages are parsed in the parse stage; this thread only fetches
+        with stats.stage("parse"):
+            found = get_parse_stage().run(find_brave_result, resp.content)
         if found:
             return found
+    return None
+
 
-    # Fallback: DuckDuckGo HTML endpoint
-    ddg_query = quote_plus(query)
+def _search_ddg(query: Query, cancel: threading.Event) -> Optional[str]:
+    """DuckDuckGo HTML endpoint."""
+    ddg_query = quote_plus(f'site:globenewswire.com "{query.headline}"')
     ddg_url = f"https://duckduckgo.com/html/?q={ddg_query}"
-    print(f"[DEBUG] DDG URL: {ddg_url}", file=sys.stderr)
+    logger.debug("DDG URL: %s", ddg_url, extra={"stage": "search"})
+    stats.count("queries")
     try:
-        ddg_resp = get(ddg_url)
-        ddg_soup = BeautifulSoup(ddg_resp.text, "lxml")
-        for a in ddg_soup.find_all("a", href=True):
-            href = a["href"]
-            # Direct GNW link
-            if "globenewswire.com" in href and "news-release" in href:
-                return href
-            # DuckDuckGo redirect like /l/?kh=-1&uddg=<encoded>
-            if href.startswith("/l/") or href.startswith("/r/"):
-                try:
-                    parsed = urlparse(href)
-                    params = parse_qs(parsed.query)
-                    target_list = params.get("uddg") or params.get("u") or []
-                    if target_list:
-                        real = unquote(unquote(target_list[0]))
-                        if "globenewswire.com" in real and "news-release" in real:
-                            return real
-                except Exception:
-                    pass
+        with stats.stage("search"):
+            ddg_resp = get(ddg_url)
+        if cancel.is_set():
+            return None
+        with stats.stage("parse"):
+            return get_parse_stage().run(find_ddg_result, ddg_resp.content)
     except Exception as e:
-        print(f"[ERROR] DDG request failed: {e}", file=sys.stderr)
+        logger.error("DDG request failed: %s", e)
+        return None
+
 
-    # Fallback: GlobeNewswire site search
+def _search_gnw_site(query: Query, cancel: threading.Event) -> Optional[str]:
+    """GlobeNewswire's own site search."""
     try:
-        gnw_search_q = quote_plus(headline)
+        gnw_search_q = quote_plus(query.headline)
         gnw_search_url = f"https://www.globenewswire.com/en/search?query={gnw_search_q}"
-        print(f"[DEBUG] GNW Search URL: {gnw_search_url}", file=sys.stderr)
-        gnw_resp = get(gnw_search_url)
-        gnw_soup = BeautifulSoup(gnw_resp.text, "lxml")
-        for a in gnw_soup.find_all("a", href=True):
-            href = a["href"]
-            if "globenewswire.com" in href and "news-release" in href:
-                return href
-            # Some links may be relative
-            if href.startswith("/en/news-release"):
-                return "https://www.globenewswire.com" + href
+        logger.debug("GNW Search URL: %s", gnw_search_url, extra={"stage": "search"})
+        stats.count("queries")
+        with stats.stage("search"):
+            gnw_resp = get(gnw_search_url)
+        if cancel.is_set():
+            return None
+        with stats.stage("parse"):
+            return get_parse_stage().run(find_gnw_search_result, gnw_resp.content)
     except Exception as e:
-        print(f"[ERROR] GNW site search failed: {e}", file=sys.stderr)
+        logger.error("GNW site search failed: %s", e)
+        return None
+
 
+_google_search = None
+_google_lock = threading.Lock()
+
+
+def _google_available() -> bool:
+    # The gnw_google package (../scraping/gnw_scraper_project) is only imported
+    # when the tier first runs; here just check it is installed and keyed
+    if not (config.GOOGLE_API_KEY and config.GOOGLE_SEARCH_CX):
+        return False
+    return importlib.util.find_spec("gnw_google") is not None
+
+
+def _search_google(query: Query, cancel: threading.Event) -> Optional[str]:
+    """Google CSE through gnw_google.search_release_urls, limited to globenewswire.com."""
+    global _google_search
+    with _google_lock:
+        if _google_search is None:
+            from gnw_google.gnw_scraper import search_release_urls
+
+            _google_search = search_release_urls
+    # Counts its own queries and search time, in the same stats as the other tiers
+    urls = _google_search(query.ticker, query.headline, query.date_str, sites=["globenewswire.com"])
+    for url in urls or []:
+        if is_release_url(url):
+            return url
     return None
 
 
+_playwright_search = None
+_playwright_lock = threading.Lock()
+
+
+def _playwright_available() -> bool:
+    # Only check that it is installed; Playwright itself loads when the tier first runs
+    if _playwright_search is not None:
+        return not _playwright_search.failed
+    return importlib.util.find_spec("playwright") is not None
+
+
+def _search_playwright(query: Query, cancel: threading.Event) -> Optional[str]:
+    global _playwright_search
+    with _playwright_lock:
+        if _playwright_search is None:
+            from .gnw_playwright import PlaywrightSearch
+
+            _playwright_search = PlaywrightSearch()
+    stats.count("queries")
+    with stats.stage("search"):
+        return _playwright_search.search(query.headline, cancel)
+
+
+def register_resolvers(engine) -> None:
+    """Register the built-in resolvers; called by get_engine() when it creates the engine."""
+    # Declared latency (seconds) and hit rate are starting points; the engine
+    # replaces them with what it measures as rows resolve.
+    engine.register(
+        "bing-api",
+        lambda q, cancel: _search_gnw_url_via_bing_api(q.headline),
+        expected_seconds=0.8,
+        hit_rate=0.7,
+        available=lambda: bool(os.getenv("BING_SEARCH_API_KEY", "").strip()),
+    )
+    engine.register("google-cse", _search_google, expected_seconds=1.0, hit_rate=0.6, available=_google_available)
+    engine.register("gnw-search", _search_gnw_site, expected_seconds=1.5, hit_rate=0.5)
+    engine.register("brave", _search_brave, expected_seconds=2.0, hit_rate=0.4)
+    engine.register("ddg", _search_ddg, expected_seconds=1.5, hit_rate=0.3)
+    engine.register(
+        "playwright", _search_playwright, expected_seconds=8.0, hit_rate=0.5, available=_playwright_available
+    )
+
+
+
+def search_gnw_url_for_headline(headline: str, ticker: str = "", date_str: str = "") -> Optional[str]:
+    """Find the GlobeNewswire news-release URL for a headline, or None.
+
+    The registered resolvers (Bing API, Google CSE, GNW site search, Brave,
+    DuckDuckGo, headless Playwright) run cheapest first with hedging; see
+    resolvers.py. The winning resolver is recorded on the current row.
+    """
+    headline = _normalize_headline(headline)
+    if not headline:
+        return None
+
+    found = get_engine().resolve(Query(headline=headline, ticker=ticker, date_str=date_str))
+    if found is None:
+        return None
+    url, resolver = found
+    row_stats = stats.current()
+    if row_stats is not None:
+        row_stats.resolver = resolver
+    return url
+
+
 def extract_timestamp_from_gnw(url: str) -> PRInfo:
     """
     Given a GNW news-release URL, download the page, extract the timestamp
@@ -193,52 +260,38 @@ def extract_timestamp_from_gnw(url: str) -> PRInfo:
         return PRInfo(url="", ts_raw="", ts_iso="")
 
     try:
-        resp = get(url)
+        with stats.stage("fetch"):
+            resp = get(url)
+        stats.count("pages_fetched")
     except Exception as e:
-        print(f"[ERROR] GNW request failed for {url}: {e}", file=sys.stderr)
+        logger.error("GNW request failed for %s: %s", url, e)
+        stats.reject(stats.FETCH_ERROR)
         return PRInfo(url=url, ts_raw="", ts_iso="")
 
     if resp.status_code != 200:
-        print(f"[WARN] GNW HTTP {resp.status_code} for {url}", file=sys.stderr)
+        logger.warning("GNW HTTP %s for %s", resp.status_code, url)
         return PRInfo(url=url, ts_raw="", ts_iso="")
 
-    soup = BeautifulSoup(resp.text, "lxml")
-    text = soup.get_text(separator="\n")
-
-    m = TS_REGEX.search(text)
-    if not m:
-        print(f"[WARN] No timestamp pattern found on {url}", file=sys.stderr)
+    with stats.stage("parse"):
+        ts_raw = get_parse_stage().run(find_release_timestamp, resp.content)
+    if not ts_raw:
+        logger.warning("No timestamp pattern found on %s", url)
         return PRInfo(url=url, ts_raw="", ts_iso="")
 
-    ts_raw = m.group(1).strip()
-
-    # Strip 'ET' to parse
-    cleaned = ts_raw.replace("ET", "").strip()
-
-    ts_iso = ""
-    for fmt in (
-        "%B %d, %Y %H:%M",
-        "%B %d, %Y %H:%M:%S",
-        "%B %d, %Y %I:%M %p",
-        "%B %d, %Y %I:%M:%S %p",
-    ):
-        try:
-            dt = datetime.strptime(cleaned, fmt)
-            ts_iso = dt.strftime("%Y-%m-%d %H:%M:%S") + " ET"
-            break
-        except ValueError:
-            continue
-
-    return PRInfo(url=url, ts_raw=ts_raw, ts_iso=ts_iso)
+    return PRInfo(url=url, ts_raw=ts_raw, ts_iso=timestamp_to_iso(ts_raw))
 
 
-def process_file(input_csv: str, output_csv: str) -> None:
+def process_file(input_csv: str, output_csv: str, extended: bool = False) -> None:
     """
     Expect input CSV with NO header, comma-separated, where:
       col 0 = Ticker
       col 1 = Date/Time (your feed timestamp)
       col 2+ = Headline (may contain commas, so we join the rest)
     Write output CSV with a header row and added GNW columns.
+
+    With extended=True, also write stats.EXTENDED_FIELDS per row: which search
+    resolved it, queries spent, pages fetched, cache hits, wall time per stage
+    and the final status.
     """
 
     with open(input_csv, newline="", encoding="utf-8-sig") as f_in, \
@@ -253,6 +306,8 @@ def process_file(input_csv: str, output_csv: str) -> None:
             "GNW_timestamp_raw",
             "GNW_timestamp_iso",
         ]
+        if extended:
+            fieldnames += stats.EXTENDED_FIELDS
         writer = csv.DictWriter(f_out, fieldnames=fieldnames)
         writer.writeheader()
 
@@ -263,7 +318,7 @@ def process_file(input_csv: str, output_csv: str) -> None:
 
             # Ensure we have at least ticker, date/time, and headline start
             if len(row) < 3:
-                print(f"[WARN] Row {i}: not enough columns -> {row!r}", file=sys.stderr)
+                logger.warning("Row %d: not enough columns -> %r", i, row)
                 continue
 
             ticker = str(row[0]).strip()
@@ -271,10 +326,7 @@ def process_file(input_csv: str, output_csv: str) -> None:
             # Join the rest as headline (to handle commas in the text)
             headline = ",".join(row[2:]).strip()
 
-            print(f"[INFO] Row {i}: searching GNW for headline={headline!r}", file=sys.stderr)
-
-            url = search_gnw_url_for_headline(headline)
-            time.sleep(SEARCH_SLEEP)
+            logger.info("Row %d: searching GNW for headline=%r", i, headline)
 
             out_row = {
                 "Ticker": ticker,
@@ -285,14 +337,29 @@ def process_file(input_csv: str, output_csv: str) -> None:
                 "GNW_timestamp_iso": "",
             }
 
-            if not url:
-                print(f"[WARN] Row {i}: no GNW URL found", file=sys.stderr)
-            else:
-                print(f"[INFO] Row {i}: GNW URL -> {url}", file=sys.stderr)
-                pr = extract_timestamp_from_gnw(url)
-                time.sleep(GNW_SLEEP)
-                out_row["GNW_URL"] = pr.url
-                out_row["GNW_timestamp_raw"] = pr.ts_raw
-                out_row["GNW_timestamp_iso"] = pr.ts_iso
-
-            writer.writerow(out_row)
\ No newline at end of file
+            with stats.track_row() as row_stats:
+                url = search_gnw_url_for_headline(headline, ticker=ticker, date_str=date_str)
+
+                if not url:
+                    logger.warning("Row %d: no GNW URL found", i)
+                else:
+                    logger.info("Row %d: GNW URL -> %s", i, url)
+                    pr = extract_timestamp_from_gnw(url)
+                    out_row["GNW_URL"] = pr.url
+                    out_row["GNW_timestamp_raw"] = pr.ts_raw
+                    out_row["GNW_timestamp_iso"] = pr.ts_iso
+
+                row_stats.finish(bool(out_row["GNW_timestamp_iso"]))
+
+            if extended:
+                out_row.update(zip(stats.EXTENDED_FIELDS, row_stats.as_columns()))
+
+            with stats.stage("write"):
+                writer.writerow(out_row)
+
+            # Be polite; sleeps are kept out of the row's timing stats
+            with stats.stage("sleep"):
+                time.sleep(SEARCH_SLEEP + (GNW_SLEEP if url else 0.0))
+
+    logger.info("Per-host concurrency: %s", throttle.metrics())
+    logger.info("Resolvers: %s", get_engine().metrics())
@@ -1,11 +1,18 @@
+import argparse
+from contextlib import nullcontext
 import sys
+
+from scraper_common.logs import setup_logging
+from scraper_common.profiler import profiling
+
+from . import config
 from .gnw_scraper import process_file
 
 
 def main(argv=None) -> None:
     """
     Usage:
-        python -m src.scraper.main input.csv output.csv
+        python -m src.scraper.main input.csv output.csv [--extended] [--profile [PREFIX]]
 
     Where input.csv has NO header and rows like:
         Ticker,Date,Headline
@@ -13,13 +20,27 @@ def main(argv=None) -> None:
     if argv is None:
         argv = sys.argv[1:]
 
-    if len(argv) != 2:
-        print("Usage: python -m src.scraper.main input.csv output.csv", file=sys.stderr)
-        sys.exit(1)
+    parser = argparse.ArgumentParser(prog="python -m src.scraper.main")
+    parser.add_argument("input_csv")
+    parser.add_argument("output_csv")
+    parser.add_argument(
+        "--extended",
+        action="store_true",
+        help="add provenance and timing columns (resolver, queries, pages, cache hits, stage times, status)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile",
+        metavar="PREFIX",
+        help="sample the run and write PREFIX.folded (flamegraph) and PREFIX.txt (summary)",
+    )
+    args = parser.parse_args(argv)
+    setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_SAMPLE_RATES)
 
-    input_csv, output_csv = argv
-    process_file(input_csv, output_csv)
+    with profiling(args.profile, config.PROFILE_INTERVAL_MS) if args.profile else nullcontext():
+        process_file(args.input_csv, args.output_csv, extended=args.extended)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,172 @@
+import atexit
+import logging
+import re
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
+from urllib.parse import parse_qs, unquote, urlparse
+
+from . import config
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _soup(content: bytes, features: str):
+    # bs4 costs ~90 ms to import; load it on the first parse, not at startup
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(content, features)
+
+
+# Matches things like:
+#  "November 14, 2025 09:15 ET"
+#  "November 14, 2025 9:15 AM ET"
+#  "November 14, 2025 09:15:30 ET"
+TS_REGEX = re.compile(
+    r"([A-Za-z]+ \d{1,2}, \d{4} \d{1,2}:\d{2}(?::\d{2})? ?(?:AM|PM)? ?ET)"
+)
+
+TS_FORMATS = (
+    "%B %d, %Y %H:%M",
+    "%B %d, %Y %H:%M:%S",
+    "%B %d, %Y %I:%M %p",
+    "%B %d, %Y %I:%M:%S %p",
+)
+
+
+def _is_gnw_release(href: str) -> bool:
+    return "globenewswire.com" in href and "news-release" in href
+
+
+def find_brave_result(content: bytes, features: str = "lxml") -> Optional[str]:
+    """First absolute GNW news-release link on a Brave results page."""
+    soup = _soup(content, features)
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        if not href:
+            continue
+
+        # Skip Brave internal links like "/ask" or navigation anchors.
+        if href.startswith("/"):
+            continue
+
+        # Only accept absolute GNW news-release URLs.
+        if href.startswith("http") and _is_gnw_release(href):
+            return href
+    return None
+
+
+def find_ddg_result(content: bytes, features: str = "lxml") -> Optional[str]:
+    """First GNW news-release link on a DuckDuckGo HTML results page."""
+    soup = _soup(content, features)
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        # DuckDuckGo redirect like /l/?kh=-1&uddg=<encoded>. Checked first: the
+        # encoded target still contains the GNW host, so the direct-link test
+        # below would return the redirect itself.
+        if href.startswith(("/l/", "/r/", "//duckduckgo.com/l/")):
+            try:
+                parsed = urlparse(href)
+                params = parse_qs(parsed.query)
+                target_list = params.get("uddg") or params.get("u") or []
+                if target_list:
+                    real = unquote(unquote(target_list[0]))
+                    if _is_gnw_release(real):
+                        return real
+            except Exception:
+                pass
+            continue
+        # Direct GNW link
+        if _is_gnw_release(href):
+            return href
+    return None
+
+
+def find_gnw_search_result(content: bytes, features: str = "lxml") -> Optional[str]:
+    """First news-release link on a GlobeNewswire site-search page."""
+    soup = _soup(content, features)
+    for a in soup.find_all("a", href=True):
+        href = a["href"]
+        if _is_gnw_release(href):
+            return href
+        # Some links may be relative
+        if href.startswith("/en/news-release"):
+            return "https://www.globenewswire.com" + href
+    return None
+
+
+def find_release_timestamp(content: bytes, features: str = "lxml") -> Optional[str]:
+    """Raw dateline timestamp (e.g. 'November 14, 2025 09:15 ET') of a GNW release page."""
+    soup = _soup(content, features)
+    m = TS_REGEX.search(soup.get_text(separator="\n"))
+    return m.group(1).strip() if m else None
+
+
+def timestamp_to_iso(ts_raw: str) -> str:
+    """'November 14, 2025 9:15 AM ET' -> '2025-11-14 09:15:00 ET' ("" if no format fits)."""
+    # Strip 'ET' to parse
+    cleaned = ts_raw.replace("ET", "").strip()
+    for fmt in TS_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt).strftime("%Y-%m-%d %H:%M:%S") + " ET"
+        except ValueError:
+            continue
+    return ""
+
+
+class ParseStage:
+    """
+    CPU-bound parsing decoupled from network I/O.
+
+    Network code only fetches bytes and hands them to a ProcessPoolExecutor,
+    getting back a small extracted value, so parsing scales across cores and
+    never holds the GIL in the fetching threads. At most `max_pending` jobs
+    are queued; further callers block, which pushes back on the fetchers.
+
+    With workers == 0 the parse runs inline in the calling thread.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._executor: Optional["ProcessPoolExecutor"] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> "ProcessPoolExecutor":
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                atexit.register(self.shutdown)
+            return self._executor
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        if self.workers <= 0:
+            return fn(*args)
+        with self._slots:
+            return self._get_executor().submit(fn, *args).result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_parse_stage = None
+
+
+def get_parse_stage() -> ParseStage:
+    """Creates or returns the process-wide parse stage."""
+    global _parse_stage
+    if _parse_stage is None:
+        _parse_stage = ParseStage(config.PARSE_WORKERS, config.PARSE_QUEUE_SIZE)
+        if config.PARSE_WORKERS > 0:
+            logger.info("Parsing pages in %d worker processes", config.PARSE_WORKERS)
+    return _parse_stage
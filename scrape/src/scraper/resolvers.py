@@ -0,0 +1,250 @@
+"""
+Resolver cascade: finds the GNW release URL for a headline by trying the
+registered search resolvers cheapest first.
+
+Each resolver declares an expected latency and hit rate; the engine orders
+them by expected seconds per hit and refines both numbers from what it
+observes. A resolver that runs past its p90 latency is hedged: the next one
+starts alongside it instead of waiting for it to fail. The first result that
+passes is_release_url() wins and the others are cancelled. Queued ones never
+start, running ones stop at their next cancel.is_set() check.
+
+The engine is created on first use by get_engine(), which registers the
+built-in resolvers from gnw_scraper.register_resolvers().
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Observations before measured latency replaces the declared one
+MIN_SAMPLES = 5
+# Weight of each new outcome in the hit-rate moving average
+HIT_RATE_ALPHA = 0.1
+
+
+@dataclass(frozen=True)
+class Query:
+    headline: str
+    ticker: str = ""
+    date_str: str = ""
+
+
+ResolverFn = Callable[[Query, threading.Event], Optional[str]]
+
+
+@dataclass
+class Resolver:
+    name: str
+    fn: ResolverFn
+    # Declared priors, refined as the run goes
+    expected_seconds: float
+    hit_rate: float
+    available: Callable[[], bool] = lambda: True
+    _latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=100), repr=False)
+    runs: int = 0
+    hits: int = 0
+    wins: int = 0
+    hedged: int = 0
+    cancelled: int = 0
+
+    def p90(self) -> float:
+        """p90 latency in seconds; the declared estimate until enough runs are seen."""
+        if len(self._latencies) < MIN_SAMPLES:
+            return self.expected_seconds
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+
+    def cost_per_hit(self) -> float:
+        if len(self._latencies) >= MIN_SAMPLES:
+            latency = sum(self._latencies) / len(self._latencies)
+        else:
+            latency = self.expected_seconds
+        return latency / max(self.hit_rate, 0.01)
+
+    def observe(self, seconds: float, hit: bool) -> None:
+        self._latencies.append(seconds)
+        self.runs += 1
+        self.hits += int(hit)
+        self.hit_rate += HIT_RATE_ALPHA * (float(hit) - self.hit_rate)
+
+    def observe_cancelled(self, seconds: float) -> None:
+        """
+        Record a run cancelled after seconds. Its latency is censored: the run
+        would have taken at least that long. Past p90 that lower bound is still
+        a tail sample, and recording it is what lets a resolver that is always
+        hedged and cancelled move down the order; a shorter cancelled run says
+        nothing about the tail and is dropped. The hit rate is left alone.
+        """
+        self.cancelled += 1
+        if seconds >= self.p90():
+            self._latencies.append(seconds)
+
+
+def is_release_url(url: Optional[str]) -> bool:
+    """A GlobeNewswire news-release page, the only kind extract_timestamp_from_gnw reads."""
+    if not url:
+        return False
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    return (host == "globenewswire.com" or host.endswith(".globenewswire.com")) and (
+        "/news-release/" in parsed.path
+    )
+
+
+class ResolverEngine:
+    def __init__(self, max_parallel: int):
+        self.max_parallel = max(1, max_parallel)
+        self._resolvers: List[Resolver] = []
+        self._lock = threading.Lock()
+        # Cancelled resolvers may still be finishing a request, so keep spare threads
+        self._executor = ThreadPoolExecutor(max_workers=4 * self.max_parallel, thread_name_prefix="resolver")
+
+    def register(
+        self,
+        name: str,
+        fn: ResolverFn,
+        expected_seconds: float,
+        hit_rate: float,
+        available: Callable[[], bool] = lambda: True,
+    ) -> None:
+        with self._lock:
+            self._resolvers = [r for r in self._resolvers if r.name != name]
+            self._resolvers.append(Resolver(name, fn, expected_seconds, hit_rate, available))
+
+    def ordered(self) -> List[Resolver]:
+        """Available resolvers, cheapest expected cost per hit first."""
+        with self._lock:
+            resolvers = list(self._resolvers)
+        usable = []
+        for r in resolvers:
+            try:
+                if r.available():
+                    usable.append(r)
+            except Exception as e:
+                logger.warning("Resolver %s unavailable: %s", r.name, e)
+        return sorted(usable, key=Resolver.cost_per_hit)
+
+    def _run(self, resolver: Resolver, query: Query, cancel: threading.Event) -> Optional[str]:
+        if cancel.is_set():
+            return None
+        start = time.monotonic()
+        try:
+            url = resolver.fn(query, cancel)
+        except Exception as e:
+            logger.warning("Resolver %s failed: %s", resolver.name, e)
+            url = None
+        elapsed = time.monotonic() - start
+        with self._lock:
+            if cancel.is_set():
+                # A cancelled run may have stopped early, so its time is only a lower bound
+                resolver.observe_cancelled(elapsed)
+            else:
+                resolver.observe(elapsed, is_release_url(url))
+        return url
+
+    def resolve(self, query: Query) -> Optional[Tuple[str, str]]:
+        """Return (url, resolver name) of the first validated result, or None."""
+        pending = self.ordered()
+        cancel = threading.Event()
+        running: Dict[Future, Resolver] = {}
+        started: Dict[Future, float] = {}
+        hedged: set = set()
+
+        def launch() -> None:
+            resolver = pending.pop(0)
+            # Each resolver thread sees the caller's context (the row's stats)
+            ctx = contextvars.copy_context()
+            future = self._executor.submit(ctx.run, self._run, resolver, query, cancel)
+            running[future] = resolver
+            started[future] = time.monotonic()
+            logger.debug("Resolver %s started", resolver.name, extra={"stage": "search"})
+
+        try:
+            while running or pending:
+                # Start the next resolver when nothing is running, or when a hedge
+                # missed and only already-hedged resolvers are left
+                if not running or (
+                    pending and len(running) < self.max_parallel and all(f in hedged for f in running)
+                ):
+                    launch()
+
+                timeout = None
+                if pending and len(running) < self.max_parallel:
+                    deadlines = [started[f] + running[f].p90() for f in running if f not in hedged]
+                    if deadlines:
+                        timeout = max(0.0, min(deadlines) - time.monotonic())
+
+                done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # A resolver ran past its p90 without answering: hedge it
+                    late = min((f for f in running if f not in hedged), key=lambda f: started[f] + running[f].p90())
+                    hedged.add(late)
+                    with self._lock:
+                        running[late].hedged += 1
+                    logger.info(
+                        "Resolver %s is past its p90 (%.1fs); hedging with %s",
+                        running[late].name,
+                        running[late].p90(),
+                        pending[0].name,
+                    )
+                    launch()
+                    continue
+
+                for future in done:
+                    resolver = running.pop(future)
+                    url = future.result()
+                    if is_release_url(url):
+                        with self._lock:
+                            resolver.wins += 1
+                        return url, resolver.name
+                    if url:
+                        logger.info("Resolver %s returned a non-release URL: %s", resolver.name, url)
+            return None
+        finally:
+            cancel.set()
+            for future in running:
+                future.cancel()
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Runs, hits, wins, hedges, cancellations, hit rate and p90 seconds per resolver."""
+        with self._lock:
+            return {
+                r.name: {
+                    "runs": r.runs,
+                    "hits": r.hits,
+                    "wins": r.wins,
+                    "hedged": r.hedged,
+                    "cancelled": r.cancelled,
+                    "hit_rate": round(r.hit_rate, 3),
+                    "p90": round(r.p90(), 3),
+                }
+                for r in self._resolvers
+            }
+
+
+_engine: Optional[ResolverEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> ResolverEngine:
+    """Creates or returns the process-wide resolver engine, with the built-in resolvers registered."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            # Imported here: gnw_scraper imports this module
+            from .gnw_scraper import register_resolvers
+
+            engine = ResolverEngine(config.RESOLVER_MAX_PARALLEL)
+            register_resolvers(engine)
+            _engine = engine
+    return _engine
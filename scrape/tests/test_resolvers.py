@@ -0,0 +1,71 @@
+import threading
+import time
+
+from src.scraper.resolvers import Query, ResolverEngine
+
+RELEASE = "https://www.globenewswire.com/news-release/2025/01/02/1/0/en/Example.html"
+
+
+def _slow(cancelled):
+    def resolve(query, cancel):
+        for _ in range(100):
+            if cancel.is_set():
+                cancelled.set()
+                return None
+            time.sleep(0.01)
+        return RELEASE
+
+    return resolve
+
+
+def test_resolver_past_its_p90_is_hedged_and_cancelled():
+    cancelled = threading.Event()
+    engine = ResolverEngine(max_parallel=2)
+    # Declared cheapest, so it runs first; it overruns its 0.05s estimate
+    engine.register("slow", _slow(cancelled), expected_seconds=0.05, hit_rate=0.9)
+    engine.register("fast", lambda query, cancel: RELEASE, expected_seconds=1.0, hit_rate=0.5)
+
+    assert engine.resolve(Query("Example Corp Announces Offering")) == (RELEASE, "fast")
+    assert cancelled.wait(1.0)
+    time.sleep(0.05)
+    metrics = engine.metrics()
+    assert metrics["slow"]["hedged"] == 1
+    assert metrics["slow"]["cancelled"] == 1
+    assert metrics["fast"]["wins"] == 1
+
+
+def test_non_release_result_falls_through_to_the_next_resolver():
+    engine = ResolverEngine(max_parallel=1)
+    engine.register("first", lambda query, cancel: "https://example.com/news", expected_seconds=0.1, hit_rate=0.9)
+    engine.register("second", lambda query, cancel: RELEASE, expected_seconds=0.2, hit_rate=0.9)
+
+    assert engine.resolve(Query("Example")) == (RELEASE, "second")
+    assert engine.metrics()["first"]["hits"] == 0
+
+
+def test_cancelled_runs_past_p90_push_a_resolver_down_the_order():
+    engine = ResolverEngine(max_parallel=2)
+    engine.register("optimistic", lambda query, cancel: None, expected_seconds=0.05, hit_rate=0.9)
+    engine.register("steady", lambda query, cancel: None, expected_seconds=0.5, hit_rate=0.9)
+    optimistic = engine.ordered()[0]
+    assert optimistic.name == "optimistic"
+
+    for _ in range(5):
+        optimistic.observe_cancelled(2.0)
+    # A cancelled run shorter than p90 says nothing about the tail
+    optimistic.observe_cancelled(0.01)
+
+    assert [r.name for r in engine.ordered()] == ["steady", "optimistic"]
+    assert optimistic.cancelled == 6
+
+
+def test_google_resolver_is_available_only_with_credentials(monkeypatch):
+    from src.scraper import config, gnw_scraper
+
+    monkeypatch.setattr(gnw_scraper.importlib.util, "find_spec", lambda name: object())
+    monkeypatch.setattr(config, "GOOGLE_API_KEY", "key")
+    monkeypatch.setattr(config, "GOOGLE_SEARCH_CX", "")
+    assert not gnw_scraper._google_available()
+
+    monkeypatch.setattr(config, "GOOGLE_SEARCH_CX", "cx")
+    assert gnw_scraper._google_available()
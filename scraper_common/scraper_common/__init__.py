@@ -0,0 +1,13 @@
+"""
+Modules shared by the scraper projects (scrape/ and scraping/gnw_scraper_project/):
+per-row stats, the per-host concurrency limiter, background logging, the
+sampling profiler and the startup check.
+"""
+__all__ = [
+    "logs",
+    "profiler",
+    "startup",
+    "stats",
+    "throttle",
+]
+__version__ = "0.1.0"
@@ -0,0 +1,175 @@
+"""
+Structured, non-blocking logging for the scraper.
+
+setup_logging() puts a QueueHandler on the root logger, so a log call in a
+resolver thread only enqueues the record; a QueueListener thread formats it
+(as one JSON object per line by default) and writes it to stderr.
+
+Formatting is lazy: the message and its %-args are rendered by the listener,
+and only for records that pass the level check and the sampler. Pass values
+that won't change after the call, and wrap expensive ones in lazy().
+
+Records below WARNING can be sampled per stage (sample_rates, e.g.
+"search=0.1,fetch=0.25"; "*" matches any stage): the stage is the record's `stage` extra or the
+stats.stage() the logging thread is in. Warnings and errors are always kept.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from . import stats
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_sampler: Optional["StageSampler"] = None
+_setup_lock = threading.Lock()
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class lazy:
+    """Defers an expensive log argument until the record is actually formatted."""
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+    def __str__(self) -> str:
+        return str(self.fn())
+
+    __repr__ = __str__
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "stage=rate,..." into a dict, ignoring malformed entries."""
+    rates: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        name, _, value = part.partition("=")
+        try:
+            rates[name.strip()] = min(1.0, max(0.0, float(value)))
+        except ValueError:
+            continue
+    return rates
+
+
+class StageSampler(logging.Filter):
+    """
+    Keeps every Nth sub-WARNING record per stage, N = 1 / rate.
+    Runs in the logging thread, before the record is queued.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._lock = threading.Lock()
+        self._seen: Dict[str, int] = {}
+        self._dropped: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        stage = getattr(record, "stage", None)
+        if stage is None:
+            stage = stats.thread_stages().get(threading.get_ident(), "")
+            record.stage = stage
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self.rates.get(stage, self.rates.get("*", 1.0))
+        if rate >= 1.0:
+            return True
+        with self._lock:
+            seen = self._seen.get(stage, 0)
+            self._seen[stage] = seen + 1
+            keep = rate > 0 and seen % max(1, round(1 / rate)) == 0
+            if not keep:
+                self._dropped[stage] = self._dropped.get(stage, 0) + 1
+        return keep
+
+    def dropped(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._dropped)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, stage, thread, message and extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+            + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "stage", ""):
+            entry["stage"] = record.stage
+        entry["thread"] = record.threadName
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS and key not in entry and key != "stage":
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks reference live frames; render them while they are still accurate
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: str = "INFO", fmt: str = "json", sample_rates: str = "") -> None:
+    """
+    Route all logging through a background writer. fmt is "json" or "text".
+    Safe to call more than once; only the first call takes effect. The
+    listener is flushed at exit.
+    """
+    global _listener, _sampler
+    with _setup_lock:
+        if _listener is not None:
+            return
+
+        output = logging.StreamHandler(sys.stderr)
+        if fmt.lower() == "json":
+            output.setFormatter(JsonFormatter())
+        else:
+            output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+        _sampler = StageSampler(parse_sample_rates(sample_rates))
+        handler = _LazyQueueHandler(queue.SimpleQueue())
+        handler.addFilter(_sampler)
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(level.upper())
+
+        _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the background writer."""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        dropped = _sampler.dropped() if _sampler is not None else {}
+        if dropped:
+            logging.getLogger(__name__).warning("Log records dropped by sampling: %s", dropped)
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,134 @@
+"""
+Low-overhead sampling profiler for scraper runs (the --profile option).
+
+A background thread snapshots every thread's Python stack with
+sys._current_frames() at a fixed interval and tags each sample with the
+stage the thread is in (stats.stage: search, fetch, parse, write, sleep,
+throttle). Nothing is instrumented per call, so the cost is one stack walk
+per thread per interval.
+
+Writes two files:
+    <prefix>.folded   flamegraph.pl / speedscope input, one "stage;f1;f2 count" per line
+    <prefix>.txt      per-stage and per-function summary (self and total samples)
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from . import stats
+
+# Stage label for threads parked in an executor or lock with no stage set
+IDLE = "idle"
+OTHER = "other"
+
+_IDLE_LEAVES = {("threading.py", "wait"), ("queue.py", "get"), ("thread.py", "_worker")}
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.sampling_seconds = 0.0
+        self.started = 0.0
+        self.wall_seconds = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.wall_seconds = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            start = time.perf_counter()
+            stages = stats.thread_stages()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stage = stages.get(thread_id)
+                if stage is None:
+                    leaf = stack[0]
+                    idle = (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES
+                    stage = IDLE if idle else OTHER
+                self.samples[(stage, tuple(_label(code) for code in reversed(stack)))] += 1
+            self.sample_count += 1
+            self.sampling_seconds += time.perf_counter() - start
+
+    def folded(self) -> str:
+        return "".join(
+            f"{';'.join((stage,) + stack)} {n}\n" for (stage, stack), n in sorted(self.samples.items())
+        )
+
+    def summary(self, top: int = 30) -> str:
+        by_stage: Counter = Counter()
+        self_samples: Counter = Counter()
+        total_samples: Counter = Counter()
+        for (stage, stack), n in self.samples.items():
+            by_stage[stage] += n
+            if stage == IDLE:
+                continue
+            self_samples[stack[-1]] += n
+            for label in set(stack):
+                total_samples[label] += n
+
+        busy = sum(n for stage, n in by_stage.items() if stage != IDLE) or 1
+        overhead = 100.0 * self.sampling_seconds / self.wall_seconds if self.wall_seconds else 0.0
+        lines = [
+            f"{self.sample_count} sampling passes every {self.interval * 1000:.0f} ms over "
+            f"{self.wall_seconds:.1f}s wall; sampler overhead {overhead:.2f}% of one core",
+            "",
+            "Samples by stage (thread-samples, idle excluded from %):",
+        ]
+        for stage, n in by_stage.most_common():
+            share = "" if stage == IDLE else f"  {100.0 * n / busy:5.1f}%"
+            lines.append(f"  {stage:<10} {n:>8}{share}")
+
+        lines += ["", f"Top {top} functions by self samples:", f"  {'self%':>6} {'total%':>7}  function"]
+        for label, n in self_samples.most_common(top):
+            lines.append(
+                f"  {100.0 * n / busy:6.1f} {100.0 * total_samples[label] / busy:7.1f}  {label}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def write(self, prefix: str) -> Tuple[str, str]:
+        folded_path, summary_path = prefix + ".folded", prefix + ".txt"
+        with open(folded_path, "w", encoding="utf-8") as f:
+            f.write(self.folded())
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(self.summary())
+        return folded_path, summary_path
+
+
+@contextmanager
+def profiling(prefix: str, interval_ms: float = 10.0) -> Iterator[SamplingProfiler]:
+    """Sample every thread while the block runs, then write <prefix>.folded and <prefix>.txt."""
+    profiler = SamplingProfiler(interval_ms / 1000.0)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        folded_path, summary_path = profiler.write(prefix)
+        print(profiler.summary(), file=sys.stderr)
+        print(f"Profile written to {folded_path} and {summary_path}", file=sys.stderr)
@@ -0,0 +1,97 @@
+"""
+Startup cost check for a scraper CLI.
+
+Usage, from the project directory:
+    python -m scraper_common.startup src.scraper.main              # check against the budget
+    python -m scraper_common.startup src.scraper.main --runs 9 --budget-ms 80
+    python -m scraper_common.startup src.scraper.main --no-budget  # deferred imports only
+
+Imports the target module in fresh interpreters with `-X importtime` and
+reports the median import time and the slowest modules of its package.
+Exits 1 when the median is over --budget-ms, or when a module that should
+load only on first use (HTML parsing, HTTP, browser, dataframe libraries) is
+imported at startup. CI (`make check` in each project) passes a budget of
+about three times the median measured on a development machine: loose enough
+for a slower runner, tight enough to catch an eager import of a heavy package
+that isn't on the DEFERRED list. `make startup` checks the default budget.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+# Top-level packages that must not be imported by `import <target>`
+DEFERRED = ("bs4", "lxml", "requests", "urllib3", "playwright", "pandas", "numpy", "pyarrow", "uvicorn")
+
+DEFAULT_BUDGET_MS = 150.0
+
+
+def measure_once(target: str) -> Tuple[float, Dict[str, int]]:
+    """Import target in a new interpreter; return (total ms, module -> cumulative us)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=os.getcwd(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            modules[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # header line
+    return modules.get(target, 0) / 1000.0, modules
+
+
+def _deferred_imports(modules: Dict[str, int]) -> Set[str]:
+    return {name.split(".")[0] for name in modules if name.split(".")[0] in DEFERRED}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m scraper_common.startup")
+    parser.add_argument("target", help="module the CLI starts from, e.g. src.scraper.main")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    parser.add_argument(
+        "--no-budget", action="store_true", help="check deferred imports only, not the time budget"
+    )
+    args = parser.parse_args(argv)
+
+    totals: List[float] = []
+    modules: Dict[str, int] = {}
+    for _ in range(max(1, args.runs)):
+        total, modules = measure_once(args.target)
+        totals.append(total)
+    median = statistics.median(totals)
+
+    prefixes = (args.target.rpartition(".")[0] + ".", __package__ + ".")
+    own = sorted(
+        ((us, name) for name, us in modules.items() if name.startswith(prefixes)),
+        reverse=True,
+    )
+    print(f"import {args.target}: median {median:.1f} ms over {len(totals)} runs (budget {args.budget_ms:.0f} ms)")
+    for us, name in own[: args.top]:
+        print(f"  {us / 1000.0:8.1f} ms  {name}")
+
+    failures = []
+    if median > args.budget_ms and not args.no_budget:
+        failures.append(f"median {median:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+    deferred = _deferred_imports(modules)
+    if deferred:
+        failures.append(f"imported at startup: {', '.join(sorted(deferred))}")
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
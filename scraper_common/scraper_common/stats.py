@@ -0,0 +1,166 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+# Final row statuses, in the order they are reported
+RESOLVED = "resolved"
+NO_CANDIDATES = "no-candidates"
+HEADLINE_MISMATCH = "headline-mismatch"
+DATE_MISMATCH = "date-mismatch"
+BUDGET_EXCEEDED = "budget-exceeded"
+ERROR = "error"
+# Reject reason for a candidate whose page could not be loaded
+FETCH_ERROR = "fetch-error"
+
+STAGES = ("search", "fetch", "parse")
+
+# Extra columns written by process_file(..., extended=True)
+EXTENDED_FIELDS: List[str] = [
+    "resolver",
+    "queries",
+    "pages_fetched",
+    "cache_hits",
+    "search_seconds",
+    "fetch_seconds",
+    "parse_seconds",
+    "total_seconds",
+    "status",
+]
+
+
+@dataclass
+class RowStats:
+    """How a single row resolved and what it cost."""
+
+    resolver: str = ""
+    queries: int = 0
+    pages_fetched: int = 0
+    cache_hits: int = 0
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    total_seconds: float = 0.0
+    status: str = ""
+    # Why candidates were rejected, e.g. {"headline-mismatch": 2}
+    rejects: Dict[str, int] = field(default_factory=dict)
+    # Hedged resolvers update the same row from several threads
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def add_seconds(self, stage_name: str, seconds: float) -> None:
+        with self._lock:
+            self.stage_seconds[stage_name] = self.stage_seconds.get(stage_name, 0.0) + seconds
+
+    def reject(self, reason: str) -> None:
+        with self._lock:
+            self.rejects[reason] = self.rejects.get(reason, 0) + 1
+
+    def finish(self, resolved: bool) -> None:
+        """Derive the final status unless one was already set."""
+        if self.status:
+            return
+        if resolved:
+            self.status = RESOLVED
+        elif self.rejects.get(DATE_MISMATCH):
+            self.status = DATE_MISMATCH
+        elif self.rejects.get(HEADLINE_MISMATCH):
+            self.status = HEADLINE_MISMATCH
+        elif self.rejects.get(FETCH_ERROR):
+            # A candidate went unchecked, so "nothing found" would be wrong
+            self.status = ERROR
+        elif self.pages_fetched == 0:
+            self.status = NO_CANDIDATES
+        else:
+            self.status = ERROR
+
+    def as_columns(self) -> List[str]:
+        return [
+            self.resolver,
+            str(self.queries),
+            str(self.pages_fetched),
+            str(self.cache_hits),
+            *(f"{self.stage_seconds.get(name, 0.0):.3f}" for name in STAGES),
+            f"{self.total_seconds:.3f}",
+            self.status,
+        ]
+
+
+_current: ContextVar[Optional[RowStats]] = ContextVar("row_stats", default=None)
+
+
+def current() -> Optional[RowStats]:
+    """Stats of the row being resolved in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def track_row() -> Iterator[RowStats]:
+    """Collect stats for everything resolved inside the block."""
+    row_stats = RowStats()
+    token = _current.set(row_stats)
+    start = time.perf_counter()
+    try:
+        yield row_stats
+    finally:
+        row_stats.total_seconds = time.perf_counter() - start
+        _current.reset(token)
+
+
+# Stage each thread is in right now, read by the sampling profiler
+_thread_stages: Dict[int, str] = {}
+# Per thread, the time spent in stages nested inside each open stage
+_nesting = threading.local()
+
+
+def thread_stages() -> Dict[int, str]:
+    """Snapshot of thread id -> current stage name."""
+    return dict(_thread_stages)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Add the wall time of the block to the current row's stage total and tag
+    the thread. Time spent in stages nested inside the block (e.g. "throttle"
+    inside "fetch") counts towards the inner stage only, so stage totals
+    never add up to more than the row's wall time.
+    """
+    thread_id = threading.get_ident()
+    previous = _thread_stages.get(thread_id)
+    _thread_stages[thread_id] = name
+    nested = getattr(_nesting, "stack", None)
+    if nested is None:
+        nested = _nesting.stack = []
+    nested.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        inner = nested.pop()
+        if nested:
+            nested[-1] += elapsed
+        if previous is None:
+            _thread_stages.pop(thread_id, None)
+        else:
+            _thread_stages[thread_id] = previous
+        row_stats = _current.get()
+        if row_stats is not None:
+            row_stats.add_seconds(name, elapsed - inner)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment a counter (queries, pages_fetched, cache_hits) on the current row."""
+    row_stats = _current.get()
+    if row_stats is not None:
+        row_stats.add(name, n)
+
+
+def reject(reason: str) -> None:
+    row_stats = _current.get()
+    if row_stats is not None:
+        row_stats.reject(reason)
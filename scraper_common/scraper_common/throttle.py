@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Dict, Optional
+
+# Statuses that mean "slow down" rather than "this URL is bad"
+THROTTLE_STATUSES = (429, 503)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD in-flight limit for a single host.
+
+    Every healthy response grows the limit by 1/limit, i.e. by one slot per
+    window of `limit` responses. A 429/503, a failed request or a latency spike
+    (latency above spike_factor x the moving average) cuts the limit by
+    DECREASE_FACTOR, at most once per average latency so a burst of throttled
+    responses from the same window only counts once.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        initial: float,
+        minimum: float,
+        maximum: float,
+        decrease_factor: float = 0.5,
+        spike_factor: float = 3.0,
+    ):
+        self.host = host
+        self.limit = float(initial)
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.decrease_factor = decrease_factor
+        self.spike_factor = spike_factor
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency: float, status: Optional[int]) -> None:
+        """Record the outcome of one request (status None means it failed outright)."""
+        with self._cond:
+            self.in_flight -= 1
+
+            spike = (
+                self.latency_ewma is not None
+                and latency > self.latency_ewma * self.spike_factor
+            )
+            if status is None or status in THROTTLE_STATUSES or spike:
+                now = time.monotonic()
+                if now - self._last_decrease >= (self.latency_ewma or latency):
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    self.decreases += 1
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+            else:
+                self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency
+
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._cond:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "latency_ewma": round(self.latency_ewma or 0.0, 3),
+                "decreases": self.decreases,
+            }
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(
+    host: str,
+    initial: float = 2,
+    minimum: float = 1,
+    maximum: float = 16,
+    spike_factor: float = 3.0,
+) -> AdaptiveLimiter:
+    """
+    Creates or returns the limiter for a host. The limits only apply when the
+    host's limiter is created, so every caller should pass the same ones.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = AdaptiveLimiter(
+                host, initial=initial, minimum=minimum, maximum=maximum, spike_factor=spike_factor
+            )
+            _limiters[host] = limiter
+        return limiter
+
+
+def metrics() -> Dict[str, Dict[str, float]]:
+    """Current limit, in-flight count and latency average for every host seen so far."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.host: limiter.snapshot() for limiter in limiters}
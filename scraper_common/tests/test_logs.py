@@ -0,0 +1,32 @@
+import logging
+
+from scraper_common.logs import StageSampler, parse_sample_rates
+
+
+def _record(level=logging.DEBUG, stage="search"):
+    record = logging.LogRecord("src.scraper", level, __file__, 1, "msg", None, None)
+    record.stage = stage
+    return record
+
+
+def test_parse_sample_rates_clamps_and_skips_bad_entries():
+    assert parse_sample_rates("search=0.1, fetch=x,*=2,") == {"search": 0.1, "*": 1.0}
+
+
+def test_sampler_keeps_every_nth_record_per_stage():
+    sampler = StageSampler({"search": 0.25})
+    kept = [sampler.filter(_record()) for _ in range(8)]
+    assert kept == [True, False, False, False, True, False, False, False]
+    assert sampler.dropped() == {"search": 6}
+
+
+def test_sampler_passes_warnings_and_unlisted_stages():
+    sampler = StageSampler({"search": 0.0})
+    assert sampler.filter(_record(level=logging.WARNING))
+    assert sampler.filter(_record(stage="fetch"))
+    assert not sampler.filter(_record())
+
+
+def test_sampler_wildcard_applies_to_unlisted_stages():
+    sampler = StageSampler({"*": 0.5})
+    assert [sampler.filter(_record(stage="fetch")) for _ in range(4)] == [True, False, True, False]
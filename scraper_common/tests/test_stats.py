@@ -0,0 +1,17 @@
+import time
+
+from scraper_common import stats
+
+
+def test_nested_stage_time_is_not_counted_twice():
+    with stats.track_row() as row_stats:
+        with stats.stage("fetch"):
+            time.sleep(0.01)
+            with stats.stage("throttle"):
+                time.sleep(0.05)
+
+    fetch = row_stats.stage_seconds["fetch"]
+    throttle = row_stats.stage_seconds["throttle"]
+    assert throttle >= 0.05
+    assert 0.01 <= fetch < 0.05
+    assert fetch + throttle <= row_stats.total_seconds
@@ -0,0 +1,65 @@
+import threading
+import time
+
+from scraper_common.throttle import AdaptiveLimiter
+
+
+def _limiter(initial=4.0, minimum=1.0, maximum=8.0):
+    return AdaptiveLimiter("example.com", initial=initial, minimum=minimum, maximum=maximum)
+
+
+def _request(limiter, latency, status):
+    limiter.acquire()
+    limiter.release(latency, status)
+
+
+def test_healthy_responses_grow_the_limit_additively():
+    limiter = _limiter(initial=2.0, maximum=3.0)
+    _request(limiter, 0.1, 200)
+    assert limiter.limit == 2.5
+    for _ in range(10):
+        _request(limiter, 0.1, 200)
+    assert limiter.limit == 3.0
+
+
+def test_throttled_response_halves_the_limit_once_per_latency_window():
+    limiter = _limiter(initial=8.0)
+    _request(limiter, 0.05, 429)
+    assert limiter.limit == 4.0
+    # Same window: a burst of 503s from requests already in flight counts once
+    _request(limiter, 0.05, 503)
+    assert limiter.limit == 4.0
+    time.sleep(0.06)
+    _request(limiter, 0.05, None)
+    assert limiter.limit == 2.0
+    assert limiter.decreases == 2
+
+
+def test_latency_spike_decreases_and_limit_stays_above_minimum():
+    limiter = _limiter(initial=1.0, minimum=1.0)
+    _request(limiter, 0.01, 200)
+    assert limiter.limit == 2.0
+    time.sleep(0.02)
+    _request(limiter, 1.0, 200)
+    assert limiter.limit == 1.0
+    time.sleep(0.3)
+    _request(limiter, 0.01, 429)
+    assert limiter.limit == 1.0
+    assert limiter.decreases == 2
+
+
+def test_acquire_waits_for_a_free_slot():
+    limiter = _limiter(initial=1.0)
+    limiter.acquire()
+    acquired = threading.Event()
+
+    def second():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=second)
+    thread.start()
+    assert not acquired.wait(0.05)
+    limiter.release(0.01, 200)
+    assert acquired.wait(1.0)
+    thread.join()
@@ -0,0 +1,2 @@
+# Lets `python -m pytest` from this directory import the package as src.scraper,
+# the same way `python -m src.scraper.main` does.
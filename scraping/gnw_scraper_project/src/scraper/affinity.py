@@ -0,0 +1,126 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: merged writes, but no cross-process lock
+    fcntl = None
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+_affinity_index = None
+
+
+class AffinityIndex:
+    """
+    Learned mapping from tickers and issuer names to the newswire they publish on.
+
+    Counts come from accepted results only, so the index never learns from a
+    candidate that failed validation. It is stored as a small JSON file:
+
+        {"ticker": {"TELA": {"globenewswire.com": 3}}, "issuer": {...}}
+
+    New counts are buffered and merged into the file every `flush_every`
+    records and at exit, under a lock file, so processes sharing the path
+    add to each other's counts instead of overwriting them.
+    """
+
+    def __init__(self, path: str, flush_every: Optional[int] = None):
+        self.path = path
+        self.flush_every = max(1, flush_every or config.AFFINITY_FLUSH_EVERY)
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, Dict[str, int]]] = {"ticker": {}, "issuer": {}}
+        # Counts recorded since the last flush
+        self._pending: Dict[str, Dict[str, Dict[str, int]]] = {"ticker": {}, "issuer": {}}
+        self._pending_records = 0
+        self._merge(self._counts, self._load())
+
+    def likely_wire(self, ticker: str, issuer: Optional[str] = None) -> Optional[str]:
+        """Most frequently accepted wire for the ticker, falling back to the issuer."""
+        with self._lock:
+            for kind, key in (("ticker", (ticker or "").strip().upper()), ("issuer", issuer)):
+                counts = self._counts[kind].get(key) if key else None
+                if counts:
+                    return max(counts, key=counts.get)
+        return None
+
+    def record(self, ticker: str, issuer: Optional[str], wire: Optional[str]) -> None:
+        """Count an accepted result on `wire`; persisted every `flush_every` records."""
+        if not wire:
+            return
+        with self._lock:
+            for kind, key in (("ticker", (ticker or "").strip().upper()), ("issuer", issuer)):
+                if not key:
+                    continue
+                for counts in (self._counts, self._pending):
+                    wires = counts[kind].setdefault(key, {})
+                    wires[wire] = wires.get(wire, 0) + 1
+            self._pending_records += 1
+            if self._pending_records >= self.flush_every:
+                self._flush()
+
+    def flush(self) -> None:
+        """Merge the counts recorded since the last flush into the file."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending_records:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.path + ".lock", "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                # Re-read so counts other processes flushed since we loaded are kept
+                counts = self._load()
+                self._merge(counts, self._pending)
+                tmp_path = "%s.%d.tmp" % (self.path, os.getpid())
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(counts, f, separators=(",", ":"), sort_keys=True)
+                os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not save affinity index %s: %s", self.path, e)
+            return
+        self._counts = counts
+        self._pending = {"ticker": {}, "issuer": {}}
+        self._pending_records = 0
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        counts: Dict[str, Dict[str, Dict[str, int]]] = {"ticker": {}, "issuer": {}}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for kind in counts:
+                    counts[kind].update(data.get(kind) or {})
+            except (OSError, ValueError) as e:
+                logger.warning("Could not load affinity index %s: %s", self.path, e)
+        return counts
+
+    @staticmethod
+    def _merge(
+        into: Dict[str, Dict[str, Dict[str, int]]], counts: Dict[str, Dict[str, Dict[str, int]]]
+    ) -> None:
+        for kind, keys in counts.items():
+            for key, wires in keys.items():
+                merged = into[kind].setdefault(key, {})
+                for wire, count in wires.items():
+                    merged[wire] = merged.get(wire, 0) + count
+
+
+def get_affinity_index() -> Optional[AffinityIndex]:
+    """Creates or returns the process-wide affinity index (None if disabled)."""
+    global _affinity_index
+    if _affinity_index is None and config.AFFINITY_INDEX_PATH:
+        _affinity_index = AffinityIndex(config.AFFINITY_INDEX_PATH)
+        atexit.register(_affinity_index.flush)
+    return _affinity_index
@@ -0,0 +1,156 @@
+"""
+Feed-vs-wire latency analytics over scraper output.
+
+Usage:
+    python -m src.scraper.analytics output.csv [more.csv ...] --out-dir lag_summary
+
+Loads one or more output CSVs from either scraper, normalizes the feed Date and
+GNW_timestamp_iso to UTC and writes lag distributions (feed minus wire) per
+ticker, wire, weekday and hour as small CSV tables.
+"""
+import argparse
+import logging
+import os
+import sys
+from typing import List
+
+import numpy as np
+import pandas as pd
+from scraper_common.logs import setup_logging
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Newswire timestamps are Eastern time, whether or not they carry the "ET" suffix
+WIRE_TZ = "America/New_York"
+
+USE_COLUMNS = {"Ticker", "Date", "GNW_URL", "GNW_timestamp_iso"}
+
+QUANTILES = [0.5, 0.9, 0.99]
+
+DIMENSIONS = {
+    "ticker": "ticker",
+    "wire": "wire",
+    "weekday": "wire_weekday",
+    "hour": "wire_hour",
+}
+
+
+def load_outputs(paths: List[str]) -> pd.DataFrame:
+    """Concatenate scraper output CSVs, keeping only the columns the analysis needs."""
+    frames = [
+        pd.read_csv(
+            path,
+            dtype=str,
+            keep_default_na=False,
+            usecols=lambda c: c in USE_COLUMNS,
+        )
+        for path in paths
+    ]
+    df = pd.concat(frames, ignore_index=True)
+    if "GNW_URL" not in df:
+        df["GNW_URL"] = ""
+    return df
+
+
+def _localize_to_utc(naive: pd.Series, tz: str) -> pd.Series:
+    return naive.dt.tz_localize(tz, ambiguous="NaT", nonexistent="shift_forward").dt.tz_convert("UTC")
+
+
+def compute_lags(df: pd.DataFrame, feed_tz: str = WIRE_TZ) -> pd.DataFrame:
+    """
+    Add UTC wire/feed timestamps and lag columns to rows that have a wire timestamp.
+
+    - wire timestamps: '2025-11-13 16:21:00 ET' or bare '2025-11-13T16:21:00'
+    - feed dates: 'MM/DD/YYYY HH:MM:SS' or 'MM/DD/YYYY'; date-only rows get
+      no lag_seconds but still count towards the calendar-day lag.
+    """
+    ts = df["GNW_timestamp_iso"].str.strip()
+    df = df[(ts != "") & (ts != "ERROR")].copy()
+
+    wire_naive = pd.to_datetime(
+        df["GNW_timestamp_iso"].str.replace(r"\s*ET$", "", regex=True).str.strip(),
+        format="ISO8601",
+        errors="coerce",
+    )
+    df["wire_utc"] = _localize_to_utc(wire_naive, WIRE_TZ)
+
+    feed = df["Date"].str.strip()
+    feed_with_time = pd.to_datetime(feed, format="%m/%d/%Y %H:%M:%S", errors="coerce")
+    feed_date_only = pd.to_datetime(feed.str.split().str[0], format="%m/%d/%Y", errors="coerce")
+    df["feed_utc"] = _localize_to_utc(feed_with_time, feed_tz)
+
+    df = df[df["wire_utc"].notna() & feed_date_only.notna()]
+    feed_date_only = feed_date_only[df.index]
+
+    df["lag_seconds"] = (df["feed_utc"] - df["wire_utc"]).dt.total_seconds()
+    wire_local = df["wire_utc"].dt.tz_convert(WIRE_TZ)
+    df["lag_days"] = (feed_date_only.dt.normalize() - wire_local.dt.tz_localize(None).dt.normalize()).dt.days
+    df["wire_weekday"] = wire_local.dt.day_name()
+    df["wire_hour"] = wire_local.dt.hour
+    df["ticker"] = df["Ticker"].str.strip().str.upper()
+    df["wire"] = (
+        df["GNW_URL"].str.extract(r"^https?://(?:www\.)?([^/]+)", expand=False).fillna("unknown")
+    )
+    return df
+
+
+def summarize(df: pd.DataFrame, by: str) -> pd.DataFrame:
+    """Lag distribution per value of `by` (seconds for rows with a feed time, days for all)."""
+    grouped = df.groupby(by, sort=True)
+    lag = grouped["lag_seconds"]
+
+    out = pd.DataFrame(
+        {
+            "rows": grouped.size(),
+            "timed_rows": lag.count(),
+            "lag_mean_s": lag.mean(),
+            "lag_min_s": lag.min(),
+            "lag_max_s": lag.max(),
+        }
+    )
+    quantiles = lag.quantile(QUANTILES).unstack()
+    quantiles.columns = [f"lag_p{int(q * 100)}_s" for q in QUANTILES]
+    out = out.join(quantiles)
+    out["lag_mean_days"] = grouped["lag_days"].mean()
+    out["same_day_share"] = grouped["lag_days"].agg(lambda d: np.mean(d.to_numpy() == 0))
+    return out.round(3).reset_index()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.scraper.analytics")
+    parser.add_argument("outputs", nargs="+", help="scraper output CSV files")
+    parser.add_argument("--out-dir", default="lag_summary", help="where to write the summary tables")
+    parser.add_argument(
+        "--feed-tz", default=WIRE_TZ, help="time zone of the feed Date column (default: %(default)s)"
+    )
+    args = parser.parse_args(argv)
+
+    missing = [p for p in args.outputs if not os.path.exists(p)]
+    if missing:
+        print(f"Error: file(s) not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    df = compute_lags(load_outputs(args.outputs), feed_tz=args.feed_tz)
+    if df.empty:
+        print("No rows with a wire timestamp to analyze.")
+        return
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    df["all"] = "all"
+    tables = {"overall": summarize(df, "all")}
+    for name, column in DIMENSIONS.items():
+        tables[name] = summarize(df, column)
+
+    for name, table in tables.items():
+        path = os.path.join(args.out_dir, f"lag_by_{name}.csv")
+        table.to_csv(path, index=False)
+        logger.info("Wrote %s (%d rows)", path, len(table))
+
+    print(tables["overall"].to_string(index=False))
+
+
+if __name__ == "__main__":
+    setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_SAMPLE_RATES)
+    main()
@@ -0,0 +1,338 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+_backend = None
+_backend_ready = False
+_negative_cache = None
+_http_cache = None
+_result_cache = None
+_init_lock = threading.Lock()
+
+# Entry envelope: format version, value encoding, expires_at (unix seconds)
+ENVELOPE = struct.Struct(">BBd")
+ENVELOPE_VERSION = 1
+ENCODING_BYTES = 0  # zlib-compressed raw bytes
+ENCODING_JSON = 1  # zlib-compressed compact JSON
+
+
+def pack_entry(value: Any, expires_at: float) -> bytes:
+    """Serialize a bytes or JSON-able value with its expiry into a compact blob."""
+    if isinstance(value, (bytes, bytearray)):
+        encoding, payload = ENCODING_BYTES, bytes(value)
+    else:
+        encoding = ENCODING_JSON
+        payload = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return ENVELOPE.pack(ENVELOPE_VERSION, encoding, expires_at) + zlib.compress(payload, 6)
+
+
+def unpack_entry(blob: bytes) -> Optional[Any]:
+    """Value of a packed entry, or None if it is expired or not in a known format."""
+    if len(blob) < ENVELOPE.size:
+        return None
+    version, encoding, expires_at = ENVELOPE.unpack_from(blob)
+    if version != ENVELOPE_VERSION or expires_at < time.time():
+        return None
+    payload = zlib.decompress(blob[ENVELOPE.size :])
+    if encoding == ENCODING_BYTES:
+        return payload
+    if encoding == ENCODING_JSON:
+        return json.loads(payload)
+    return None
+
+
+class CacheBackend(ABC):
+    """
+    Byte-level key-value store with expiry, shared by all caches.
+
+    Implementations must be safe to call from several threads.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+
+class SQLiteBackend(CacheBackend):
+    """Local cache file; shared by the processes of one host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " expires_at REAL NOT NULL"
+            ")"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return row[0]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+
+class CacheServerError(Exception):
+    pass
+
+
+class RedisBackend(CacheBackend):
+    """
+    Networked backend speaking the Redis protocol (RESP), so every worker in
+    the fleet reads and writes the same entries. Works against Redis, KeyDB,
+    Valkey or the stand-in server in cache_server.py.
+
+    Each thread keeps its own connection; a broken connection is reopened once.
+    """
+
+    def __init__(self, url: str, timeout: float = 2.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.db = int((parsed.path or "/0").lstrip("/") or 0)
+        self.password = parsed.password
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = (sock, sock.makefile("rb"))
+        self._local.conn = conn
+        if self.password:
+            self._command("AUTH", self.password)
+        if self.db:
+            self._command("SELECT", str(self.db))
+        return conn
+
+    def _close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn[1].close()
+                conn[0].close()
+            except OSError:
+                pass
+
+    def _read_reply(self, rfile) -> Any:
+        line = rfile.readline()
+        if not line:
+            raise ConnectionError("cache server closed the connection")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise CacheServerError(rest.decode("utf-8", errors="replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = rfile.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(rest)
+            return None if count < 0 else [self._read_reply(rfile) for _ in range(count)]
+        raise CacheServerError(f"unexpected reply {line!r}")
+
+    def _command(self, *args) -> Any:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        request = b"".join(parts)
+
+        for attempt in (1, 2):
+            conn = getattr(self._local, "conn", None)
+            try:
+                sock, rfile = conn or self._connect()
+                sock.sendall(request)
+                return self._read_reply(rfile)
+            except (OSError, ConnectionError):
+                self._close()
+                if attempt == 2:
+                    raise
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._command("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._command("SET", key, value, "PX", max(1, int(ttl * 1000)))
+
+    def delete(self, key: str) -> None:
+        self._command("DEL", key)
+
+
+class Cache:
+    """
+    Namespaced view over the backend holding bytes or JSON values with a TTL.
+
+    Backend failures are logged and treated as misses, so an unreachable cache
+    server slows the run down instead of failing it.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str):
+        self.backend = backend
+        self.prefix = f"{config.CACHE_NAMESPACE}:{namespace}:"
+        self._warned_at = 0.0
+
+    def _key(self, key: str) -> str:
+        return self.prefix + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _warn(self, action: str, e: Exception) -> None:
+        now = time.monotonic()
+        if now - self._warned_at > 60:
+            self._warned_at = now
+            logger.warning("Cache %s failed (%s); continuing without it.", action, e)
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            blob = self.backend.get(self._key(key))
+            return unpack_entry(blob) if blob is not None else None
+        except Exception as e:
+            self._warn("read", e)
+            return None
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self.backend.set(self._key(key), pack_entry(value, time.time() + ttl), ttl)
+        except Exception as e:
+            self._warn("write", e)
+
+
+class NegativeCache:
+    """
+    Record of known misses: search queries that returned no usable URLs and
+    rows that no search mode could resolve.
+
+    Entries expire after a TTL that depends on the date they refer to. Recent
+    dates get a short TTL because the release may not be indexed yet; old dates
+    are unlikely to change, so they are remembered much longer.
+    """
+
+    def __init__(self, cache: Cache):
+        self._cache = cache
+
+    def ttl_for(self, ref_date: Optional[date]) -> float:
+        """TTL in seconds for a miss about ref_date (None counts as recent)."""
+        recent_cutoff = date.today() - timedelta(days=config.NEGATIVE_CACHE_RECENT_DAYS)
+        if ref_date is None or ref_date >= recent_cutoff:
+            return config.NEGATIVE_CACHE_TTL_RECENT_HOURS * 3600
+        return config.NEGATIVE_CACHE_TTL_OLD_DAYS * 86400
+
+    def _contains(self, key: str) -> bool:
+        return self._cache.get(key) is not None
+
+    def _add(self, key: str, ref_date: Optional[date]) -> None:
+        self._cache.set(key, b"", self.ttl_for(ref_date))
+
+    def is_query_miss(self, query: str) -> bool:
+        return self._contains("q:" + query)
+
+    def add_query_miss(self, query: str, ref_date: Optional[date]) -> None:
+        self._add("q:" + query, ref_date)
+
+    def is_row_miss(self, row_hash: str) -> bool:
+        return self._contains("r:" + row_hash)
+
+    def add_row_miss(self, row_hash: str, ref_date: Optional[date]) -> None:
+        self._add("r:" + row_hash, ref_date)
+
+
+def get_cache_backend() -> Optional[CacheBackend]:
+    """Creates or returns the process-wide cache backend (None if CACHE_BACKEND is 'none')."""
+    global _backend, _backend_ready
+    with _init_lock:
+        if not _backend_ready:
+            kind = (config.CACHE_BACKEND or "none").lower()
+            if kind == "sqlite":
+                _backend = SQLiteBackend(config.CACHE_PATH)
+                logger.info("Using SQLite cache at %s", config.CACHE_PATH)
+            elif kind == "redis":
+                _backend = RedisBackend(config.CACHE_URL)
+                logger.info("Using shared cache server at %s", config.CACHE_URL)
+            elif kind != "none":
+                logger.error("Unknown CACHE_BACKEND %r; caching disabled.", config.CACHE_BACKEND)
+            _backend_ready = True
+    return _backend
+
+
+def get_negative_cache() -> Optional[NegativeCache]:
+    """Creates or returns the process-wide negative cache (None if caching is disabled)."""
+    global _negative_cache
+    backend = get_cache_backend()
+    if _negative_cache is None and backend is not None:
+        _negative_cache = NegativeCache(Cache(backend, "negative"))
+    return _negative_cache
+
+
+def get_http_cache() -> Optional[Cache]:
+    """Cache of response bodies: search API results and release pages."""
+    global _http_cache
+    backend = get_cache_backend()
+    if _http_cache is None and backend is not None:
+        _http_cache = Cache(backend, "http")
+    return _http_cache
+
+
+def get_result_cache() -> Optional[Cache]:
+    """Cache of resolved rows keyed by content hash."""
+    global _result_cache
+    backend = get_cache_backend()
+    if _result_cache is None and backend is not None:
+        _result_cache = Cache(backend, "result")
+    return _result_cache
@@ -0,0 +1,169 @@
+"""
+Minimal in-memory stand-in for a Redis server, for trying the shared cache
+backend locally or in CI without installing Redis.
+
+Usage:
+    python -m src.scraper.cache_server --port 6380
+    CACHE_BACKEND=redis CACHE_URL=redis://127.0.0.1:6380/0 python -m src.scraper.main ...
+
+Speaks the subset of RESP the RedisBackend uses (PING, GET, SET with EX/PX,
+DEL, EXISTS, SELECT, DBSIZE, FLUSHALL). Entries live only as long as the
+process; all databases share one keyspace.
+"""
+import argparse
+import logging
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from scraper_common.logs import setup_logging
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+
+class Store:
+    """Keys with optional expiry (monotonic deadline), expired lazily on access."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, deadline = entry
+        if deadline is not None and deadline <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        with self._lock:
+            return self._live(key)
+
+    def set(self, key: bytes, value: bytes, ttl: Optional[float]) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl if ttl is not None else None)
+
+    def delete(self, keys: List[bytes]) -> int:
+        with self._lock:
+            return sum(self._data.pop(k, None) is not None for k in keys)
+
+    def exists(self, keys: List[bytes]) -> int:
+        with self._lock:
+            return sum(self._live(k) is not None for k in keys)
+
+    def size(self) -> int:
+        with self._lock:
+            return sum(self._live(k) is not None for k in list(self._data))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def _read_command(rfile) -> Optional[List[bytes]]:
+    line = rfile.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Inline command, as sent by telnet or redis-cli in some modes
+        return line.split()
+    args = []
+    for _ in range(int(line[1:-2])):
+        header = rfile.readline()
+        length = int(header[1:-2])
+        args.append(rfile.read(length + 2)[:-2])
+    return args
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _int(n: int) -> bytes:
+    return b":%d\r\n" % n
+
+
+OK = b"+OK\r\n"
+
+
+def execute(store: Store, args: List[bytes]) -> bytes:
+    """Run one command and return the encoded reply."""
+    if not args:
+        return b"-ERR empty command\r\n"
+    name = args[0].upper()
+    try:
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name == b"GET":
+            return _bulk(store.get(args[1]))
+        if name == b"SET":
+            ttl = None
+            options = [a.upper() for a in args[3:]]
+            if b"EX" in options:
+                ttl = float(args[3 + options.index(b"EX") + 1])
+            elif b"PX" in options:
+                ttl = float(args[3 + options.index(b"PX") + 1]) / 1000.0
+            store.set(args[1], args[2], ttl)
+            return OK
+        if name == b"DEL":
+            return _int(store.delete(args[1:]))
+        if name == b"EXISTS":
+            return _int(store.exists(args[1:]))
+        if name == b"DBSIZE":
+            return _int(store.size())
+        if name == b"FLUSHALL" or name == b"FLUSHDB":
+            store.clear()
+            return OK
+        if name in (b"SELECT", b"AUTH", b"CLIENT"):
+            return OK
+    except (IndexError, ValueError):
+        return b"-ERR wrong arguments for '%s'\r\n" % name.lower()
+    return b"-ERR unknown command '%s'\r\n" % name.lower()
+
+
+def make_server(host: str, port: int, store: Optional[Store] = None) -> socketserver.ThreadingTCPServer:
+    store = store or Store()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            while True:
+                try:
+                    args = _read_command(self.rfile)
+                except (OSError, ValueError):
+                    return
+                if args is None:
+                    return
+                self.wfile.write(execute(store, args))
+
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    server = socketserver.ThreadingTCPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.scraper.cache_server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args(argv)
+
+    setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_SAMPLE_RATES)
+
+    with make_server(args.host, args.port) as server:
+        logger.info("Cache server listening on %s:%d", args.host, args.port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,36 @@
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import threading
+import time
+from urllib.parse import urlparse
+
+from scraper_common import stats, throttle
+
 from . import config
 
-_session = None
+# One session per thread: sessions keep connections alive but aren't thread-safe
+_local = threading.local()
+
+# Responses retried by _send. They are retried here rather than by the HTTP
+# adapter so that every attempt takes its own limiter slot: the host's AIMD
+# controller sees each 429/503, and no slot is held through the backoff sleeps.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 5
+# Backoff before retry n (0-based) is RETRY_BACKOFF * 2**n seconds, unless the
+# response carries a Retry-After; either is capped at MAX_RETRY_SLEEP
+RETRY_BACKOFF = 3.0
+MAX_RETRY_SLEEP = 60.0
 
 
 def get_session():
-    """Creates or returns a singleton session with retry logic."""
-    global _session
-    if _session is None:
-        _session = requests.Session()
+    """Creates or returns this thread's session."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        # Imported here rather than at module level to keep CLI startup fast
+        import requests
+
+        session = requests.Session()
 
         # Headers
-        _session.headers.update(
+        session.headers.update(
             {
                 "User-Agent": config.USER_AGENT,
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -23,28 +40,95 @@ def get_session():
 
         # Proxy
         if config.PROXY:
-            _session.proxies = {"http": config.PROXY, "https": config.PROXY}
-
-        # Retry Logic
-        retries = Retry(
-            total=5,
-            backoff_factor=3,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"],
-        )
-        adapter = HTTPAdapter(max_retries=retries)
-        _session.mount("https://", adapter)
-        _session.mount("http://", adapter)
+            session.proxies = {"http": config.PROXY, "https": config.PROXY}
 
-    return _session
+        _local.session = session
 
+    return session
 
-def get(url, params=None):
-    """Wrapper for session.get with global timeout."""
-    session = get_session()
+
+def _retry_sleep(attempt, retry_after):
     try:
-        response = session.get(url, params=params, timeout=config.REQUEST_TIMEOUT)
+        return min(float(retry_after), MAX_RETRY_SLEEP)
+    except (TypeError, ValueError):
+        return min(RETRY_BACKOFF * 2 ** attempt, MAX_RETRY_SLEEP)
+
+
+def _send(url, read, **kwargs):
+    """
+    session.get through the host's adaptive concurrency limiter, returning
+    read(response). read runs while the limiter slot is held, so streamed
+    bodies count towards the request's latency. Retryable statuses and
+    connection errors are retried after the slot is released.
+    """
+    import requests
+
+    session = get_session()
+    limiter = throttle.get_limiter(
+        urlparse(url).netloc,
+        initial=config.HOST_CONCURRENCY_INITIAL,
+        minimum=config.HOST_CONCURRENCY_MIN,
+        maximum=config.HOST_CONCURRENCY_MAX,
+        spike_factor=config.LATENCY_SPIKE_FACTOR,
+    )
+    for attempt in range(MAX_RETRIES + 1):
+        last = attempt == MAX_RETRIES
+        with stats.stage("throttle"):
+            limiter.acquire()
+        start = time.monotonic()
+        status = None
+        retry_after = None
+        try:
+            response = session.get(url, timeout=config.REQUEST_TIMEOUT, **kwargs)
+            status = response.status_code
+            if last or status not in RETRY_STATUSES:
+                return read(response)
+            retry_after = response.headers.get("Retry-After")
+            response.close()
+        except (requests.ConnectionError, requests.Timeout):
+            if last:
+                raise
+        finally:
+            limiter.release(time.monotonic() - start, status)
+        time.sleep(_retry_sleep(attempt, retry_after))
+
+
+def get(url, params=None):
+    """Wrapper for session.get with global timeout, retries and per-host adaptive concurrency."""
+
+    def read(response):
         response.raise_for_status()
         return response
-    except requests.RequestException as e:
-        raise e
+
+    return _send(url, read, params=params)
+
+
+def get_prefix(url, max_bytes):
+    """
+    Fetch at most max_bytes of a page body. Asks for a byte range first; when
+    the server ignores it, stops reading the stream after max_bytes (which
+    drops the connection instead of returning it to the pool).
+
+    Returns (content, complete) where complete means the whole body was read.
+    """
+
+    def read(response):
+        status = response.status_code
+        with response:
+            response.raise_for_status()
+            chunks = []
+            size = 0
+            complete = True
+            for chunk in response.iter_content(chunk_size=16384):
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= max_bytes:
+                    complete = False
+                    break
+            if status == 206:
+                # "bytes 0-65535/183920": complete only if the range covered the body
+                total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                complete = total.isdigit() and int(total) <= size
+        return b"".join(chunks), complete
+
+    return _send(url, read, headers={"Range": f"bytes=0-{max_bytes - 1}"}, stream=True)
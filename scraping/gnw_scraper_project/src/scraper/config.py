@@ -1,7 +1,27 @@
 import os
-from dotenv import load_dotenv
+import warnings
 
-load_dotenv()
+
+def _load_dotenv() -> None:
+    """
+    Load the nearest .env above this package, as load_dotenv() would. Importing
+    python-dotenv takes ~12 ms, so it only happens when there is a file to read.
+    """
+    path = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(path, ".env")
+        if os.path.isfile(candidate):
+            from dotenv import load_dotenv
+
+            load_dotenv(candidate)
+            return
+        parent = os.path.dirname(path)
+        if parent == path:
+            return
+        path = parent
+
+
+_load_dotenv()
 
 USER_AGENT = os.getenv("USER_AGENT", "Mozilla/5.0 (compatible; EquityBot/1.0)")
 PROXY = os.getenv("PROXY")  # None if not set
@@ -10,3 +30,96 @@ REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "15"))
 # Google Config
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_SEARCH_CX = os.getenv("GOOGLE_SEARCH_CX")
+
+# Cache backend shared by the negative, HTTP and result caches (see cache.py):
+# "sqlite" keeps a local file at CACHE_PATH, "redis" uses the Redis-protocol server
+# at CACHE_URL so every worker in a fleet reuses each other's work, "none" disables caching.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite")
+CACHE_PATH = os.getenv("CACHE_PATH", ".cache/cache.sqlite3")
+
+# NEGATIVE_CACHE_PATH, the setting before CACHE_PATH replaced it, is still read
+# when CACHE_PATH isn't set; empty disabled the cache then and still does
+_NEGATIVE_CACHE_PATH = os.getenv("NEGATIVE_CACHE_PATH")
+if _NEGATIVE_CACHE_PATH is not None and "CACHE_PATH" not in os.environ:
+    warnings.warn(
+        "NEGATIVE_CACHE_PATH is deprecated; set CACHE_PATH instead (or CACHE_BACKEND=none to disable caching)",
+        FutureWarning,
+        stacklevel=2,
+    )
+    if _NEGATIVE_CACHE_PATH:
+        CACHE_PATH = _NEGATIVE_CACHE_PATH
+    elif "CACHE_BACKEND" not in os.environ:
+        CACHE_BACKEND = "none"
+CACHE_URL = os.getenv("CACHE_URL", "redis://127.0.0.1:6379/0")
+# Prefix of every key, so several deployments can share one server
+CACHE_NAMESPACE = os.getenv("CACHE_NAMESPACE", "gnw")
+# Lifetime of cached search API responses and release pages
+HTTP_CACHE_TTL_HOURS = float(os.getenv("HTTP_CACHE_TTL_HOURS", "24"))
+PAGE_CACHE_TTL_DAYS = float(os.getenv("PAGE_CACHE_TTL_DAYS", "30"))
+# Lifetime of resolved rows (timestamp and URL per row hash)
+RESULT_CACHE_TTL_DAYS = float(os.getenv("RESULT_CACHE_TTL_DAYS", "90"))
+
+# Negative cache: queries and rows that resolved to nothing.
+# Feed dates within this many days of today count as "recent" and use the short TTL,
+# since their releases may simply not be indexed yet.
+NEGATIVE_CACHE_RECENT_DAYS = int(os.getenv("NEGATIVE_CACHE_RECENT_DAYS", "7"))
+NEGATIVE_CACHE_TTL_RECENT_HOURS = float(os.getenv("NEGATIVE_CACHE_TTL_RECENT_HOURS", "6"))
+NEGATIVE_CACHE_TTL_OLD_DAYS = float(os.getenv("NEGATIVE_CACHE_TTL_OLD_DAYS", "30"))
+
+# Learned ticker/issuer -> newswire affinity (empty string disables it)
+AFFINITY_INDEX_PATH = os.getenv("AFFINITY_INDEX_PATH", ".cache/affinity.json")
+# Accepted results counted in memory before they are merged into the index file
+AFFINITY_FLUSH_EVERY = int(os.getenv("AFFINITY_FLUSH_EVERY", "25"))
+
+# Minimum share of a candidate URL's slug tokens found in the headline (0 disables the filter)
+SLUG_MATCH_THRESHOLD = float(os.getenv("SLUG_MATCH_THRESHOLD", "0.6"))
+# Minimum fuzzy score (0-1, see matching.HeadlineMatcher) for a page headline to
+# count as the input headline; 1 requires identical canonical forms
+HEADLINE_MATCH_THRESHOLD = float(os.getenv("HEADLINE_MATCH_THRESHOLD", "0.85"))
+
+# Adaptive per-host concurrency (AIMD): start, floor and ceiling of in-flight requests
+HOST_CONCURRENCY_INITIAL = int(os.getenv("HOST_CONCURRENCY_INITIAL", "2"))
+HOST_CONCURRENCY_MIN = int(os.getenv("HOST_CONCURRENCY_MIN", "1"))
+HOST_CONCURRENCY_MAX = int(os.getenv("HOST_CONCURRENCY_MAX", "16"))
+# A response slower than this multiple of the host's average latency counts as congestion
+LATENCY_SPIKE_FACTOR = float(os.getenv("LATENCY_SPIKE_FACTOR", "3.0"))
+# Rows resolved in parallel by process_file
+ROW_WORKERS = int(os.getenv("ROW_WORKERS", "1"))
+
+# Worker processes for HTML parsing (0 parses inline); defaults to one per core
+# when rows are resolved in parallel. PARSE_QUEUE_SIZE bounds pending parse jobs.
+PARSE_WORKERS = int(
+    os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1) if ROW_WORKERS > 1 else "0")
+)
+PARSE_QUEUE_SIZE = int(os.getenv("PARSE_QUEUE_SIZE", "32"))
+
+# Max Google CSE queries per row (0 = unlimited); rows over budget get status budget-exceeded
+ROW_QUERY_BUDGET = int(os.getenv("ROW_QUERY_BUDGET", "0"))
+
+# Output rows buffered per Parquet/Arrow part file (one row group each) before it is written
+OUTPUT_FLUSH_ROWS = int(os.getenv("OUTPUT_FLUSH_ROWS", "500"))
+
+# Streaming daemon (python -m src.scraper.daemon): resolver threads, pending rows
+# before input reading blocks, and the per-row latency target in seconds
+DAEMON_WORKERS = int(os.getenv("DAEMON_WORKERS", "4"))
+DAEMON_QUEUE_SIZE = int(os.getenv("DAEMON_QUEUE_SIZE", "64"))
+DAEMON_SLO_SECONDS = float(os.getenv("DAEMON_SLO_SECONDS", "10"))
+
+# HTTP resolution service (python -m src.scraper.service): resolver threads shared
+# by all callers, in-memory result cache size and lifetime, and max rows per batch
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "8"))
+SERVICE_CACHE_SIZE = int(os.getenv("SERVICE_CACHE_SIZE", "10000"))
+SERVICE_CACHE_TTL_SECONDS = float(os.getenv("SERVICE_CACHE_TTL_SECONDS", "3600"))
+SERVICE_MAX_BATCH = int(os.getenv("SERVICE_MAX_BATCH", "500"))
+
+# Sampling interval of the --profile option in milliseconds
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+
+# Bytes of a release page read before falling back to lighter/full variants (see variants.py)
+RELEASE_PREFIX_BYTES = int(os.getenv("RELEASE_PREFIX_BYTES", "65536"))
+
+# Logging (see scraper_common.logs): level, "json" or "text" lines on stderr, and sampling of
+# sub-WARNING records per stage, e.g. "search=0.1,fetch=0.25" ("*" matches any stage)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
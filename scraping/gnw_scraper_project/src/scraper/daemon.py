@@ -0,0 +1,336 @@
+"""
+Long-running resolver for live feed rows.
+
+Usage:
+    python -m src.scraper.daemon                       # JSON lines on stdin
+    python -m src.scraper.daemon --tail feed.csv       # follow a growing CSV
+    python -m src.scraper.daemon --socket resolver.sock
+
+Each input line is either a JSON object with ticker, headline and date
+(an optional id is echoed back) or a CSV row in the input file format
+(Date, Ticker, Headline). A JSON record is written as soon as each row
+completes, to stdout or back over the socket connection.
+
+The HTTP session, caches and parse workers stay warm between rows. Rows wait
+in a bounded queue; when it is full, input reading blocks (backpressure).
+Every record carries its end-to-end latency and whether it met the SLO.
+
+The SLO is also a deadline: once a row's time since it was received passes
+--slo, it starts no further search modes. It still gets the first (most
+specific) mode, so a row that waited out its budget in the queue costs one
+query; rows cut short are reported with status budget-exceeded and are not
+cached as misses. --slo 0 turns the deadline off.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterable, Optional
+
+from scraper_common import throttle
+from scraper_common.logs import setup_logging
+
+from . import config, variants
+from .affinity import get_affinity_index
+from .cache import get_negative_cache
+from .gnw_scraper import prepare_row, resolve_record
+from .parsing import get_parse_stage
+
+logger = logging.getLogger(__name__)
+
+# Records between latency summaries in the log
+REPORT_EVERY = 100
+
+
+@dataclass
+class Job:
+    ticker: str
+    headline: str
+    feed_date: str
+    emit: Callable[[Dict], None]
+    id: Optional[str] = None
+    received: float = field(default_factory=time.monotonic)
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+def parse_line(line: str) -> Optional[Dict[str, str]]:
+    """Parse a JSON object or CSV input row into ticker/headline/date (None if malformed)."""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return None
+        fields = {
+            "ticker": data.get("ticker") or data.get("Ticker") or "",
+            "headline": data.get("headline") or data.get("Headline") or "",
+            "date": data.get("date") or data.get("Date") or "",
+        }
+        if data.get("id") is not None:
+            fields["id"] = str(data["id"])
+    else:
+        row = next(csv.reader([line]), [])
+        if len(row) < 3 or row[:3] == ["Date", "Ticker", "Headline"]:
+            return None
+        fields = {"date": row[0], "ticker": row[1], "headline": ",".join(row[2:]).strip()}
+    if not fields["ticker"] or not fields["headline"]:
+        return None
+    return fields
+
+
+class ResolverDaemon:
+    """Worker pool resolving queued rows and tracking latency against the SLO."""
+
+    def __init__(self, workers: int, queue_size: int, slo_seconds: float):
+        self.slo_seconds = slo_seconds
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=max(1, queue_size))
+        self._workers = [
+            threading.Thread(target=self._work, name=f"resolver-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=1000)
+        self._completed = 0
+        self._slo_misses = 0
+
+    def start(self) -> None:
+        # Open caches and parse workers up front so the first row isn't cold
+        get_negative_cache()
+        get_affinity_index()
+        get_parse_stage()
+        for worker in self._workers:
+            worker.start()
+        logger.info(
+            "Resolver daemon started: %d workers, queue %d, SLO %.1fs",
+            len(self._workers),
+            self._queue.maxsize,
+            self.slo_seconds,
+        )
+
+    def submit(self, fields: Dict[str, str], emit: Callable[[Dict], None]) -> Job:
+        """Queue a row; blocks while the queue is full."""
+        job = Job(
+            ticker=fields["ticker"],
+            headline=fields["headline"],
+            feed_date=fields["date"],
+            emit=emit,
+            id=fields.get("id"),
+        )
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            logger.warning("Resolver queue full (%d rows); pausing input.", self._queue.maxsize)
+            self._queue.put(job)
+        return job
+
+    def stop(self) -> None:
+        """Finish queued rows, then stop the workers."""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        logger.info("Resolver daemon stopped. %s", self.summary())
+        logger.info("Per-host concurrency: %s", throttle.metrics())
+        logger.info("Release page variants: %s", variants.metrics())
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                self._resolve(job)
+            except Exception as e:
+                logger.error("Failed to resolve %s: %s", job.ticker, e, exc_info=True)
+            finally:
+                job.done.set()
+
+    def _resolve(self, job: Job) -> None:
+        started = time.monotonic()
+        row = prepare_row(job.ticker, job.headline, job.feed_date)
+        deadline = job.received + self.slo_seconds if self.slo_seconds > 0 else None
+        record = resolve_record(row, deadline=deadline)
+
+        latency = time.monotonic() - job.received
+        if job.id is not None:
+            record["id"] = job.id
+        record["queue_seconds"] = round(started - job.received, 3)
+        record["latency_seconds"] = round(latency, 3)
+        record["slo_met"] = self.slo_seconds <= 0 or latency <= self.slo_seconds
+        job.emit(record)
+
+        with self._lock:
+            self._latencies.append(latency)
+            self._completed += 1
+            if not record["slo_met"]:
+                self._slo_misses += 1
+            report = self._completed % REPORT_EVERY == 0
+        if not record["slo_met"]:
+            logger.warning(
+                "SLO missed for %s: %.2fs (queued %.2fs)",
+                job.ticker,
+                latency,
+                record["queue_seconds"],
+            )
+        if report:
+            logger.info("Resolver daemon: %s", self.summary())
+
+    def summary(self) -> str:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            completed, misses = self._completed, self._slo_misses
+        if not latencies:
+            return "no rows resolved"
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return (
+            f"{completed} rows, {misses} over SLO, "
+            f"p50 {p50:.2f}s, p95 {p95:.2f}s, queued {self._queue.qsize()}"
+        )
+
+
+def _line_writer(stream) -> Callable[[Dict], None]:
+    lock = threading.Lock()
+
+    def emit(record: Dict) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with lock:
+            stream.write(line)
+            stream.flush()
+
+    return emit
+
+
+def feed_lines(lines: Iterable[str], daemon: ResolverDaemon, emit: Callable[[Dict], None]) -> None:
+    for line in lines:
+        fields = parse_line(line)
+        if fields is None:
+            if line.strip():
+                logger.warning("Skipping malformed input line: %s", line.strip()[:80])
+            continue
+        daemon.submit(fields, emit)
+
+
+def tail_lines(path: str, from_start: bool = False, poll_seconds: float = 0.5) -> Iterable[str]:
+    """Yield lines appended to `path`, following truncation and rotation."""
+    while not os.path.exists(path):
+        time.sleep(poll_seconds)
+    f = open(path, "r", encoding="utf-8", errors="replace")
+    try:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        pending = ""
+        while True:
+            chunk = f.readline()
+            if chunk:
+                pending += chunk
+                if pending.endswith("\n"):
+                    yield pending
+                    pending = ""
+                continue
+            time.sleep(poll_seconds)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if stat.st_ino != os.fstat(f.fileno()).st_ino or stat.st_size < f.tell():
+                logger.info("%s was rotated or truncated; reopening.", path)
+                f.close()
+                f = open(path, "r", encoding="utf-8", errors="replace")
+                pending = ""
+    finally:
+        f.close()
+
+
+def serve_socket(path: str, daemon: ResolverDaemon) -> None:
+    """Accept JSON-lines connections on a Unix socket; records go back on the same connection."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            writer = _line_writer(_SocketWriter(self.wfile))
+            jobs = []
+            for raw in self.rfile:
+                fields = parse_line(raw.decode("utf-8", errors="replace"))
+                if fields is not None:
+                    jobs.append(daemon.submit(fields, writer))
+            # Keep the connection open until every row it sent has been answered
+            for job in jobs:
+                job.done.wait()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        server.daemon_threads = True
+        logger.info("Listening on %s", path)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+class _SocketWriter:
+    """Text adapter over a socket's binary write file."""
+
+    def __init__(self, wfile):
+        self._wfile = wfile
+
+    def write(self, text: str) -> None:
+        try:
+            self._wfile.write(text.encode("utf-8"))
+        except OSError:
+            logger.warning("Client went away before its record was sent.")
+
+    def flush(self) -> None:
+        try:
+            self._wfile.flush()
+        except OSError:
+            pass
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.scraper.daemon")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--tail", metavar="PATH", help="follow rows appended to an input CSV")
+    source.add_argument("--socket", metavar="PATH", help="serve JSON lines on a Unix socket")
+    parser.add_argument(
+        "--from-start", action="store_true", help="with --tail, also resolve rows already in the file"
+    )
+    parser.add_argument("--workers", type=int, default=config.DAEMON_WORKERS)
+    parser.add_argument("--queue-size", type=int, default=config.DAEMON_QUEUE_SIZE)
+    parser.add_argument(
+        "--slo",
+        type=float,
+        default=config.DAEMON_SLO_SECONDS,
+        help="per-row latency target and search deadline in seconds (0: no deadline)",
+    )
+    args = parser.parse_args(argv)
+
+    setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_SAMPLE_RATES)
+
+    daemon = ResolverDaemon(args.workers, args.queue_size, args.slo)
+    daemon.start()
+    try:
+        if args.socket:
+            serve_socket(args.socket, daemon)
+        elif args.tail:
+            feed_lines(tail_lines(args.tail, args.from_start), daemon, _line_writer(sys.stdout))
+        else:
+            feed_lines(sys.stdin, daemon, _line_writer(sys.stdout))
+    except KeyboardInterrupt:
+        logger.info("Interrupted; finishing queued rows.")
+    finally:
+        daemon.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,35 @@
 import logging
 import csv
+import hashlib
+import json
 import re
 import time
 import os
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-from typing import Optional, List, Tuple
-
-from . import client, config
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Deque, Dict, Optional, List, Tuple
+from urllib.parse import urlparse
+
+from scraper_common import stats, throttle
+from scraper_common.logs import lazy
+
+from . import client, config, variants
+from .affinity import get_affinity_index
+from .cache import get_http_cache, get_negative_cache, get_result_cache
+from .matching import get_headline_matcher, rank_candidates
+from .parsing import parse_timestamp
+from .sinks import make_sink
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
 
 DATE_TOLERANCE = timedelta(days=2)
 
+# Stage tags for per-query/per-candidate debug logs, sampled via LOG_SAMPLE_RATES
+SEARCH = {"stage": "search"}
+FETCH = {"stage": "fetch"}
+
 # Newswire domains we accept as candidates
 NEWSWIRE_DOMAINS = [
     "globenewswire.com",
@@ -22,9 +38,37 @@ NEWSWIRE_DOMAINS = [
     "accessnewswire.com",  # in case this is the domain you meant
 ]
 
+# Wires we ask Google about; narrowed to one of these when the issuer's wire is known
+SEARCH_SITES = [
+    "globenewswire.com",
+    "businesswire.com",
+    "prnewswire.com",
+    "accesswire.com",
+    "accessnewswire.com",
+]
+
+# Verbs that end the issuer name at the start of a typical headline
+ISSUER_SPLIT_REGEX = re.compile(
+    r"\b(?:announces|announced|reports|prices|closes|completes|files|launches|enters|receives|to)\b"
+)
 
 STRICT_DATE_WINDOW = True
 
+@dataclass(frozen=True)
+class PreparedRow:
+    """Per-row values derived once from the input and reused by every search mode."""
+
+    ticker: str
+    feed_date: str
+    headline: str
+    clean_headline: str
+    short_headline: str
+    compare_headline: str
+    input_date: Optional[date]
+    date_window: Tuple[str, str]
+    content_hash: str
+
+
 class PRInfo:
     def __init__(
         self, url: str, ts_raw: Optional[str] = None, ts_iso: Optional[str] = None
@@ -76,6 +120,74 @@ def _is_gnw_release_url(url: str) -> bool:
     return True
 
 
+def _parse_feed_date(feed_date_str: str) -> Optional[date]:
+    """Parse the date part of a feed date like '03/31/2023 09:15:00' (None on failure)."""
+    parts = (feed_date_str or "").split()
+    if not parts:
+        return None
+    try:
+        return datetime.strptime(parts[0], "%m/%d/%Y").date()
+    except ValueError:
+        return None
+
+
+def _hash_row(ticker_key: str, date_key: str, compare_headline: str) -> str:
+    content = "|".join([ticker_key, date_key, compare_headline])
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def _row_key(ticker: str, feed_date_str: str, headline: str) -> str:
+    """Content hash identifying a (ticker, date, headline) row across runs."""
+    input_date = _parse_feed_date(feed_date_str)
+    if input_date is not None:
+        date_key = input_date.isoformat()
+    else:
+        date_key = ((feed_date_str or "").split() or [""])[0]
+    return _hash_row(
+        (ticker or "").strip().upper(), date_key, normalize_for_compare(headline)
+    )
+
+
+def prepare_row(ticker: str, headline: str, feed_date_str: str) -> PreparedRow:
+    """Scalar counterpart of preprocess.prepare_rows for a single row."""
+    clean_headline = normalize_headline(headline or "")
+    return PreparedRow(
+        ticker=ticker,
+        feed_date=feed_date_str,
+        headline=headline,
+        clean_headline=clean_headline,
+        short_headline=" ".join(clean_headline.split()[:7]),  # first 7 words
+        compare_headline=normalize_for_compare(headline),
+        input_date=_parse_feed_date(feed_date_str),
+        date_window=_calculate_date_window(feed_date_str),
+        content_hash=_row_key(ticker, feed_date_str, headline),
+    )
+
+
+def _wire_for_url(url: str) -> Optional[str]:
+    """Return the SEARCH_SITES domain a URL belongs to, if any."""
+    host = urlparse(url or "").netloc.lower()
+    for site in SEARCH_SITES:
+        if host == site or host.endswith("." + site):
+            return site
+    return None
+
+
+def _issuer_key(headline: str) -> Optional[str]:
+    """
+    Best-effort issuer name from the start of a headline, e.g.
+    'TELA Bio Announces Pricing of ...' -> 'tela bio'.
+    """
+    text = normalize_for_compare(headline)
+    match = ISSUER_SPLIT_REGEX.search(text)
+    if not match:
+        return None
+    issuer = re.sub(r"[^\w\s]", "", text[: match.start()]).strip()
+    if not issuer or len(issuer.split()) > 8:
+        return None
+    return issuer
+
+
 def _calculate_date_window(feed_date_str: str) -> Tuple[str, str]:
     """
     Given a feed date string like '03/31/2023 09:15:00' (or '03/31/2023'),
@@ -110,24 +222,25 @@ def _calculate_date_window(feed_date_str: str) -> Tuple[str, str]:
     return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
 
 def _build_query(
-    ticker: str, text: str, date_window: Tuple[str, str], use_ticker: bool
+    ticker: str,
+    text: str,
+    date_window: Tuple[str, str],
+    use_ticker: bool,
+    sites: Optional[List[str]] = None,
 ) -> str:
     """
     Build a Google CSE query for GNW.
 
-    - Always restrict to site:globenewswire.com/news-release
+    - Restrict to the given newswire sites (all of SEARCH_SITES by default).
     - If use_ticker is True, require the ticker string.
     - 'text' is either the full headline, a short headline, or the ticker itself.
     - date_window is (start, end) in YYYY-MM-DD; if non-empty, we add after:/before:.
     """
-    # Target all supported newswires in one query
-    base = (
-        "(site:globenewswire.com "
-        "OR site:businesswire.com "
-        "OR site:prnewswire.com "
-        "OR site:accesswire.com "
-        "OR site:accessnewswire.com)"
-    )
+    sites = sites or SEARCH_SITES
+    if len(sites) == 1:
+        base = f"site:{sites[0]}"
+    else:
+        base = "(" + " OR ".join(f"site:{site}" for site in sites) + ")"
 
     parts: List[str] = [base]
 
@@ -157,41 +270,64 @@ def _search_web_api(
     text: str,
     date_window: Tuple[str, str],
     use_ticker: bool,
-) -> List[str]:
+    sites: Optional[List[str]] = None,
+) -> Optional[List[str]]:
     """
     Perform a single Google Custom Search query and return a list of GNW news-release URLs
-    (possibly empty) for this query.
+    (possibly empty) for this query, or None if the search could not be performed.
 
     Extra safety: if a date_window is provided, only keep GNW URLs whose path date
     (YYYY/MM/DD in the URL) falls within that window. If STRICT_DATE_WINDOW is True,
     that effectively means URL date must exactly match the feed date.
+
+    Queries that return no usable URLs are remembered in the negative cache and
+    are not sent again until their entry expires.
     """
-    if not config.GOOGLE_API_KEY or not config.GOOGLE_SEARCH_CX:
+    if not google_configured():
         logger.error("Google API key or search CX is not configured.")
-        return []
+        return None
 
-    query = _build_query(ticker, text, date_window, use_ticker)
-    logger.info("-> Google CSE query: %s", query)
+    query = _build_query(ticker, text, date_window, use_ticker, sites=sites)
 
-    try:
-        response = client.get(
-            "https://www.googleapis.com/customsearch/v1",
-            params={
-                "key": config.GOOGLE_API_KEY,
-                "cx": config.GOOGLE_SEARCH_CX,
-                "q": query,
-                "num": 10,
-            },
-        )
-    except Exception as e:
-        logger.warning("Google CSE request failed: %s", e)
+    negative_cache = get_negative_cache()
+    if negative_cache is not None and negative_cache.is_query_miss(query):
+        logger.debug("-> Skipping Google CSE query (cached miss): %s", query, extra=SEARCH)
+        stats.count("cache_hits")
         return []
 
-    try:
-        data = response.json()
-    except ValueError as e:
-        logger.warning("Failed to decode Google CSE JSON: %s", e)
-        return []
+    params = {
+        "key": config.GOOGLE_API_KEY,
+        "cx": config.GOOGLE_SEARCH_CX,
+        "q": query,
+        "num": 10,
+    }
+    # The API key is left out so workers with different keys share entries
+    http_cache = get_http_cache()
+    cache_key = "cse:" + json.dumps({k: v for k, v in params.items() if k != "key"}, sort_keys=True)
+    data = http_cache.get(cache_key) if http_cache is not None else None
+
+    if data is not None:
+        logger.debug("-> Google CSE query (cached response): %s", query, extra=SEARCH)
+        stats.count("cache_hits")
+    else:
+        logger.debug("-> Google CSE query: %s", query, extra=SEARCH)
+        stats.count("queries")
+
+        try:
+            with stats.stage("search"):
+                response = client.get("https://www.googleapis.com/customsearch/v1", params=params)
+        except Exception as e:
+            logger.warning("Google CSE request failed: %s", e)
+            return None
+
+        try:
+            data = response.json()
+        except ValueError as e:
+            logger.warning("Failed to decode Google CSE JSON: %s", e)
+            return None
+
+        if http_cache is not None and "error" not in data:
+            http_cache.set(cache_key, data, config.HTTP_CACHE_TTL_HOURS * 3600)
 
     start, end = date_window
     accepted_dates: set = set()
@@ -229,114 +365,127 @@ def _search_web_api(
                     ).date()
                 except ValueError:
                     # Weird date in URL, skip it
-                    logger.info(
+                    logger.debug(
                         "-> Skipping GNW URL %s due to invalid date in path.",
                         url,
+                        extra=SEARCH,
                     )
                     continue
 
                 if url_dt not in accepted_dates:
-                    logger.info(
+                    logger.debug(
                         "-> Skipping GNW URL %s because URL date %s is outside accepted dates %s",
                         url,
-                        url_dt.isoformat(),
-                        sorted(d.isoformat() for d in accepted_dates),
+                        url_dt,
+                        lazy(lambda: sorted(d.isoformat() for d in accepted_dates)),
+                        extra=SEARCH,
                     )
                     continue
 
         urls.append(url)
 
+    if not urls and negative_cache is not None:
+        ref_date = datetime.strptime(end, "%Y-%m-%d").date() if end else None
+        negative_cache.add_query_miss(query, ref_date)
+
     return urls
 
 
+def google_configured() -> bool:
+    """True when GOOGLE_API_KEY and GOOGLE_SEARCH_CX are both set."""
+    return bool(config.GOOGLE_API_KEY and config.GOOGLE_SEARCH_CX)
+
+
+def search_release_urls(
+    ticker: str, headline: str, feed_date_str: str, sites: Optional[List[str]] = None
+) -> Optional[List[str]]:
+    """
+    Google CSE news-release URLs for a feed row, in result order: one query
+    with the ticker (if any), the cleaned headline and the feed date window,
+    restricted to `sites` (default SEARCH_SITES). Returns None if the search
+    could not be performed.
+
+    This is the entry point other projects use (../../scrape registers it as
+    a resolver); it shares the negative and HTTP caches with process_file.
+    """
+    row = prepare_row(ticker, headline, feed_date_str)
+    return _search_web_api(
+        row.ticker, row.clean_headline, row.date_window, use_ticker=bool(row.ticker), sites=sites
+    )
+
+
+class CandidateUnverified(Exception):
+    """A candidate page could not be fetched or read: neither accepted nor rejected."""
+
+
 def extract_timestamp_from_gnw(
     gnw_url: str,
     feed_date_str: str,
     expected_headline: Optional[str] = None,
+    input_date: Optional[date] = None,
 ) -> Optional[PRInfo]:
     """
     Scrapes the GNW page for the official timestamp, verifies the headline if provided,
     and checks the date against the input date.
 
+    input_date, when the caller already parsed feed_date_str, skips re-parsing it.
+
     Returns PRInfo if both headline and date validation pass (if applicable),
-    otherwise returns None.
+    otherwise returns None. Raises CandidateUnverified when the page could not
+    be fetched or parsed, so the caller can tell that apart from a rejection.
     """
-    try:
+    if input_date is None:
         # Expect feed_date_str like 'MM/DD/YYYY' or 'MM/DD/YYYY HH:MM:SS'
-        date_part = (feed_date_str or "").split()[0].strip()
-        input_date = datetime.strptime(date_part, "%m/%d/%Y").date()
-    except ValueError:
-        logger.error(
-            "Input date format error: '%s'. Expected 'MM/DD/YYYY'. Cannot perform date check.",
-            feed_date_str,
-        )
-        input_date = None
+        input_date = _parse_feed_date(feed_date_str)
+        if input_date is None:
+            logger.error(
+                "Input date format error: '%s'. Expected 'MM/DD/YYYY'. Cannot perform date check.",
+                feed_date_str,
+            )
 
     pr_info = PRInfo(url=gnw_url)
 
     try:
-        logger.info("-> Fetching GNW page for validation: %s", gnw_url)
-        response = client.get(gnw_url)
-        soup = BeautifulSoup(response.text, "lxml")
+        logger.debug("-> Fetching GNW page for validation: %s", gnw_url, extra=FETCH)
+        page, variant = variants.fetch_release(gnw_url)
+        if variant != variants.FULL:
+            logger.debug("-> Read the %s variant of %s", variant, gnw_url, extra=FETCH)
 
         # --- Headline verification ---
         if expected_headline is not None:
-            page_headline: Optional[str] = None
-
-            h1 = soup.find("h1")
-            if h1 and h1.get_text(strip=True):
-                page_headline = h1.get_text(strip=True)
-
-            if not page_headline and soup.title and soup.title.get_text(strip=True):
-                page_headline = soup.title.get_text(strip=True)
+            page_headline: Optional[str] = page["headline"]
 
             if page_headline:
-                expected_norm = normalize_for_compare(expected_headline)
-                page_norm = normalize_for_compare(page_headline)
+                matched, score = get_headline_matcher().match(expected_headline, page_headline)
 
-                if expected_norm != page_norm:
+                if not matched:
                     logger.warning(
-                        "-> Headline check FAILED: Expected '%s' but GNW page has '%s'. Discarding this URL.",
+                        "-> Headline check FAILED (score %.2f): Expected '%s' but GNW page has '%s'. Discarding this URL.",
+                        score,
                         expected_headline,
                         page_headline,
                     )
+                    stats.reject(stats.HEADLINE_MISMATCH)
                     return None
+                logger.info("-> Headline check passed (score %.2f).", score)
             else:
                 logger.warning(
                     "-> Could not find a headline on the GNW page to verify. Discarding this URL."
                 )
+                stats.reject(stats.HEADLINE_MISMATCH)
                 return None
 
         # --- Timestamp extraction ---
-        page_text = soup.get_text(" ", strip=True)
-
-        ts_pattern = re.compile(
-            r"([A-Z][a-z]+ \d{1,2}, \d{4} \d{1,2}:\d{2}(?::\d{2})?(?: [AP]M)?)"
-        )
-        
-        match = ts_pattern.search(page_text)
-        if not match:
+        ts_raw = page["ts_raw"]
+        if not ts_raw:
             logger.warning(
                 "-> No recognizable timestamp found on GNW page for %s", gnw_url
             )
             return None
 
-        ts_raw = match.group(1)
         pr_info.ts_raw = ts_raw
 
-        parsed_dt: Optional[datetime] = None
-        for fmt in (
-            "%B %d, %Y %I:%M %p ET",
-            "%B %d, %Y %H:%M ET",
-            "%B %d, %Y %I:%M:%S %p ET",
-            "%B %d, %Y %H:%M:%S ET",
-        ):
-            try:
-                parsed_dt = datetime.strptime(ts_raw, fmt)
-                break
-            except ValueError:
-                continue
-
+        parsed_dt = parse_timestamp(ts_raw)
         if not parsed_dt:
             logger.warning(
                 "-> Could not parse GNW timestamp '%s' for %s", ts_raw, gnw_url
@@ -362,6 +511,7 @@ def extract_timestamp_from_gnw(
                     "-> Date check FAILED: Difference is %d days. Discarding this URL.",
                     date_difference.days,
                 )
+                stats.reject(stats.DATE_MISMATCH)
                 return None
 
         # If we couldn't parse the input date, still return timestamp info
@@ -369,25 +519,58 @@ def extract_timestamp_from_gnw(
 
     except Exception as e:
         logger.error("An error occurred during GNW extraction for %s: %s", gnw_url, e)
-        return None
+        stats.reject(stats.FETCH_ERROR)
+        raise CandidateUnverified(str(e)) from e
 
 
 def search_gnw_prinfo_for_headline(
     ticker: str,
     headline: str,
     feed_date_str: str,
+    prepared: Optional[PreparedRow] = None,
+    deadline: Optional[float] = None,
 ) -> Optional[PRInfo]:
     """
     Master search: for a given row (ticker, headline, date), try multiple Google
     modes and, for each mode, multiple candidate GNW URLs. The first URL that
     passes both headline and date validation is returned as PRInfo.
 
-    If no URL passes validation, returns None.
+    If no URL passes validation, returns None. Accepted rows are kept in the
+    result cache; rows that exhausted every mode are recorded in the negative
+    cache. Either way the row is answered from the cache until the entry expires.
+
+    When called inside stats.track_row(), the row's cost and outcome are
+    recorded there and at most ROW_QUERY_BUDGET queries are sent.
+
+    `prepared` carries the row's normalized values when the caller already
+    computed them (see preprocess.prepare_rows).
+
+    `deadline` is a time.monotonic() value after which no further search mode
+    is started; the first mode always runs. A row cut short this way is
+    reported as budget-exceeded and not cached as a miss.
     """
-    clean_headline = normalize_headline(headline or "")
-    short_headline = " ".join(clean_headline.split()[:7])  # first 7 words
+    row = prepared or prepare_row(ticker, headline, feed_date_str)
+    row_stats = stats.current()
+    row_hash = row.content_hash
+    result_cache = get_result_cache()
+    cached = result_cache.get(row_hash) if result_cache is not None else None
+    if cached is not None:
+        logger.info("-> Using cached result for row: %s %s", ticker, feed_date_str)
+        stats.count("cache_hits")
+        if row_stats is not None:
+            row_stats.resolver = "cache"
+        return PRInfo(cached["url"], ts_raw=cached.get("ts_raw"), ts_iso=cached["ts_iso"])
+
+    negative_cache = get_negative_cache()
+    if negative_cache is not None and negative_cache.is_row_miss(row_hash):
+        logger.info("-> Skipping row (cached miss): %s %s", ticker, feed_date_str)
+        stats.count("cache_hits")
+        return None
 
-    date_window = _calculate_date_window(feed_date_str)
+    clean_headline = row.clean_headline
+    compare_headline = row.compare_headline
+    short_headline = row.short_headline
+    date_window = row.date_window
 
     def dw(use_dates: bool) -> Tuple[str, str]:
         return date_window if use_dates else ("", "")
@@ -401,128 +584,253 @@ def search_gnw_prinfo_for_headline(
         ("Ticker-only (no date)", False, ticker, False),
     ]
 
-    for label, use_ticker, text, use_dates in search_modes:
-        logger.info("-> Google search mode: %s", label)
+    affinity = get_affinity_index()
+    issuer = _issuer_key(headline)
+    likely_wire = affinity.likely_wire(ticker, issuer) if affinity is not None else None
+    if likely_wire:
+        logger.info("-> Affinity: %s usually publishes on %s", ticker, likely_wire)
+
+    # Only cache the row as a miss if every search actually ran and every
+    # candidate was fetched and rejected
+    searches_complete = True
+    tried_urls: set = set()
+
+    # Narrow the most specific mode to the issuer's usual wire first; on a miss
+    # every mode searches all wires, so an affinity costs at most one query
+    passes: List[Tuple[tuple, Optional[List[str]]]] = [(m, None) for m in search_modes]
+    if likely_wire:
+        passes.insert(0, (search_modes[0], [likely_wire]))
+
+    for pass_num, ((label, use_ticker, text, use_dates), sites) in enumerate(passes):
+        mode = label + (f" [site:{sites[0]}]" if sites else "")
+        if pass_num and deadline is not None and time.monotonic() >= deadline:
+            logger.info("-> Deadline passed; skipping the remaining search modes.")
+            if row_stats is not None:
+                row_stats.status = stats.BUDGET_EXCEEDED
+            return None
+        if (
+            row_stats is not None
+            and config.ROW_QUERY_BUDGET
+            and row_stats.queries >= config.ROW_QUERY_BUDGET
+        ):
+            logger.info("-> Query budget of %d spent for this row.", config.ROW_QUERY_BUDGET)
+            row_stats.status = stats.BUDGET_EXCEEDED
+            return None
+
+        logger.debug("-> Google search mode: %s", mode, extra=SEARCH)
         candidate_urls = _search_web_api(
-            ticker, text, dw(use_dates), use_ticker=use_ticker
+            ticker, text, dw(use_dates), use_ticker=use_ticker, sites=sites
         )
 
-        if not candidate_urls:
+        if candidate_urls is None:
+            searches_complete = False
             continue
 
-        for url in candidate_urls:
-            logger.info("-> Trying candidate GNW URL: %s", url)
-            pr_info = extract_timestamp_from_gnw(
-                url, feed_date_str, expected_headline=headline
-            )
+        # Cheap slug check first so unlikely candidates are never downloaded
+        for url in rank_candidates(candidate_urls, compare_headline):
+            if url in tried_urls:
+                continue
+            tried_urls.add(url)
+
+            logger.debug("-> Trying candidate GNW URL: %s", url, extra=FETCH)
+            try:
+                pr_info = extract_timestamp_from_gnw(
+                    url, feed_date_str, expected_headline=headline, input_date=row.input_date
+                )
+            except CandidateUnverified:
+                searches_complete = False
+                continue
             if pr_info is not None:
                 # Found a URL that passes both headline + date checks
                 logger.info("-> Accepted GNW URL for this row: %s", url)
+                if row_stats is not None:
+                    row_stats.resolver = mode
+                if affinity is not None:
+                    affinity.record(ticker, issuer, _wire_for_url(url))
+                if result_cache is not None:
+                    result_cache.set(
+                        row_hash,
+                        {"url": pr_info.url, "ts_raw": pr_info.ts_raw, "ts_iso": pr_info.ts_iso},
+                        config.RESULT_CACHE_TTL_DAYS * 86400,
+                    )
                 return pr_info
 
-        logger.info("-> No candidate URLs passed validation for search mode: %s", label)
+        logger.info("-> No candidate URLs passed validation for search mode: %s", mode)
 
     logger.info("-> No GNW match found via Google for this row after all modes.")
+    if searches_complete and negative_cache is not None:
+        negative_cache.add_row_miss(row_hash, row.input_date)
+    if not searches_complete and row_stats is not None and not row_stats.pages_fetched:
+        # Nothing was found because the searches failed, not because nothing exists
+        row_stats.status = stats.ERROR
     return None
 
 
-def process_file(input_csv: str, output_csv: str) -> None:
+def _resolve_prepared(
+    row: PreparedRow, row_num: int, total: int, deadline: Optional[float] = None
+) -> Tuple[str, str]:
     """
-    Main driver: read the input CSV, append GNW timestamps into the output CSV.
-    Input format: Date, Ticker, Headline (headline may contain commas).
+    Resolve one prepared row and return (GNW_timestamp_iso column value, URL).
+    The timestamp is "" when not found and "ERROR" on failure; the URL is ""
+    unless a release was accepted. Must run inside stats.track_row().
+    """
+    row_stats = stats.current()
+    try:
+        logger.info(
+            "Row %d/%d: Searching GNW for %s - %s",
+            row_num,
+            total,
+            row.ticker,
+            row.headline[:30] + ("..." if len(row.headline) > 30 else ""),
+        )
+
+        pr_info = search_gnw_prinfo_for_headline(
+            row.ticker, row.headline, row.feed_date, prepared=row, deadline=deadline
+        )
+        row_stats.finish(pr_info is not None)
+
+        if pr_info is not None and pr_info.ts_iso:
+            return pr_info.ts_iso, pr_info.url
+        return "", ""
+
+    except Exception as e:
+        logger.error(
+            "Unhandled error on row %d (ticker=%s, date=%s): %s",
+            row_num,
+            row.ticker,
+            row.feed_date,
+            e,
+            exc_info=True,
+        )
+        row_stats.status = stats.ERROR
+        # best effort: mark the row as error
+        return "ERROR", ""
+
+
+def resolve_record(
+    row: PreparedRow, row_num: int = 1, total: int = 1, deadline: Optional[float] = None
+) -> Dict[str, str]:
+    """
+    Resolve one prepared row into an output record: the CSV columns, the
+    accepted release URL and the stats.EXTENDED_FIELDS of the row.
+    See search_gnw_prinfo_for_headline for `deadline`.
+    """
+    with stats.track_row() as row_stats:
+        ts_value, url = _resolve_prepared(row, row_num, total, deadline)
+    record = {
+        "Ticker": row.ticker,
+        "Date": row.feed_date,
+        "Headline": row.headline,
+        "GNW_URL": url,
+        "GNW_timestamp_iso": ts_value,
+    }
+    record.update(zip(stats.EXTENDED_FIELDS, row_stats.as_columns()))
+    return record
+
+
+def process_file(
+    input_csv: str, output_csv: str, extended: bool = False, output_format: str = "csv"
+) -> None:
+    """
+    Main driver: read the input CSV, append GNW timestamps and release URLs
+    into the output. Input format: Date, Ticker, Headline (headline may contain commas).
+
+    With extended=True, each output row also carries stats.EXTENDED_FIELDS:
+    the search mode that won, queries spent, pages fetched, cache hits,
+    wall time per stage and the final status.
+
+    output_format is 'csv' (default), or 'parquet' / 'arrow' for a directory
+    of typed part files (see sinks.py).
     """
     if not os.path.exists(input_csv):
         logger.error("Input file %s not found.", input_csv)
         return
 
-    processed_rows = 0
-    if os.path.exists(output_csv):
-        with open(
-            output_csv, "r", newline="", encoding="utf-8", errors="replace"
-        ) as f_out_check:
-            reader_check = csv.reader(f_out_check)
-            processed_rows = sum(1 for _ in reader_check) - 1
-            processed_rows = max(0, processed_rows)
-            logger.info(
-                "Found %d previously processed rows in %s. Resuming from row %d.",
-                processed_rows,
-                output_csv,
-                processed_rows + 1,
-            )
+    sink = make_sink(output_csv, output_format, extended)
+    processed_rows = sink.existing_rows()
+    if processed_rows:
+        logger.info(
+            "Found %d previously processed rows in %s. Resuming from row %d.",
+            processed_rows,
+            output_csv,
+            processed_rows + 1,
+        )
     else:
-        logger.info("Starting new run. Output file %s does not exist.", output_csv)
+        logger.info("Starting new run. Output %s does not exist or is empty.", output_csv)
 
-    with open(
-        input_csv, "r", newline="", encoding="utf-8", errors="replace"
-    ) as f_in, open(
-        output_csv, "a", newline="", encoding="utf-8", errors="replace"
-    ) as f_out:
+    with open(input_csv, "r", newline="", encoding="utf-8", errors="replace") as f_in:
         reader = list(csv.reader(f_in))
-        writer = csv.writer(f_out)
 
-        if not reader:
-            logger.warning("Input file %s is empty.", input_csv)
-            return
+    if not reader:
+        logger.warning("Input file %s is empty.", input_csv)
+        return
 
-        total = len(reader) - 1
-        data_rows = reader[1:]  # skip header
+    total = len(reader) - 1
+    data_rows = reader[1:]  # skip header
+    rows_to_process = data_rows[processed_rows:]
 
-        if processed_rows == 0:
-            writer.writerow(["Ticker", "Date", "Headline", "GNW_timestamp_iso"])
+    # Normalize the whole batch up front and resolve each unique row once
+    from .preprocess import prepare_rows
 
-        rows_to_process = data_rows[processed_rows:]
+    unique_rows, row_index = prepare_rows(rows_to_process)
+    get_headline_matcher().prepare(row.headline for row in unique_rows)
+    first_row_num = {}
+    for i, u in enumerate(row_index):
+        first_row_num.setdefault(u, processed_rows + i + 1)
 
-        for i, row in enumerate(rows_to_process):
-            row_num = processed_rows + i + 1
+    def resolve_unique(u: int) -> List[str]:
+        with stats.track_row() as row_stats:
+            ts_value, url = _resolve_prepared(unique_rows[u], first_row_num[u], total)
+        columns = [ts_value, url]
+        if extended:
+            columns += row_stats.as_columns()
 
-            try:
-                if not row or len(row) < 3:
-                    logger.warning("Skipping row %d: Malformed input.", row_num)
-                    continue
-
-                feed_date = row[0]
-                ticker = row[1]
-                headline = ",".join(row[2:]).strip()
-
-                logger.info(
-                    "Row %d/%d: Searching GNW for %s - %s",
-                    row_num,
-                    total,
-                    ticker,
-                    headline[:30] + ("..." if len(headline) > 30 else ""),
-                )
+        # rate limit so we don't hammer Google/GNW
+        with stats.stage("sleep"):
+            time.sleep(4.0)
+        return columns
 
-                pr_info = search_gnw_prinfo_for_headline(ticker, headline, feed_date)
-                ts_iso = ""
+    # Unique rows are resolved in parallel (per-host limits live in the client)
+    # and fanned back out to every copy in input order, so the row-count based
+    # resume stays valid.
+    try:
+        sink.open()
+    except ValueError as e:
+        logger.error("Not resuming: %s", e)
+        return
+    workers = max(1, config.ROW_WORKERS)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    # Only a bounded window of rows is queued ahead of the writer, so an
+    # interrupt or error doesn't leave the whole file queued to spend queries
+    # whose results would never be written.
+    window = 2 * workers
+    pending: Deque["Future[List[str]]"] = deque()
+    submitted = 0
+    try:
+        results: List[List[str]] = []
 
-                if pr_info is not None and pr_info.ts_iso:
-                    ts_iso = pr_info.ts_iso
+        for i, row in enumerate(rows_to_process):
+            u = row_index[i]
+            if u < 0:
+                logger.warning("Skipping row %d: Malformed input.", processed_rows + i + 1)
+                continue
 
-                writer.writerow([ticker, feed_date, headline, ts_iso])
+            # Unique rows are numbered by first appearance, so u is at most len(results)
+            while len(results) <= u:
+                while submitted < len(unique_rows) and len(pending) < window:
+                    pending.append(executor.submit(resolve_unique, submitted))
+                    submitted += 1
+                results.append(pending.popleft().result())
 
+            try:
+                with stats.stage("write"):
+                    sink.write([row[1], row[0], ",".join(row[2:]).strip()] + results[u])
             except Exception as e:
-                logger.error(
-                    "Unhandled error on row %d (ticker=%s, date=%s): %s",
-                    row_num,
-                    row[1] if len(row) > 1 else "",
-                    row[0] if len(row) > 0 else "",
-                    e,
-                    exc_info=True,
-                )
-                # best effort: mark the row as error
-                try:
-                    writer.writerow(
-                        [
-                            row[1] if len(row) > 1 else "",
-                            row[0] if len(row) > 0 else "",
-                            ",".join(row[2:]).strip() if len(row) > 2 else "",
-                            "ERROR",
-                        ]
-                    )
-                except Exception:
-                    pass
-
-            # rate limit so we don't hammer Google/GNW
-            time.sleep(4.0)
+                logger.error("Failed to write output row: %s", e)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        sink.close()
 
+    logger.info("Per-host concurrency: %s", throttle.metrics())
+    logger.info("Release page variants: %s", variants.metrics())
     logger.info("Processing complete. Output written to %s", output_csv)
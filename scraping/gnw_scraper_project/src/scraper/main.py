@@ -1,20 +1,47 @@
+import argparse
+from contextlib import nullcontext
 import sys
 import os
+
+from scraper_common.logs import setup_logging
+from scraper_common.profiler import profiling
+
+from . import config
 from .gnw_scraper import process_file
+from .sinks import FORMATS
 
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: python -m src.scraper.main <input_csv> <output_csv>")
-        sys.exit(1)
-        
-    input_path = sys.argv[1]
-    output_path = sys.argv[2]
-    
-    if not os.path.exists(input_path):
-        print(f"Error: Input file '{input_path}' not found.")
+    parser = argparse.ArgumentParser(prog="python -m src.scraper.main")
+    parser.add_argument("input_csv")
+    parser.add_argument("output_csv")
+    parser.add_argument(
+        "--extended",
+        action="store_true",
+        help="add provenance and timing columns (resolver, queries, pages, cache hits, stage times, status)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="csv (default), or parquet/arrow: a directory of typed part files appended as the run goes",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="profile",
+        metavar="PREFIX",
+        help="sample the run and write PREFIX.folded (flamegraph) and PREFIX.txt (summary)",
+    )
+    args = parser.parse_args()
+
+    setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_SAMPLE_RATES)
+
+    if not os.path.exists(args.input_csv):
+        print(f"Error: Input file '{args.input_csv}' not found.")
         sys.exit(1)
-        
-    process_file(input_path, output_path)
+
+    with profiling(args.profile, config.PROFILE_INTERVAL_MS) if args.profile else nullcontext():
+        process_file(args.input_csv, args.output_csv, extended=args.extended, output_format=args.format)
 
 if __name__ == "__main__":
     main()
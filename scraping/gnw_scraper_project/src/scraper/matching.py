@@ -0,0 +1,209 @@
+import logging
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Candidate logs share the fetch stage's sampling rate (see scraper_common.logs)
+FETCH = {"stage": "fetch"}
+
+TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+
+# Path noise that shows up next to the slug on some wires
+SLUG_STOP_TOKENS = {"en", "html", "htm", "news", "release", "releases"}
+
+
+def _tokens(text: str) -> Set[str]:
+    """Lowercase alphanumeric tokens, without pure numbers (ids, dates, amounts)."""
+    return {
+        t
+        for t in TOKEN_REGEX.findall((text or "").lower())
+        if not t.isdigit() and t not in SLUG_STOP_TOKENS
+    }
+
+
+def slug_tokens(url: str) -> Optional[Set[str]]:
+    """
+    Tokens of the headline slug embedded in a release URL, e.g.
+
+      globenewswire.com/news-release/2025/11/13/3187654/0/en/TELA-Bio-Announces-....html
+      businesswire.com/news/home/20251113005432/en/TELA-Bio-Announces-...
+      prnewswire.com/news-releases/tela-bio-announces-...-302610000.html
+
+    Returns None when the URL carries no usable slug.
+    """
+    path = unquote(urlparse(url or "").path)
+    segments = [s for s in path.split("/") if s]
+    if not segments:
+        return None
+    tokens = _tokens(segments[-1])
+    return tokens if len(tokens) >= 2 else None
+
+
+def slug_score(url: str, normalized_headline: str) -> Optional[float]:
+    """
+    Share of slug tokens that also appear in the headline (None without a slug).
+
+    Measured against the slug rather than the headline because several wires
+    truncate long slugs.
+    """
+    slug = slug_tokens(url)
+    if not slug:
+        return None
+    return len(slug & _tokens(normalized_headline)) / len(slug)
+
+
+def rank_candidates(
+    urls: List[str], normalized_headline: str, threshold: Optional[float] = None
+) -> List[str]:
+    """
+    Reorder candidate URLs by slug similarity to the headline before any fetch.
+
+    Candidates scoring below the threshold are dropped. URLs without a slug
+    can't be judged, so they are kept after the scored ones in search order.
+    """
+    if threshold is None:
+        threshold = config.SLUG_MATCH_THRESHOLD
+
+    scored = []
+    unscored = []
+    for url in urls:
+        score = slug_score(url, normalized_headline)
+        if score is None:
+            unscored.append(url)
+        elif score < threshold:
+            logger.debug("-> Dropping candidate %s (slug score %.2f)", url, score, extra=FETCH)
+        else:
+            scored.append((score, url))
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [url for _, url in scored] + unscored
+
+
+# Words whose presence or form varies between a feed headline and the wire's
+# own title ("Inc." vs "Inc" vs nothing) without changing which release it is
+HEADLINE_STOP_TOKENS = {"inc", "corp", "corporation", "co", "ltd", "llc", "plc", "sa", "nv", "the", "a", "an"}
+
+# Keeps decimals such as 7.2 in one token so "$7.2 Million" differs from "$72 Million"
+HEADLINE_TOKEN_REGEX = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*")
+
+# Character n-gram size of headline shingles
+SHINGLE_SIZE = 3
+
+# Words that tell apart releases an issuer puts out days apart for the same deal
+# or period ("Pricing of" vs "Closing of", "First" vs "Second Quarter"), mapped
+# to one form per event. Headlines must agree on these exactly, like numbers.
+EVENT_TOKENS = {
+    "proposed": "proposed", "proposes": "proposed", "launch": "proposed", "launches": "proposed",
+    "pricing": "pricing", "prices": "pricing", "priced": "pricing",
+    "closing": "closing", "closes": "closing", "closed": "closing",
+    "complete": "closing", "completes": "closing", "completed": "closing", "completion": "closing",
+    "first": "q1", "1st": "q1", "q1": "q1",
+    "second": "q2", "2nd": "q2", "q2": "q2",
+    "third": "q3", "3rd": "q3", "q3": "q3",
+    "fourth": "q4", "4th": "q4", "q4": "q4",
+}
+
+
+@dataclass(frozen=True)
+class HeadlineKey:
+    """Canonical form of a headline, computed once and compared many times."""
+
+    canonical: str
+    tokens: FrozenSet[str]
+    numbers: FrozenSet[str]
+    events: FrozenSet[str]
+    shingles: FrozenSet[str]
+
+
+def headline_key(text: str) -> HeadlineKey:
+    """
+    Canonical tokens and character shingles of a headline: accents, quotes,
+    dashes and punctuation removed, lowercased, legal suffixes and articles
+    dropped.
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    tokens = [t.rstrip(".") for t in HEADLINE_TOKEN_REGEX.findall(text)]
+    tokens = [t for t in tokens if t and t not in HEADLINE_STOP_TOKENS]
+    canonical = " ".join(tokens)
+    padded = f" {canonical} "
+    return HeadlineKey(
+        canonical=canonical,
+        tokens=frozenset(tokens),
+        numbers=frozenset(t for t in tokens if t[0].isdigit() and t not in EVENT_TOKENS),
+        events=frozenset(EVENT_TOKENS[t] for t in tokens if t in EVENT_TOKENS),
+        shingles=frozenset(padded[i : i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)),
+    )
+
+
+def _dice(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def score_keys(expected: HeadlineKey, page: HeadlineKey) -> float:
+    """
+    Similarity in [0, 1]: the mean of token and shingle Dice coefficients,
+    1.0 for identical canonical forms. 0.0 when the headlines quote different
+    numbers or name different events or periods (see EVENT_TOKENS): those are
+    other releases from the same issuer, however alike the wording.
+    """
+    if expected.canonical == page.canonical:
+        return 1.0
+    if expected.numbers != page.numbers or expected.events != page.events:
+        return 0.0
+    return (_dice(expected.tokens, page.tokens) + _dice(expected.shingles, page.shingles)) / 2
+
+
+class HeadlineMatcher:
+    """
+    Scores page headlines against input headlines.
+
+    Input headlines are keyed once (prepare() does the whole run up front);
+    page headlines are keyed per call since each page is seen once.
+    """
+
+    def __init__(self, threshold: Optional[float] = None):
+        self.threshold = config.HEADLINE_MATCH_THRESHOLD if threshold is None else threshold
+        self._keys: Dict[str, HeadlineKey] = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, headlines: Iterable[str]) -> None:
+        keys = {h: headline_key(h) for h in headlines if h not in self._keys}
+        with self._lock:
+            self._keys.update(keys)
+
+    def key(self, headline: str) -> HeadlineKey:
+        key = self._keys.get(headline)
+        if key is None:
+            key = headline_key(headline)
+            with self._lock:
+                self._keys[headline] = key
+        return key
+
+    def score(self, expected_headline: str, page_headline: str) -> float:
+        return score_keys(self.key(expected_headline), headline_key(page_headline))
+
+    def match(self, expected_headline: str, page_headline: str) -> Tuple[bool, float]:
+        """(accepted, score) for a page headline against an input headline."""
+        score = self.score(expected_headline, page_headline)
+        return score >= self.threshold, score
+
+
+_matcher: Optional[HeadlineMatcher] = None
+
+
+def get_headline_matcher() -> HeadlineMatcher:
+    """Creates or returns the process-wide headline matcher."""
+    global _matcher
+    if _matcher is None:
+        _matcher = HeadlineMatcher()
+    return _matcher
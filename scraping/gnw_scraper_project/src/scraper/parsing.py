@@ -0,0 +1,127 @@
+import atexit
+import logging
+import re
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, Optional, TypeVar
+
+from . import config
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _soup(content: bytes, features: str):
+    # bs4 costs ~90 ms to import; load it on the first parse, not at startup
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(content, features)
+
+# Dateline timestamp as it appears in the page text, e.g. "November 13, 2025 4:21 PM"
+TS_PATTERN = re.compile(
+    r"([A-Z][a-z]+ \d{1,2}, \d{4} \d{1,2}:\d{2}(?::\d{2})?(?: [AP]M)?)"
+)
+
+
+# Accepted dateline formats, tried in order (a trailing "ET" is optional)
+TS_FORMATS = (
+    "%B %d, %Y %I:%M %p",
+    "%B %d, %Y %H:%M",
+    "%B %d, %Y %I:%M:%S %p",
+    "%B %d, %Y %H:%M:%S",
+)
+
+
+def parse_release(content: bytes, features: str = "lxml") -> Dict[str, Optional[str]]:
+    """
+    Extract the headline (h1, falling back to <title>) and the first dateline
+    timestamp from a release page.
+
+    Runs in a parse worker process, so it takes raw bytes and returns a small
+    picklable record instead of the parsed tree. `features` picks the
+    BeautifulSoup parser backend.
+    """
+    soup = _soup(content, features)
+
+    headline: Optional[str] = None
+    headline_tag: Optional[str] = None
+    h1 = soup.find("h1")
+    if h1 and h1.get_text(strip=True):
+        headline, headline_tag = h1.get_text(strip=True), "h1"
+    if not headline and soup.title and soup.title.get_text(strip=True):
+        headline, headline_tag = soup.title.get_text(strip=True), "title"
+
+    match = TS_PATTERN.search(soup.get_text(" ", strip=True))
+    return {
+        "headline": headline,
+        "headline_tag": headline_tag,
+        "ts_raw": match.group(1) if match else None,
+    }
+
+
+def parse_timestamp(ts_raw: str) -> Optional[datetime]:
+    """Parse a dateline like 'November 13, 2025 4:21 PM ET' (None if no format fits)."""
+    cleaned = re.sub(r"\s*ET$", "", (ts_raw or "").strip())
+    for fmt in TS_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class ParseStage:
+    """
+    CPU-bound parsing decoupled from network I/O.
+
+    Network threads hand fetched bytes to a ProcessPoolExecutor and wait for the
+    extracted record, so parsing scales across cores instead of holding the GIL
+    while other threads have sockets to service. At most `max_pending` jobs are
+    queued; further callers block, which pushes back on the fetchers.
+
+    With workers == 0 the parse runs inline in the calling thread.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._executor: Optional["ProcessPoolExecutor"] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> "ProcessPoolExecutor":
+        from concurrent.futures import ProcessPoolExecutor
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                atexit.register(self.shutdown)
+            return self._executor
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        if self.workers <= 0:
+            return fn(*args)
+        with self._slots:
+            return self._get_executor().submit(fn, *args).result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+_parse_stage = None
+
+
+def get_parse_stage() -> ParseStage:
+    """Creates or returns the process-wide parse stage."""
+    global _parse_stage
+    if _parse_stage is None:
+        _parse_stage = ParseStage(config.PARSE_WORKERS, config.PARSE_QUEUE_SIZE)
+        if config.PARSE_WORKERS > 0:
+            logger.info("Parsing pages in %d worker processes", config.PARSE_WORKERS)
+    return _parse_stage
@@ -0,0 +1,102 @@
+import logging
+from typing import List, Tuple
+
+import pandas as pd
+
+from .gnw_scraper import (
+    DATE_TOLERANCE,
+    STRICT_DATE_WINDOW,
+    PreparedRow,
+    _hash_row,
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns that identify a row for de-duplication (same as the content hash)
+DEDUP_KEYS = ["ticker_key", "date_key", "compare_headline"]
+
+
+def prepare_rows(rows: List[List[str]]) -> Tuple[List[PreparedRow], List[int]]:
+    """
+    Normalize a batch of raw input rows (Date, Ticker, Headline...) in one pass.
+
+    Headline normalization, short headlines, date parsing and date windows are
+    computed column-wise with pandas instead of row by row in the search loop.
+    Rows with the same ticker, date and normalized headline collapse into one
+    PreparedRow.
+
+    Returns (unique_rows, row_index) where row_index[i] is the position of
+    input row i in unique_rows, or -1 for malformed rows.
+    """
+    valid = [i for i, row in enumerate(rows) if row and len(row) >= 3]
+    row_index = [-1] * len(rows)
+    if not valid:
+        return [], row_index
+
+    df = pd.DataFrame(
+        {
+            "feed_date": [rows[i][0] for i in valid],
+            "ticker": [rows[i][1] for i in valid],
+            "headline": [",".join(rows[i][2:]).strip() for i in valid],
+        }
+    )
+
+    clean = (
+        df["headline"]
+        .str.replace("“", '"', regex=False)
+        .str.replace("”", '"', regex=False)
+        .str.replace("‘", "'", regex=False)
+        .str.replace("’", "'", regex=False)
+    )
+    df["clean_headline"] = clean
+    df["short_headline"] = clean.str.split().str[:7].str.join(" ")
+    df["compare_headline"] = (
+        clean.str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+    )
+    df["ticker_key"] = df["ticker"].str.strip().str.upper()
+    df["date_part"] = df["feed_date"].str.split().str[0].fillna("")
+
+    input_dt = pd.to_datetime(df["date_part"], format="%m/%d/%Y", errors="coerce")
+    if STRICT_DATE_WINDOW:
+        start_dt, end_dt = input_dt, input_dt
+    else:
+        tolerance = pd.Timedelta(DATE_TOLERANCE)
+        start_dt, end_dt = input_dt - tolerance, input_dt + tolerance
+    df["window_start"] = start_dt.dt.strftime("%Y-%m-%d").fillna("")
+    df["window_end"] = end_dt.dt.strftime("%Y-%m-%d").fillna("")
+    df["input_date"] = input_dt.dt.date
+    # '9/10/2025' and '09/10/2025' are the same row
+    df["date_key"] = input_dt.dt.strftime("%Y-%m-%d").fillna(df["date_part"])
+
+    bad_dates = int(input_dt.isna().sum())
+    if bad_dates:
+        logger.warning("%d input rows have an unparseable date; no date window for them.", bad_dates)
+
+    # One group per unique row, numbered in order of first appearance
+    group = df.groupby(DEDUP_KEYS, sort=False, dropna=False).ngroup()
+    for pos, i in enumerate(valid):
+        row_index[i] = int(group.iat[pos])
+
+    unique = df.drop_duplicates(DEDUP_KEYS)
+    logger.info(
+        "Prepared %d input rows: %d unique, %d duplicates collapsed.",
+        len(df),
+        len(unique),
+        len(df) - len(unique),
+    )
+
+    prepared = [
+        PreparedRow(
+            ticker=r.ticker,
+            feed_date=r.feed_date,
+            headline=r.headline,
+            clean_headline=r.clean_headline,
+            short_headline=r.short_headline,
+            compare_headline=r.compare_headline,
+            input_date=None if pd.isna(r.input_date) else r.input_date,
+            date_window=(r.window_start, r.window_end),
+            content_hash=_hash_row(r.ticker_key, r.date_key, r.compare_headline),
+        )
+        for r in unique.itertuples(index=False)
+    ]
+    return prepared, row_index
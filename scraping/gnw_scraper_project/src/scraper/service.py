@@ -0,0 +1,253 @@
+"""
+Local HTTP resolution service: headline + ticker + date -> wire URL + timestamp.
+
+Usage:
+    python -m src.scraper.service --port 8080
+    uvicorn src.scraper.service:app --port 8080     # single worker
+
+Endpoints:
+    POST /resolve        {"ticker": ..., "headline": ..., "date": "MM/DD/YYYY"}
+    POST /resolve/batch  {"rows": [{...}, ...]}   (or a bare JSON list)
+    GET  /healthz
+    GET  /metrics
+
+All callers share one process, so one HTTP connection pool, per-host rate
+limiter, negative cache and affinity index. Results are kept in an in-memory
+cache, and identical requests already in flight wait on the same lookup
+instead of starting another one. Run a single worker so the sharing holds.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from scraper_common import stats, throttle
+from scraper_common.logs import setup_logging
+
+from . import config, variants
+from .affinity import get_affinity_index
+from .cache import get_negative_cache
+from .gnw_scraper import prepare_row, resolve_record
+from .parsing import get_parse_stage
+
+logger = logging.getLogger(__name__)
+
+_service = None
+
+
+class ResolutionService:
+    """Shared resolver with a TTL result cache and in-flight request coalescing."""
+
+    def __init__(self, workers: int, cache_size: int, cache_ttl: float):
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="resolve")
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, str]]]" = OrderedDict()
+        # content hash -> lookup task in progress (touched on the event loop thread only)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.counters = {"requests": 0, "cache_hits": 0, "coalesced": 0, "lookups": 0, "errors": 0}
+        self.started = time.time()
+
+    def _cache_get(self, key: str) -> Optional[Dict[str, str]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, record = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return record
+
+    def _cache_put(self, key: str, record: Dict[str, str]) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.cache_ttl, record)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def resolve(self, ticker: str, headline: str, feed_date: str) -> Dict[str, Any]:
+        self.counters["requests"] += 1
+        row = prepare_row(ticker, headline, feed_date)
+        key = row.content_hash
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            self.counters["cache_hits"] += 1
+            return {**cached, "source": "cache"}
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.counters["coalesced"] += 1
+            source = "coalesced"
+        else:
+            self.counters["lookups"] += 1
+            task = asyncio.ensure_future(self._lookup(key, row))
+            self._inflight[key] = task
+            source = "lookup"
+        # Shielded so a caller disconnecting doesn't cancel the lookup for the others
+        record = await asyncio.shield(task)
+        return {**record, "source": source}
+
+    async def _lookup(self, key: str, row) -> Dict[str, str]:
+        loop = asyncio.get_running_loop()
+        try:
+            record = await loop.run_in_executor(self._executor, resolve_record, row)
+        except Exception:
+            self.counters["errors"] += 1
+            raise
+        finally:
+            del self._inflight[key]
+
+        if record["status"] == stats.ERROR:
+            self.counters["errors"] += 1
+        else:
+            self._cache_put(key, record)
+        return record
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "inflight": len(self._inflight),
+            "cached": len(self._cache),
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "hosts": throttle.metrics(),
+            "variants": variants.metrics(),
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_service() -> ResolutionService:
+    """Creates or returns the process-wide resolution service."""
+    global _service
+    if _service is None:
+        _service = ResolutionService(
+            config.SERVICE_WORKERS, config.SERVICE_CACHE_SIZE, config.SERVICE_CACHE_TTL_SECONDS
+        )
+        # Open caches and parse workers up front so the first request isn't cold
+        get_negative_cache()
+        get_affinity_index()
+        get_parse_stage()
+    return _service
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _row_fields(data: Any) -> Tuple[str, str, str]:
+    if not isinstance(data, dict):
+        raise BadRequest("expected a JSON object with ticker, headline and date")
+    ticker = str(data.get("ticker") or "").strip()
+    headline = str(data.get("headline") or "").strip()
+    feed_date = str(data.get("date") or "").strip()
+    if not ticker or not headline:
+        raise BadRequest("ticker and headline are required")
+    return ticker, headline, feed_date
+
+
+async def _resolve_one(service: ResolutionService, data: Any) -> Dict[str, Any]:
+    try:
+        return await service.resolve(*_row_fields(data))
+    except BadRequest as e:
+        return {"error": str(e)}
+
+
+async def _read_json(receive) -> Any:
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    try:
+        return json.loads(body or b"null")
+    except ValueError:
+        raise BadRequest("request body is not valid JSON")
+
+
+async def _send_json(send, status: int, payload: Any) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            get_service()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if _service is not None:
+                _service.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    """ASGI entry point."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    service = get_service()
+    method, path = scope["method"], scope["path"].rstrip("/") or "/"
+    try:
+        if method == "GET" and path == "/healthz":
+            await _send_json(send, 200, {"status": "ok"})
+        elif method == "GET" and path == "/metrics":
+            await _send_json(send, 200, service.metrics())
+        elif method == "POST" and path == "/resolve":
+            data = await _read_json(receive)
+            await _send_json(send, 200, await service.resolve(*_row_fields(data)))
+        elif method == "POST" and path == "/resolve/batch":
+            data = await _read_json(receive)
+            rows: List[Any] = data.get("rows") if isinstance(data, dict) else data
+            if not isinstance(rows, list):
+                raise BadRequest("expected {\"rows\": [...]} or a JSON list")
+            if len(rows) > config.SERVICE_MAX_BATCH:
+                raise BadRequest(f"batch is limited to {config.SERVICE_MAX_BATCH} rows")
+            results = await asyncio.gather(*(_resolve_one(service, row) for row in rows))
+            await _send_json(send, 200, {"results": results})
+        elif path in ("/healthz", "/metrics", "/resolve", "/resolve/batch"):
+            await _send_json(send, 405, {"error": "method not allowed"})
+        else:
+            await _send_json(send, 404, {"error": "not found"})
+    except BadRequest as e:
+        await _send_json(send, 400, {"error": str(e)})
+    except Exception as e:
+        logger.error("Unhandled error on %s %s: %s", method, path, e, exc_info=True)
+        await _send_json(send, 500, {"error": "internal error"})
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.scraper.service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_SAMPLE_RATES)
+    # One worker: the point is that every caller shares the same pool and caches
+    uvicorn.run(app, host=args.host, port=args.port, workers=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Output sinks for process_file.
+
+CSV stays the default. Parquet and Arrow write a directory of part files,
+one row group per flush, with typed columns (date, timestamp, integers), so
+partial results of a long backfill can be loaded while the run continues:
+
+    pd.read_parquet("out.parquet")
+    pyarrow.dataset.dataset("out.arrow", format="arrow").to_table()
+"""
+import csv
+import glob
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from scraper_common import stats
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+BASE_FIELDS = ["Ticker", "Date", "Headline", "GNW_timestamp_iso", "GNW_URL"]
+
+FORMATS = ("csv", "parquet", "arrow")
+
+# Newswire timestamps are Eastern time
+WIRE_TZ = "America/New_York"
+
+_INT_FIELDS = {"queries", "pages_fetched", "cache_hits"}
+
+
+def _resume_fields(path: str, fields: List[str], existing: Optional[List[str]]) -> List[str]:
+    """
+    The columns to write when appending to output whose columns are
+    `existing` (None for new output). Output written before GNW_URL was
+    added keeps its layout, so a resumed run stays loadable as one table.
+    Any other difference, such as resuming a plain run with --extended or
+    the other way round, raises ValueError rather than mixing row layouts.
+    """
+    if existing is None or existing == fields:
+        return fields
+    legacy = [name for name in fields if name != "GNW_URL"]
+    if existing == legacy:
+        logger.warning("%s has no GNW_URL column; resuming without it", path)
+        return legacy
+    extended = set(stats.EXTENDED_FIELDS)
+    if any(name in extended for name in existing) != any(name in extended for name in fields):
+        hint = "with" if any(name in extended for name in existing) else "without"
+        raise ValueError(f"{path} was written {hint} --extended; resume it the same way or use a new output")
+    raise ValueError(f"{path} has columns {existing}, expected {fields}; use a new output")
+
+
+class CsvSink:
+    """Appends rows to a CSV file, flushing after every row."""
+
+    def __init__(self, path: str, fields: List[str]):
+        self.path = path
+        self.fields = fields
+        self._file = None
+        self._writer = None
+        # Indexes into each row of the columns actually written
+        self._columns = None
+
+    def existing_rows(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "r", newline="", encoding="utf-8", errors="replace") as f:
+            return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+    def existing_fields(self) -> Optional[List[str]]:
+        """The header of the existing file, or None if there is none."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r", newline="", encoding="utf-8", errors="replace") as f:
+            return next(csv.reader(f), None)
+
+    def open(self) -> None:
+        existing = self.existing_fields()
+        fields = _resume_fields(self.path, self.fields, existing)
+        if fields != self.fields:
+            self._columns = [self.fields.index(name) for name in fields]
+        self._file = open(self.path, "a", newline="", encoding="utf-8", errors="replace")
+        self._writer = csv.writer(self._file)
+        if existing is None:
+            self._writer.writerow(fields)
+
+    def write(self, row: List[str]) -> None:
+        if self._columns is not None:
+            row = [row[i] for i in self._columns]
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class _PartitionedSink(ABC):
+    """
+    Buffers rows and writes each batch as a new part file in a directory.
+
+    Part files are written to a temp name and renamed, so readers never see
+    a half-written file. Resume counts rows from the part file metadata.
+    """
+
+    extension = ""
+
+    def __init__(self, path: str, fields: List[str], flush_rows: Optional[int] = None):
+        self.path = path
+        self.fields = fields
+        self.flush_rows = max(1, flush_rows or config.OUTPUT_FLUSH_ROWS)
+        self._buffer: List[List[str]] = []
+        self._schema = None
+
+    def _parts(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.path, f"part-*{self.extension}")))
+
+    def existing_rows(self) -> int:
+        return sum(self._count_rows(part) for part in self._parts())
+
+    def existing_fields(self) -> Optional[List[str]]:
+        """The columns of the existing part files, or None if there are none."""
+        parts = self._parts()
+        if not parts:
+            return None
+        # GNW_error is derived from GNW_timestamp_iso, not one of the fields
+        return [name for name in self._read_schema(parts[0]).names if name != "GNW_error"]
+
+    def open(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        # _to_table selects the schema's columns by name
+        self._schema = _schema(_resume_fields(self.path, self.fields, self.existing_fields()))
+
+    def write(self, row: List[str]) -> None:
+        self._buffer.append(row)
+        if len(self._buffer) >= self.flush_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        table = _to_table(self._buffer, self.fields, self._schema)
+        part = os.path.join(self.path, f"part-{len(self._parts()):05d}{self.extension}")
+        tmp_part = part + ".tmp"
+        self._write_table(table, tmp_part)
+        os.replace(tmp_part, part)
+        logger.info("Wrote %d rows to %s", table.num_rows, part)
+        self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+
+    @abstractmethod
+    def _count_rows(self, part: str) -> int:
+        ...
+
+    @abstractmethod
+    def _read_schema(self, part: str):
+        ...
+
+    @abstractmethod
+    def _write_table(self, table, path: str) -> None:
+        ...
+
+
+class ParquetSink(_PartitionedSink):
+    extension = ".parquet"
+
+    def _count_rows(self, part: str) -> int:
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(part).metadata.num_rows
+
+    def _read_schema(self, part: str):
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(part)
+
+    def _write_table(self, table, path: str) -> None:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path, row_group_size=table.num_rows, compression="zstd")
+
+
+class ArrowSink(_PartitionedSink):
+    extension = ".arrow"
+
+    def _count_rows(self, part: str) -> int:
+        import pyarrow.ipc as ipc
+
+        with ipc.open_file(part) as reader:
+            return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+    def _read_schema(self, part: str):
+        import pyarrow.ipc as ipc
+
+        with ipc.open_file(part) as reader:
+            return reader.schema
+
+    def _write_table(self, table, path: str) -> None:
+        import pyarrow.ipc as ipc
+
+        with ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _schema(fields: List[str]):
+    import pyarrow as pa
+
+    types = {
+        "Ticker": pa.string(),
+        "Date": pa.date32(),
+        "Headline": pa.string(),
+        "GNW_timestamp_iso": pa.timestamp("s", tz=WIRE_TZ),
+    }
+    columns = []
+    for name in fields:
+        if name in types:
+            columns.append(pa.field(name, types[name]))
+        elif name in _INT_FIELDS:
+            columns.append(pa.field(name, pa.int32()))
+        elif name.endswith("_seconds"):
+            columns.append(pa.field(name, pa.float64()))
+        else:
+            columns.append(pa.field(name, pa.string()))
+        if name == "GNW_timestamp_iso":
+            # The CSV marks failed lookups with "ERROR" in the timestamp column
+            columns.append(pa.field("GNW_error", pa.bool_()))
+    return pa.schema(columns)
+
+
+def _to_table(rows: List[List[str]], fields: List[str], schema):
+    """Convert buffered string rows to a typed table in one vectorized pass."""
+    import pandas as pd
+    import pyarrow as pa
+
+    df = pd.DataFrame(rows, columns=fields)
+    date_part = df["Date"].str.strip().str.split().str[0]
+    df["Date"] = pd.to_datetime(date_part, format="%m/%d/%Y", errors="coerce").dt.date
+
+    ts = df["GNW_timestamp_iso"].str.strip()
+    df["GNW_error"] = ts == "ERROR"
+    wire = pd.to_datetime(
+        ts.str.replace(r"\s*ET$", "", regex=True), format="ISO8601", errors="coerce"
+    )
+    df["GNW_timestamp_iso"] = wire.dt.tz_localize(WIRE_TZ, ambiguous="NaT", nonexistent="shift_forward")
+
+    for name in fields:
+        if name in _INT_FIELDS:
+            df[name] = pd.to_numeric(df[name], errors="coerce").astype("Int32")
+        elif name.endswith("_seconds"):
+            df[name] = pd.to_numeric(df[name], errors="coerce")
+
+    return pa.Table.from_pandas(df[schema.names], schema=schema, preserve_index=False)
+
+
+def make_sink(path: str, output_format: str = "csv", extended: bool = False):
+    """Create the sink for `output_format` ('csv', 'parquet' or 'arrow')."""
+    fields = BASE_FIELDS + (stats.EXTENDED_FIELDS if extended else [])
+    if output_format == "csv":
+        return CsvSink(path, fields)
+    if output_format == "parquet":
+        return ParquetSink(path, fields)
+    if output_format == "arrow":
+        return ArrowSink(path, fields)
+    raise ValueError(f"Unknown output format: {output_format}")
@@ -0,0 +1,167 @@
+import logging
+import re
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from scraper_common import stats
+
+from . import client, config
+from .cache import get_http_cache
+from .parsing import get_parse_stage, parse_release
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "prefix"
+AMP = "amp"
+FULL = "full"
+CACHED = "cache"
+
+# Variants tried per wire, lightest first. "prefix" reads only the first
+# RELEASE_PREFIX_BYTES of the page (h1 and dateline sit above the body),
+# "amp" follows a <link rel="amphtml"> found in that prefix, "full" is the
+# whole page and always ends the list.
+WIRE_VARIANTS: Dict[str, Tuple[str, ...]] = {
+    "globenewswire.com": (PREFIX, FULL),
+    "businesswire.com": (PREFIX, AMP, FULL),
+    "prnewswire.com": (PREFIX, AMP, FULL),
+    "accesswire.com": (PREFIX, FULL),
+    "accessnewswire.com": (PREFIX, FULL),
+}
+DEFAULT_VARIANTS: Tuple[str, ...] = (FULL,)
+
+AMP_LINK_REGEX = re.compile(
+    rb"<link[^>]+rel=[\"']amphtml[\"'][^>]*href=[\"']([^\"']+)[\"']"
+    rb"|<link[^>]+href=[\"']([^\"']+)[\"'][^>]*rel=[\"']amphtml[\"']",
+    re.IGNORECASE,
+)
+
+_lock = threading.Lock()
+# wire -> variant -> {"attempts", "hits", "bytes"}
+_metrics: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+
+def _wire(url: str) -> str:
+    host = urlparse(url).netloc.lower()
+    for wire in WIRE_VARIANTS:
+        if host == wire or host.endswith("." + wire):
+            return wire
+    return host
+
+
+def _record(wire: str, variant: str, size: int, hit: bool) -> None:
+    with _lock:
+        m = _metrics.setdefault(wire, {}).setdefault(variant, {"attempts": 0, "hits": 0, "bytes": 0})
+        m["attempts"] += 1
+        m["hits"] += int(hit)
+        m["bytes"] += size
+
+
+def metrics() -> Dict[str, Dict[str, Dict[str, int]]]:
+    """Attempts, hits and downloaded (decoded) bytes per wire and variant."""
+    with _lock:
+        return {wire: {v: dict(m) for v, m in variants.items()} for wire, variants in _metrics.items()}
+
+
+def _has_fields(page: Dict[str, Optional[str]]) -> bool:
+    # A <title> fallback carries the wire's suffix, so only an h1 headline counts
+    return bool(page["ts_raw"]) and page["headline_tag"] == "h1"
+
+
+def _parse(content: bytes) -> Dict[str, Optional[str]]:
+    with stats.stage("parse"):
+        return get_parse_stage().run(parse_release, content)
+
+
+def _amp_url(base_url: str, content: bytes) -> Optional[str]:
+    match = AMP_LINK_REGEX.search(content)
+    if not match:
+        return None
+    href = (match.group(1) or match.group(2)).decode("utf-8", errors="replace")
+    return urljoin(base_url, href)
+
+
+def fetch_release(url: str) -> Tuple[Dict[str, Optional[str]], str]:
+    """
+    Fetch and parse a release page (see parsing.parse_release) using the
+    lightest variant that has both an h1 headline and a dateline.
+
+    The bytes that answered are kept in the HTTP cache, so the next lookup of
+    the same URL (from any worker sharing the cache) skips the network and
+    reports the variant as "cache".
+
+    Returns (page, variant). Network errors of the full fetch propagate.
+    """
+    wire = _wire(url)
+    http_cache = get_http_cache()
+    cache_key = "page:" + url
+    cached = http_cache.get(cache_key) if http_cache is not None else None
+    if cached is not None:
+        page = _parse(cached)
+        _record(wire, CACHED, 0, _has_fields(page))
+        stats.count("cache_hits")
+        return page, CACHED
+
+    def keep(content: bytes) -> None:
+        if http_cache is not None:
+            http_cache.set(cache_key, content, config.PAGE_CACHE_TTL_DAYS * 86400)
+
+    amp_url: Optional[str] = None
+    whole_page: Optional[Dict[str, Optional[str]]] = None
+    whole_content = b""
+
+    for variant in WIRE_VARIANTS.get(wire, DEFAULT_VARIANTS):
+        if variant == PREFIX:
+            try:
+                with stats.stage("fetch"):
+                    content, complete = client.get_prefix(url, config.RELEASE_PREFIX_BYTES)
+            except Exception as e:
+                logger.info("-> Prefix fetch failed for %s (%s); trying the next variant.", url, e)
+                continue
+            stats.count("pages_fetched")
+            amp_url = _amp_url(url, content)
+            if not complete:
+                # Don't let a text node cut at the boundary pass for a shorter dateline
+                cut = content.rfind(b"<")
+                content = content[:cut] if cut > 0 else content
+            page = _parse(content)
+            hit = _has_fields(page)
+            _record(wire, PREFIX, len(content), hit)
+            if hit:
+                keep(content)
+                return page, PREFIX
+            if complete:
+                # The whole page is already here; only a lighter variant can still help
+                whole_page, whole_content = page, content
+
+        elif variant == AMP:
+            if not amp_url:
+                continue
+            try:
+                with stats.stage("fetch"):
+                    response = client.get(amp_url)
+            except Exception as e:
+                logger.info("-> AMP fetch failed for %s (%s); trying the next variant.", amp_url, e)
+                continue
+            stats.count("pages_fetched")
+            page = _parse(response.content)
+            hit = _has_fields(page)
+            _record(wire, AMP, len(response.content), hit)
+            if hit:
+                keep(response.content)
+                return page, AMP
+
+        else:
+            if whole_page is not None:
+                keep(whole_content)
+                return whole_page, PREFIX
+            with stats.stage("fetch"):
+                response = client.get(url)
+            stats.count("pages_fetched")
+            page = _parse(response.content)
+            _record(wire, FULL, len(response.content), _has_fields(page))
+            keep(response.content)
+            return page, FULL
+
+    # Only reachable when a wire's list doesn't end with FULL
+    raise ValueError(f"No variant could fetch {url}")
@@ -0,0 +1,36 @@
+import json
+
+from src.scraper.affinity import AffinityIndex
+
+
+def _read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_counts_are_written_every_flush_every_records(tmp_path):
+    path = str(tmp_path / "affinity.json")
+    index = AffinityIndex(path, flush_every=2)
+    index.record("EXMP", None, "globenewswire.com")
+    assert not (tmp_path / "affinity.json").exists()
+    index.record("EXMP", None, "globenewswire.com")
+    assert _read(path)["ticker"] == {"EXMP": {"globenewswire.com": 2}}
+
+
+def test_processes_sharing_the_file_keep_each_others_counts(tmp_path):
+    path = str(tmp_path / "affinity.json")
+    first = AffinityIndex(path, flush_every=100)
+    second = AffinityIndex(path, flush_every=100)
+    first.record("EXMP", "Example Corp", "globenewswire.com")
+    second.record("EXMP", None, "businesswire.com")
+    second.record("EXMP", None, "businesswire.com")
+    first.flush()
+    second.flush()
+
+    assert _read(path) == {
+        "ticker": {"EXMP": {"globenewswire.com": 1, "businesswire.com": 2}},
+        "issuer": {"Example Corp": {"globenewswire.com": 1}},
+    }
+    # A flush also picks up what the other process learned
+    assert second.likely_wire("EXMP") == "businesswire.com"
+    assert AffinityIndex(path).likely_wire("", "Example Corp") == "globenewswire.com"
@@ -0,0 +1,76 @@
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+from src.scraper import cache, cache_server, config
+
+
+@pytest.fixture
+def redis_backend():
+    server = cache_server.make_server("127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield cache.RedisBackend(f"redis://{host}:{port}/0")
+    server.shutdown()
+    server.server_close()
+
+
+def test_pack_entry_round_trips_bytes_and_json():
+    expires_at = time.time() + 60
+    assert cache.unpack_entry(cache.pack_entry(b"\x00page", expires_at)) == b"\x00page"
+    value = {"url": "https://example.com/a", "ts_iso": None, "n": [1, 2]}
+    assert cache.unpack_entry(cache.pack_entry(value, expires_at)) == value
+
+
+def test_unpack_entry_rejects_expired_and_unknown_blobs():
+    assert cache.unpack_entry(cache.pack_entry("x", time.time() - 1)) is None
+    assert cache.unpack_entry(b"\x02") is None
+    blob = bytearray(cache.pack_entry("x", time.time() + 60))
+    blob[0] = cache.ENVELOPE_VERSION + 1
+    assert cache.unpack_entry(bytes(blob)) is None
+
+
+def test_sqlite_backend_expires_entries(tmp_path):
+    backend = cache.SQLiteBackend(str(tmp_path / "cache.sqlite3"))
+    backend.set("fresh", b"1", 60)
+    backend.set("stale", b"2", 0.05)
+    time.sleep(0.1)
+    assert backend.get("fresh") == b"1"
+    assert backend.get("stale") is None
+    backend.delete("fresh")
+    assert backend.get("fresh") is None
+
+
+def test_redis_backend_round_trip_with_expiry(redis_backend):
+    shared = cache.Cache(redis_backend, "http")
+    shared.set("page", {"headline": "Example"}, 60)
+    shared.set("short", b"body", 0.05)
+    assert shared.get("page") == {"headline": "Example"}
+    assert shared.get("short") == b"body"
+    time.sleep(0.1)
+    assert shared.get("short") is None
+
+    # A second worker sees the first one's entries
+    other = cache.Cache(cache.RedisBackend(f"redis://127.0.0.1:{redis_backend.port}/0"), "http")
+    assert other.get("page") == {"headline": "Example"}
+    redis_backend.delete(shared._key("page"))
+    assert other.get("page") is None
+
+
+def test_unreachable_server_is_a_miss(redis_backend):
+    backend = cache.RedisBackend(f"redis://127.0.0.1:{redis_backend.port}/0", timeout=0.2)
+    backend.port = 1
+    assert cache.Cache(backend, "http").get("page") is None
+
+
+def test_negative_cache_ttl_depends_on_the_date(monkeypatch):
+    monkeypatch.setattr(config, "NEGATIVE_CACHE_RECENT_DAYS", 7)
+    monkeypatch.setattr(config, "NEGATIVE_CACHE_TTL_RECENT_HOURS", 6)
+    monkeypatch.setattr(config, "NEGATIVE_CACHE_TTL_OLD_DAYS", 30)
+    negative = cache.NegativeCache(None)
+    assert negative.ttl_for(None) == 6 * 3600
+    assert negative.ttl_for(date.today() - timedelta(days=2)) == 6 * 3600
+    assert negative.ttl_for(date.today() - timedelta(days=30)) == 30 * 86400
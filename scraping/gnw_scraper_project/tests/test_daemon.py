@@ -0,0 +1,45 @@
+import threading
+import time
+
+from src.scraper import daemon
+
+FIELDS = {"ticker": "EXMP", "headline": "Example Corp Announces Offering", "date": "01/02/2025"}
+
+
+def test_submit_blocks_while_the_queue_is_full(monkeypatch):
+    release = threading.Event()
+    records = []
+
+    def resolve_record(row, deadline=None):
+        release.wait(5)
+        return {"Ticker": row.ticker}
+
+    for name in ("get_negative_cache", "get_affinity_index", "get_parse_stage"):
+        monkeypatch.setattr(daemon, name, lambda: None)
+    monkeypatch.setattr(daemon, "resolve_record", resolve_record)
+
+    resolver = daemon.ResolverDaemon(workers=1, queue_size=1, slo_seconds=0)
+    resolver.start()
+    first = resolver.submit(FIELDS, records.append)
+    # Wait for the worker to take the first row so the second one fills the queue
+    while resolver._queue.qsize():
+        time.sleep(0.01)
+    resolver.submit(FIELDS, records.append)
+
+    submitted = threading.Event()
+
+    def submit_third():
+        resolver.submit(FIELDS, records.append)
+        submitted.set()
+
+    feeder = threading.Thread(target=submit_third)
+    feeder.start()
+    assert not submitted.wait(0.1)
+    assert not first.done.is_set()
+
+    release.set()
+    assert submitted.wait(5)
+    feeder.join()
+    resolver.stop()
+    assert len(records) == 3
+    assert all(record["slo_met"] for record in records)
@@ -0,0 +1,171 @@
+import time
+
+from scraper_common import stats
+
+from src.scraper import gnw_scraper, variants
+
+HEADLINE = "Example Corp Announces Pricing of $50M Offering"
+URL = "https://www.globenewswire.com/news-release/2025/01/02/1/0/en/Example-Corp-Announces-Pricing-of-50M-Offering.html"
+
+
+class FakeNegativeCache:
+    def __init__(self):
+        self.row_misses = []
+
+    def is_row_miss(self, row_hash):
+        return False
+
+    def add_row_miss(self, row_hash, ref_date):
+        self.row_misses.append(row_hash)
+
+
+class FakeAffinityIndex:
+    def likely_wire(self, ticker, issuer):
+        return "globenewswire.com"
+
+    def record(self, ticker, issuer, wire):
+        pass
+
+
+def _search(
+    monkeypatch, fetch, search=lambda *args, **kwargs: [URL], affinity=None, deadline=None
+):
+    negative_cache = FakeNegativeCache()
+    monkeypatch.setattr(gnw_scraper, "get_result_cache", lambda: None)
+    monkeypatch.setattr(gnw_scraper, "get_negative_cache", lambda: negative_cache)
+    monkeypatch.setattr(gnw_scraper, "get_affinity_index", lambda: affinity)
+    monkeypatch.setattr(gnw_scraper, "_search_web_api", search)
+    monkeypatch.setattr(variants, "fetch_release", fetch)
+    with stats.track_row() as row_stats:
+        result = gnw_scraper.search_gnw_prinfo_for_headline(
+            "EXMP", HEADLINE, "01/02/2025", deadline=deadline
+        )
+    return result, negative_cache, row_stats
+
+
+def test_fetch_error_is_not_cached_as_a_miss(monkeypatch):
+    def fetch(url):
+        raise TimeoutError("read timed out")
+
+    result, negative_cache, row_stats = _search(monkeypatch, fetch)
+    assert result is None
+    assert negative_cache.row_misses == []
+    assert row_stats.status == stats.ERROR
+
+
+def test_rejected_candidates_are_cached_as_a_miss(monkeypatch):
+    def fetch(url):
+        page = {"headline": "Example Corp Announces Closing of $50M Offering", "ts_raw": None}
+        return page, variants.FULL
+
+    result, negative_cache, _ = _search(monkeypatch, fetch)
+    assert result is None
+    assert len(negative_cache.row_misses) == 1
+
+
+def test_affinity_narrows_only_the_first_mode(monkeypatch):
+    searched_sites = []
+
+    def search(ticker, text, date_window, use_ticker=True, sites=None):
+        searched_sites.append(sites)
+        return []
+
+    result, _, _ = _search(monkeypatch, variants.fetch_release, search, FakeAffinityIndex())
+    assert result is None
+    assert searched_sites[0] == ["globenewswire.com"]
+    assert searched_sites[1:] == [None] * 6
+
+
+def test_past_deadline_runs_only_the_first_mode(monkeypatch):
+    searched = []
+
+    def search(ticker, text, date_window, use_ticker=True, sites=None):
+        searched.append(text)
+        return []
+
+    result, negative_cache, row_stats = _search(
+        monkeypatch, variants.fetch_release, search, deadline=time.monotonic()
+    )
+    assert result is None
+    assert len(searched) == 1
+    assert row_stats.status == stats.BUDGET_EXCEEDED
+    assert negative_cache.row_misses == []
+
+
+class InterruptingSink:
+    def existing_rows(self):
+        return 0
+
+    def open(self):
+        pass
+
+    def write(self, row):
+        raise KeyboardInterrupt
+
+    def close(self):
+        pass
+
+
+def test_interrupt_does_not_resolve_the_rest_of_the_file(monkeypatch, tmp_path):
+    input_csv = tmp_path / "input.csv"
+    input_csv.write_text(
+        "Date,Ticker,Headline\n" + "".join(f"01/02/2025,T{i},Headline {i}\n" for i in range(40))
+    )
+    resolved = []
+
+    def resolve(row, row_num, total):
+        resolved.append(row_num)
+        return "", ""
+
+    monkeypatch.setattr(gnw_scraper.config, "ROW_WORKERS", 2)
+    monkeypatch.setattr(gnw_scraper, "make_sink", lambda *args: InterruptingSink())
+    monkeypatch.setattr(gnw_scraper, "_resolve_prepared", resolve)
+    monkeypatch.setattr(gnw_scraper.time, "sleep", lambda seconds: None)
+
+    try:
+        gnw_scraper.process_file(str(input_csv), str(tmp_path / "out.csv"))
+    except KeyboardInterrupt:
+        pass
+    else:
+        raise AssertionError("the interrupt was swallowed")
+    assert len(resolved) <= 4
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def test_search_release_urls_runs_one_query_for_the_row(monkeypatch):
+    other_day = URL.replace("/2025/01/02/", "/2025/01/03/")
+    calls = []
+
+    def get(url, params=None):
+        calls.append(params)
+        links = [URL, other_day, "https://example.com/news"]
+        return FakeResponse({"items": [{"link": link} for link in links]})
+
+    monkeypatch.setattr(gnw_scraper.config, "GOOGLE_API_KEY", "key")
+    monkeypatch.setattr(gnw_scraper.config, "GOOGLE_SEARCH_CX", "cx")
+    monkeypatch.setattr(gnw_scraper, "get_negative_cache", lambda: None)
+    monkeypatch.setattr(gnw_scraper, "get_http_cache", lambda: None)
+    monkeypatch.setattr(gnw_scraper.client, "get", get)
+
+    urls = gnw_scraper.search_release_urls(
+        "EXMP", HEADLINE, "01/02/2025", sites=["globenewswire.com"]
+    )
+
+    # Only the release dated on the feed date survives
+    assert urls == [URL]
+    assert calls[0]["q"] == (
+        f'site:globenewswire.com "{HEADLINE}" EXMP after:2025-01-02 before:2025-01-02'
+    )
+
+
+def test_search_release_urls_without_credentials_returns_none(monkeypatch):
+    monkeypatch.setattr(gnw_scraper.config, "GOOGLE_SEARCH_CX", "")
+    assert not gnw_scraper.google_configured()
+    assert gnw_scraper.search_release_urls("EXMP", HEADLINE, "01/02/2025") is None
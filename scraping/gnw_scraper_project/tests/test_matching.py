@@ -0,0 +1,75 @@
+import pytest
+
+from src.scraper.matching import HeadlineMatcher, headline_key, score_keys
+
+
+def score(a, b):
+    return score_keys(headline_key(a), headline_key(b))
+
+
+@pytest.mark.parametrize(
+    "expected, page",
+    [
+        (
+            "Example Corp Announces Pricing of Upsized $40 Million Public Offering",
+            "Example Corp Announces Closing of Upsized $40 Million Public Offering",
+        ),
+        (
+            "Example Corp Announces Closing of $25M Registered Direct Offering",
+            "Example Corp Announces $25M Registered Direct Offering",
+        ),
+        (
+            "Example Corp Reports First Quarter 2025 Results",
+            "Example Corp Reports Second Quarter 2025 Results",
+        ),
+        (
+            "Example Corp Announces Pricing of $50M Offering",
+            "Example Corp Announces Proposed $50M Offering",
+        ),
+        (
+            "Example Corp Reports Q3 2025 Results",
+            "Example Corp Reports Fourth Quarter 2025 Results",
+        ),
+        (
+            "Example Corp Announces $7.2 Million Registered Direct Offering",
+            "Example Corp Announces $72 Million Registered Direct Offering",
+        ),
+    ],
+)
+def test_other_releases_from_the_same_issuer_are_rejected(expected, page):
+    assert score(expected, page) == 0.0
+    assert HeadlineMatcher(threshold=0.85).match(expected, page)[0] is False
+
+
+@pytest.mark.parametrize(
+    "expected, page",
+    [
+        (
+            "Example Holdings Inc. Announces $50 Million “At-the-Market” Equity Offering Program",
+            'Example Holdings Inc Announces $50 Million "At-the-Market" Equity Offering Program.',
+        ),
+        (
+            "Exämple Corp – Announces Pricing of $50M Offering",
+            "Example Corp. - Announces Pricing of $50M Offering",
+        ),
+        (
+            "Example Corp Announces Pricing of $50M Offering",
+            "Example Corp Announces Pricing of its $50M Offering",
+        ),
+    ],
+)
+def test_punctuation_and_wording_noise_still_matches(expected, page):
+    assert HeadlineMatcher(threshold=0.85).match(expected, page)[0] is True
+
+
+def test_event_words_are_compared_by_meaning():
+    assert headline_key("Prices $50M Offering").events == headline_key("Pricing of $50M Offering").events
+    assert headline_key("Q1 2025 Results").events == headline_key("First Quarter 2025 Results").events
+    assert headline_key("Q1 2025 Results").numbers == frozenset({"2025"})
+
+
+def test_prepare_keys_input_headlines_once():
+    matcher = HeadlineMatcher(threshold=0.85)
+    matcher.prepare(["Example Corp Announces Pricing of $50M Offering"])
+    key = matcher.key("Example Corp Announces Pricing of $50M Offering")
+    assert matcher.key("Example Corp Announces Pricing of $50M Offering") is key
@@ -0,0 +1,22 @@
+from src.scraper import gnw_scraper
+from src.scraper.preprocess import prepare_rows
+
+
+def test_duplicates_collapse_and_row_index_maps_back():
+    rows = [
+        ["9/10/2025", "exmp", "Example Corp Announces Offering"],
+        ["01/02/2025", "OTHR", "Other Inc", " Reports Results"],
+        ["bad"],
+        ["09/10/2025", " EXMP ", "Example  Corp announces offering"],
+    ]
+    unique_rows, row_index = prepare_rows(rows)
+
+    assert row_index == [0, 1, -1, 0]
+    assert [row.ticker for row in unique_rows] == ["exmp", "OTHR"]
+    assert unique_rows[1].headline == "Other Inc, Reports Results"
+
+
+def test_prepared_rows_match_the_per_row_path():
+    headline = "Example Corp “Announces” Pricing of Its Public Offering Today"
+    (prepared,), _ = prepare_rows([["01/02/2025", "EXMP", headline]])
+    assert prepared == gnw_scraper.prepare_row("EXMP", headline, "01/02/2025")
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+
+from scraper_common import stats
+
+from src.scraper import service
+
+
+def test_identical_requests_in_flight_share_one_lookup(monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def resolve_record(row):
+        calls.append(row.ticker)
+        release.wait(5)
+        return {"Ticker": row.ticker, "GNW_URL": "https://example.com/a", "status": stats.RESOLVED}
+
+    monkeypatch.setattr(service, "resolve_record", resolve_record)
+    resolver = service.ResolutionService(workers=2, cache_size=10, cache_ttl=60)
+
+    async def run():
+        requests = [
+            asyncio.ensure_future(resolver.resolve("EXMP", "Example Corp Announces Offering", "01/02/2025"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        records = await asyncio.gather(*requests)
+        cached = await resolver.resolve("EXMP", "Example Corp Announces Offering", "01/02/2025")
+        return records, cached
+
+    try:
+        records, cached = asyncio.run(run())
+    finally:
+        resolver.shutdown()
+
+    assert calls == ["EXMP"]
+    assert [record["source"] for record in records] == ["lookup", "coalesced", "coalesced"]
+    assert cached["source"] == "cache"
+    assert resolver.metrics()["inflight"] == 0
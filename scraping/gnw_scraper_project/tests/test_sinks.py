@@ -0,0 +1,35 @@
+import csv
+
+import pytest
+
+from src.scraper import sinks
+
+ROW = ["EXMP", "01/02/2025", "Example Corp Announces Offering", "2025-01-02T08:00:00", "https://example.com/a"]
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_resume_refuses_extended_mismatch(tmp_path):
+    path = str(tmp_path / "out.csv")
+    sink = sinks.make_sink(path)
+    sink.open()
+    sink.write(ROW)
+    sink.close()
+
+    with pytest.raises(ValueError, match="without --extended"):
+        sinks.make_sink(path, extended=True).open()
+
+
+def test_resume_keeps_layout_without_gnw_url(tmp_path):
+    path = tmp_path / "out.csv"
+    path.write_text("Ticker,Date,Headline,GNW_timestamp_iso\nOLD,01/01/2025,Old headline,\n")
+
+    sink = sinks.make_sink(str(path))
+    sink.open()
+    sink.write(ROW)
+    sink.close()
+
+    assert _read(path)[-1] == ROW[:4]
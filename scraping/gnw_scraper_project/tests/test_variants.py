@@ -0,0 +1,53 @@
+import os
+
+from src.scraper import client, variants
+
+CORPUS = os.path.join(os.path.dirname(__file__), "..", "bench", "corpus")
+URL = "https://www.businesswire.com/news/home/20250102/en/Example-Corp-Announces-Offering"
+
+
+def _page(name):
+    with open(os.path.join(CORPUS, name), "rb") as f:
+        return f.read()
+
+
+class Response:
+    def __init__(self, content):
+        self.content = content
+
+
+def _fetches(monkeypatch, prefix, pages):
+    calls = []
+
+    def get_prefix(url, limit):
+        calls.append(("prefix", url))
+        return prefix
+
+    def get(url):
+        calls.append(("get", url))
+        return Response(pages[url])
+
+    monkeypatch.setattr(variants, "get_http_cache", lambda: None)
+    monkeypatch.setattr(client, "get_prefix", get_prefix)
+    monkeypatch.setattr(client, "get", get)
+    return calls
+
+
+def test_falls_back_from_prefix_to_amp_to_full_page(monkeypatch):
+    prefix = b'<html><head><link rel="amphtml" href="/amp/release"></head><body><div>Example'
+    amp_url = "https://www.businesswire.com/amp/release"
+    pages = {amp_url: b"<html><body></body></html>", URL: _page("businesswire_release.html")}
+    calls = _fetches(monkeypatch, (prefix, False), pages)
+
+    page, variant = variants.fetch_release(URL)
+    assert variant == variants.FULL
+    assert calls == [("prefix", URL), ("get", amp_url), ("get", URL)]
+    assert page["headline_tag"] == "h1" and page["ts_raw"]
+
+
+def test_prefix_with_headline_and_dateline_skips_the_full_page(monkeypatch):
+    calls = _fetches(monkeypatch, (_page("businesswire_release.html"), True), {})
+
+    page, variant = variants.fetch_release(URL)
+    assert variant == variants.PREFIX
+    assert calls == [("prefix", URL)]